@@ -3,8 +3,12 @@ import os
 import time
 import sys
 import sqlite3
+import shutil
+import tempfile
+import cProfile
 
 from src.analysis.tms_entropy import add_tms_entropy
+from src.experiment.profiling import merge_stats, profile_summary
 
 argparser = argparse.ArgumentParser(
     description='Calculate and add TMS-Entropy to database file; BACKUP YOUR FILES'
@@ -44,6 +48,13 @@ argparser.add_argument(
     help='number of parallel processes',
 )
 
+argparser.add_argument(
+    '--profile',
+    type=str,
+    help='profile the main process and the workers with cProfile; the merged stats\
+    are saved to the given file, and a summary is printed',
+)
+
 argparser.add_argument(
     '--verbose',
     action='store_true',
@@ -73,6 +84,13 @@ if __name__ == '__main__':
     if ARGS.verbose:
         print(f'{len(files)} collected.')
 
+    if ARGS.profile:
+        profile_dir = tempfile.mkdtemp()
+        main_profile = cProfile.Profile()
+        main_profile.enable()
+    else:
+        profile_dir = None
+
     for i, file in enumerate(files):
         if ARGS.verbose:
             print(f'file {i+1}/{len(files)}: {file}... ', end='', flush=True)
@@ -86,6 +104,7 @@ if __name__ == '__main__':
                 max_loops=ARGS.max_loops,
                 update=ARGS.noupdate,
                 poolsize=ARGS.poolsize,
+                profile_dir=profile_dir,
             )
 
         except sqlite3.OperationalError as e:
@@ -103,6 +122,12 @@ if __name__ == '__main__':
         else:
             print('.', end='', flush=True)
 
+    if ARGS.profile:
+        main_profile.disable()
+        main_profile.dump_stats(os.path.join(profile_dir, 'main.prof'))
+        print(profile_summary(merge_stats(profile_dir, ARGS.profile)))
+        shutil.rmtree(profile_dir)
+
     if ARGS.verbose:
         print('done.')
 
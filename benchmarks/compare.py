@@ -0,0 +1,128 @@
+"""
+## Module benchmarks.compare
+
+Compares two JSON reports of the same benchmark, and flags regressions
+beyond a threshold; run from the root of the repository with
+
+    python -m benchmarks.compare BASELINE CURRENT [--threshold 0.1]
+
+Exits with status 1, if a regression is found.
+
+### Contents
+    - function case_key
+    - function compare
+"""
+
+import sys
+import json
+import argparse
+
+
+# compared metric of each benchmark, and whether higher values are better
+METRICS = dict(
+    micro=('time_per_op', False),
+    throughput=('flips_per_second', True),
+)
+
+# fields identifying a result, besides the metrics
+CASE_FIELDS = dict(
+    micro=('name', 'num_vars', 'optimize'),
+    throughput=('solver', 'num_vars', 'ratio', 'measurement', 'backends'),
+)
+
+
+def case_key(benchmark, result):
+    """ Hashable key identifying a result of a benchmark """
+    return tuple(
+        json.dumps(result[field], sort_keys=True)
+        for field in CASE_FIELDS[benchmark]
+    )
+
+
+def compare(baseline, current, threshold=0.1):
+    """ Compares two reports of the same benchmark.
+
+    Positionals:
+        baseline -- report to compare against
+        current -- report to be checked
+
+    Keywords:
+        threshold -- relative change of the metric, beyond which
+                     a worse result is a regression
+
+    Returns:
+        list of (case, baseline value, current value, relative change, regression)
+        for all cases in both reports; the change is positive for improvements
+    """
+    benchmark = baseline['benchmark']
+    assert benchmark == current['benchmark'],\
+        "benchmark = {} != {}".format(benchmark, current['benchmark'])
+    assert benchmark in METRICS,\
+        "benchmark = {} not in {}".format(benchmark, list(METRICS))
+
+    metric, higher_is_better = METRICS[benchmark]
+    baseline_values = {
+        case_key(benchmark, result): result[metric]
+        for result in baseline['results']
+    }
+
+    comparison = []
+    for result in current['results']:
+        key = case_key(benchmark, result)
+        old, new = baseline_values.get(key), result[metric]
+        if not old or new is None:
+            continue
+        change = (new - old) / old if higher_is_better else (old - new) / old
+        case = {field: result[field] for field in CASE_FIELDS[benchmark]}
+        comparison.append((case, old, new, change, change < -threshold))
+
+    return comparison
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'baseline',
+        help='JSON report to compare against',
+        type=str,
+    )
+    parser.add_argument(
+        'current',
+        help='JSON report to be checked',
+        type=str,
+    )
+    parser.add_argument(
+        '--threshold',
+        help='relative change beyond which a worse result is a regression',
+        type=float,
+        default=0.1,
+    )
+    parser.add_argument(
+        '--all',
+        help='print all cases, not only the regressions',
+        action='store_true',
+    )
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    comparison = compare(baseline, current, threshold=args.threshold)
+    regressions = 0
+    for case, old, new, change, regression in comparison:
+        regressions += regression
+        if regression or args.all:
+            print('{} {} {:.4g} -> {:.4g} ({:+.1%})'.format(
+                'REGRESSION' if regression else 'ok',
+                ' '.join('{}={}'.format(field, value) for field, value in case.items()),
+                old,
+                new,
+                change,
+            ))
+
+    print('{} of {} cases regressed beyond {:.0%}'.format(
+        regressions, len(comparison), args.threshold
+    ))
+    sys.exit(1 if regressions else 0)
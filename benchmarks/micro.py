@@ -0,0 +1,287 @@
+"""
+## Module benchmarks.micro
+
+Micro-benchmarks of the primitives the solvers hit on every flip; run
+from the root of the repository with
+
+    python -m benchmarks.micro [--output FILE]
+
+Every benchmark is run by a child interpreter with and without -O, since
+the asserts in the hot paths are only stripped by -O; both are merged into
+one JSON report. Reports are compared by benchmarks.compare.
+
+### Contents
+    - function bench_scores_flip
+    - function bench_diff_scores_flip
+    - function bench_falselist
+    - function bench_array_falselist
+    - function bench_window_entropy_count
+    - function bench_assignment_flip
+    - function bench_hamming_dist
+    - function bench_max_seq
+    - function bench_distribution
+    - function time_per_op
+    - function run_benchmarks
+    - function run
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import operator
+import subprocess
+from functools import partial
+
+from src.formula import Formula, Assignment
+from src.solver.utils import max_seq, Falselist, ArrayFalselist, Scores, DiffScores
+from src.solver.generic_solver import Context
+from src.solver.gsat import gsat_distribution
+from src.solver.walksat import walksat_distribution
+from src.solver.probsat import probsat_distribution
+from src.experiment.utils import WindowEntropy
+
+from benchmarks.utils import metadata, write_report
+
+
+def _context(score_constr, num_vars, seed):
+    formula = Formula.generate_planted_formula(num_vars, 4.2, seed=seed)
+    rand_gen = random.Random(seed)
+    assgn = Assignment.generate_random_assignment(num_vars, rand_gen)
+    return Context(score_constr, formula, assgn), rand_gen
+
+
+# Every benchmark takes the size of the problem and a seed, and returns
+# a function without arguments, and the number of operations it performs.
+
+def bench_scores_flip(num_vars, seed, ops=10000):
+    """ Scores.flip of random variables """
+    context, rand_gen = _context(Scores, num_vars, seed)
+    variables = [rand_gen.randrange(1, num_vars + 1) for _ in range(ops)]
+    score, formula, assgn, falselist = context.score, context.formula, context.assgn, context.falselist
+
+    def bench():
+        for var in variables:
+            score.flip(var, formula, assgn, falselist)
+
+    return bench, ops
+
+
+def bench_diff_scores_flip(num_vars, seed, ops=10000):
+    """ DiffScores.flip of random variables """
+    context, rand_gen = _context(DiffScores, num_vars, seed)
+    variables = [rand_gen.randrange(1, num_vars + 1) for _ in range(ops)]
+    score, formula, assgn, falselist = context.score, context.formula, context.assgn, context.falselist
+
+    def bench():
+        for var in variables:
+            score.flip(var, formula, assgn, falselist)
+
+    return bench, ops
+
+
+def _bench_falselist(constructor, num_vars, seed):
+    rand_gen = random.Random(seed)
+    clauses = list(range(int(num_vars * 4.2)))
+    added = rand_gen.sample(clauses, len(clauses) // 2)
+    removed = rand_gen.sample(added, len(added))
+
+    def bench():
+        falselist = constructor(len(clauses))
+        for clause in added:
+            falselist.add(clause)
+        for clause in removed:
+            falselist.remove(clause)
+
+    return bench, len(added) + len(removed)
+
+
+def bench_falselist(num_vars, seed):
+    """ Falselist.add and Falselist.remove of random clauses """
+    return _bench_falselist(lambda capacity: Falselist(), num_vars, seed)
+
+
+def bench_array_falselist(num_vars, seed):
+    """ ArrayFalselist.add and ArrayFalselist.remove of random clauses """
+    return _bench_falselist(ArrayFalselist, num_vars, seed)
+
+
+def bench_window_entropy_count(num_vars, seed, ops=10000):
+    """ WindowEntropy.count of random variables, with a window of num_vars """
+    rand_gen = random.Random(seed)
+    window = WindowEntropy(num_vars)
+    symbols = [rand_gen.randrange(1, num_vars + 1) for _ in range(ops)]
+
+    def bench():
+        for symbol in symbols:
+            window.count(symbol)
+
+    return bench, ops
+
+
+def bench_assignment_flip(num_vars, seed, ops=10000):
+    """ Assignment.flip of random variables """
+    rand_gen = random.Random(seed)
+    assgn = Assignment.generate_random_assignment(num_vars, rand_gen)
+    variables = [rand_gen.randrange(1, num_vars + 1) for _ in range(ops)]
+
+    def bench():
+        for var in variables:
+            assgn.flip(var)
+
+    return bench, ops
+
+
+def bench_hamming_dist(num_vars, seed, ops=1000):
+    """ Assignment.hamming_dist of two random assignments """
+    rand_gen = random.Random(seed)
+    assgn = Assignment.generate_random_assignment(num_vars, rand_gen)
+    other = Assignment.generate_random_assignment(num_vars, rand_gen)
+
+    def bench():
+        for _ in range(ops):
+            assgn.hamming_dist(other)
+
+    return bench, ops
+
+
+def bench_max_seq(num_vars, seed, ops=10000):
+    """ max_seq over the literals of random clauses, by break score """
+    rand_gen = random.Random(seed)
+    breaks = {var: rand_gen.randrange(0, 4) for var in range(1, num_vars + 1)}
+    clauses = [
+        [var if rand_gen.random() < 0.5 else -var
+         for var in rand_gen.sample(range(1, num_vars + 1), 3)]
+        for _ in range(ops)
+    ]
+
+    def bench():
+        for clause in clauses:
+            max_seq(clause, key=breaks.get, compare=operator.lt, modifier=abs)
+
+    return bench, ops
+
+
+def bench_distribution(distribution, score_constr, num_vars, seed, ops=100):
+    """ Heuristic distribution of a context at a random assignment """
+    context, _ = _context(score_constr, num_vars, seed)
+
+    def bench():
+        for _ in range(ops):
+            distribution(context)
+
+    return bench, ops
+
+
+BENCHMARKS = dict(
+    scores_flip=bench_scores_flip,
+    diff_scores_flip=bench_diff_scores_flip,
+    falselist=bench_falselist,
+    array_falselist=bench_array_falselist,
+    window_entropy_count=bench_window_entropy_count,
+    assignment_flip=bench_assignment_flip,
+    hamming_dist=bench_hamming_dist,
+    max_seq=bench_max_seq,
+    gsat_distribution=partial(bench_distribution, gsat_distribution(), DiffScores),
+    walksat_distribution=partial(bench_distribution, walksat_distribution(0.57), Scores),
+    probsat_distribution=partial(bench_distribution, probsat_distribution(2.3), Scores),
+)
+
+
+def time_per_op(bench, ops, repeat=5):
+    """ Best time per operation of repeat runs of bench, in seconds """
+    best = None
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        bench()
+        elapsed = time.perf_counter() - begin
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best / ops
+
+
+def run_benchmarks(names=tuple(BENCHMARKS), num_vars=(100, 1000), seed=0, repeat=5):
+    """ Runs the benchmarks in this interpreter; returns the list of results """
+    results = []
+    for name in names:
+        for n in num_vars:
+            bench, ops = BENCHMARKS[name](n, seed)
+            results.append(dict(
+                name=name,
+                num_vars=n,
+                optimize=sys.flags.optimize,
+                ops=ops,
+                time_per_op=time_per_op(bench, ops, repeat=repeat),
+            ))
+
+    return results
+
+
+def run(names=tuple(BENCHMARKS), num_vars=(100, 1000), seed=0, repeat=5):
+    """ Runs the benchmarks in child interpreters, with and without -O;
+    returns the report as dict.
+    """
+    report = metadata('micro')
+    report.update(seed=seed, repeat=repeat, results=[])
+    for flags in ([], ['-O']):
+        child = subprocess.run(
+            [sys.executable, *flags, '-m', 'benchmarks.micro', '--child',
+             '--benchmarks', *names,
+             '--num_vars', *map(str, num_vars),
+             '--seed', str(seed),
+             '--repeat', str(repeat)],
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        )
+        report['results'].extend(json.loads(child.stdout))
+
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--output',
+        help='file to write the JSON report to; default is stdout',
+        type=str,
+    )
+    parser.add_argument(
+        '--benchmarks',
+        choices=list(BENCHMARKS),
+        nargs='+',
+        default=list(BENCHMARKS),
+    )
+    parser.add_argument(
+        '--num_vars',
+        help='sizes of the benchmarked problems',
+        type=int,
+        nargs='+',
+        default=[100, 1000],
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+    )
+    parser.add_argument(
+        '--repeat',
+        help='number of runs of each benchmark; the best is reported',
+        type=int,
+        default=5,
+    )
+    parser.add_argument(
+        '--child',
+        help='only run in this interpreter, and print the results',
+        action='store_true',
+    )
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_benchmarks(args.benchmarks, args.num_vars, args.seed, args.repeat)))
+    else:
+        write_report(
+            run(args.benchmarks, args.num_vars, args.seed, args.repeat),
+            args.output,
+        )
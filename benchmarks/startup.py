@@ -0,0 +1,118 @@
+"""
+## Module benchmarks.startup
+
+Measures the import time of the modules and the startup time of worker
+pools; run from the root of the repository with
+
+    python -m benchmarks.startup [--output FILE]
+
+### Contents
+    - function import_time
+    - function pool_startup_time
+    - function run
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+import multiprocessing as mp
+
+from src.formula import Formula
+
+from benchmarks.utils import metadata, write_report
+
+
+MODULES = [
+    'src.formula',
+    'src.solver.gsat',
+    'src.solver.walksat',
+    'src.solver.probsat',
+    'src.experiment.measurement',
+    'src.experiment.experiment',
+    'src.analysis.utils',
+    'src.analysis.tms_entropy',
+]
+
+
+def import_time(module, repetitions=5):
+    """ Median import time of a module in a fresh interpreter, in seconds,
+    as reported by python -X importtime; None, if the import fails.
+    """
+    times = []
+    for _ in range(repetitions):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+            stderr=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            universal_newlines=True,
+        )
+        if proc.returncode != 0:
+            return None
+        # the last line is the requested module; its cumulative time in us
+        _, cumulative, _ = proc.stderr.strip().splitlines()[-1].split('|')
+        times.append(int(cumulative) / 10**6)
+
+    return statistics.median(times)
+
+
+def _noop(x):
+    return x
+
+
+def pool_startup_time(start_method, poolsize, input_files, repetitions=3):
+    """ Median time from opening a WorkerPool until every worker has
+    answered a first task, in seconds.
+    """
+    from src.experiment.pool import WorkerPool
+
+    times = []
+    for _ in range(repetitions):
+        begin = time.perf_counter()
+        with WorkerPool(poolsize, input_files, start_method=start_method) as pool:
+            pool.map(_noop, range(poolsize))
+            times.append(time.perf_counter() - begin)
+
+    return statistics.median(times)
+
+
+def run(poolsize=4, num_formulae=8, num_vars=100):
+    """ Runs all startup benchmarks; returns the report as dict """
+    report = metadata('startup')
+    report.update(
+        import_time={module: import_time(module) for module in MODULES},
+        pool_startup_time={},
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        Formula.generate_formula_pool(directory, num_formulae, num_vars, 4.2, seed=0)
+        input_files = [os.path.join(directory, file) for file in os.listdir(directory)]
+        for start_method in mp.get_all_start_methods():
+            report['pool_startup_time'][start_method] = pool_startup_time(
+                start_method,
+                poolsize,
+                input_files,
+            )
+
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--output',
+        help='file to write the JSON report to; default is stdout',
+        type=str,
+    )
+    parser.add_argument(
+        '--poolsize',
+        help='number of worker processes',
+        type=int,
+        default=4,
+    )
+    args = parser.parse_args()
+
+    write_report(run(poolsize=args.poolsize), args.output)
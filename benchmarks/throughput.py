@@ -0,0 +1,339 @@
+"""
+## Module benchmarks.throughput
+
+Measures the throughput of the solvers on planted formulae, with and
+without EntropyMeasurement; run from the root of the repository with
+
+    python -m benchmarks.throughput [--output FILE] [--num_vars N ...] ...
+
+For each combination of solver, number of variables, ratio, measurement
+and backend, flips per second, time per try and peak memory are reported
+as JSON. With --instances, DIMACS files, e.g. of SATLIB, are benchmarked
+as one further group of formulae, instead of the generated ones. The formulae and the random seeds of the solvers are fixed by
+--seed, so reports of different commits are comparable.
+
+Backends are listed in BACKENDS, by the name of the solver keyword they
+set; every value of a backend maps to a function taking the seed of a
+run, and returning the value of the keyword. New backends of the score
+tables, assignments or entropy tracking are added there.
+
+### Contents
+    - class FlipCounter
+    - function counting
+    - function run_case
+    - function run
+"""
+
+import time
+import argparse
+import itertools
+import tracemalloc
+from functools import partial
+
+from src.formula import Formula
+from src.solver.gsat import gsat
+from src.solver.walksat import walksat
+from src.solver.probsat import probsat
+from src.solver.random_source import random_source
+from src.experiment.measurement import EntropyMeasurement
+
+from benchmarks.utils import metadata, write_report
+
+
+SOLVERS = dict(
+    gsat=partial(gsat, noise_param=0),
+    walksat=partial(walksat, noise_param=0.57),
+    probsat=partial(probsat, noise_param=2.3),
+)
+
+MEASUREMENTS = dict(
+    none=None,
+    entropy=EntropyMeasurement,
+)
+
+BACKENDS = dict(
+    rand_gen=dict(
+        mt=partial(random_source, 'mt'),
+        pcg64=partial(random_source, 'pcg64'),
+        philox=partial(random_source, 'philox'),
+    ),
+)
+
+
+class FlipCounter:
+    """ Measurement counting flips and tries; wraps another measurement """
+
+    def __init__(self, measurement, formula, window_width):
+        self.measurement = measurement(formula, window_width) if measurement else None
+        self.flips = 0
+        self.tries = 0
+
+
+    def init_run(self, assgn):
+        self.tries += 1
+        if self.measurement:
+            self.measurement.init_run(assgn)
+
+
+    def count(self, flip):
+        self.flips += 1
+        if self.measurement:
+            self.measurement.count(flip)
+
+
+    def end_run(self, success=False):
+        if self.measurement:
+            self.measurement.end_run(success=success)
+
+
+def counting(measurement):
+    """ Measurement constructor counting flips and tries,
+    besides the given measurement, if not None.
+    """
+    return partial(FlipCounter, measurement)
+
+
+def run_case(solver, formulae, measurement, backends, max_tries, max_flips, seed, memory=True):
+    """ Runs a solver on the given formulae.
+
+    Positionals:
+        solver -- name of the solver
+        formulae -- list of formulae
+        measurement -- name of the measurement
+        backends -- dict of the chosen value of each backend
+        max_tries -- maximum number of tries per formula
+        max_flips -- maximum number of flips per try
+        seed -- seed of the backends
+
+    Keywords:
+        memory -- if True, the runs are repeated with tracemalloc,
+                  to measure the peak memory
+
+    Returns:
+        dict of the measured values
+    """
+    def solve(formula):
+        kwargs = {
+            keyword: BACKENDS[keyword][value](seed)
+            for keyword, value in backends.items()
+        }
+        assgn, counter = SOLVERS[solver](
+            formula,
+            counting(MEASUREMENTS[measurement]),
+            max_tries,
+            max_flips,
+            **kwargs
+        )
+        return bool(assgn), counter
+
+    flips = 0
+    tries = 0
+    solved = 0
+    begin = time.perf_counter()
+    for formula in formulae:
+        sat, counter = solve(formula)
+        flips += counter.flips
+        tries += counter.tries
+        solved += sat
+    total_time = time.perf_counter() - begin
+
+    peak_memory = None
+    if memory:
+        # separate runs; tracing slows the solvers down
+        peak_memory = 0
+        for formula in formulae:
+            tracemalloc.start()
+            solve(formula)
+            peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    return dict(
+        solved=solved,
+        flips=flips,
+        tries=tries,
+        time=total_time,
+        flips_per_second=flips / total_time if total_time > 0 else None,
+        time_per_try=total_time / tries if tries > 0 else None,
+        peak_memory=peak_memory,
+    )
+
+
+def run(
+        solvers=tuple(SOLVERS),
+        num_vars=(100, 300),
+        ratios=(4.0, 4.2),
+        measurements=tuple(MEASUREMENTS),
+        backends=None,
+        num_formulae=3,
+        max_tries=3,
+        flips_per_var=10,
+        seed=0,
+        memory=True,
+        verbose=False,
+        instances=None):
+    """ Runs the throughput benchmark; returns the report as dict
+
+    Keywords:
+        backends -- dict of the values of each backend to be benchmarked;
+                    defaults to the first value of every backend
+        instances -- DIMACS files benchmarked instead of generated formulae;
+                     max_flips is flips_per_var times their maximum number of variables
+    """
+    if backends is None:
+        backends = {keyword: [next(iter(values))] for keyword, values in BACKENDS.items()}
+
+    report = metadata('throughput')
+    report.update(
+        seed=seed,
+        num_formulae=num_formulae,
+        max_tries=max_tries,
+        flips_per_var=flips_per_var,
+        results=[],
+    )
+
+    if instances:
+        formulae = []
+        for instance in instances:
+            with open(instance, 'r') as f:
+                formulae.append(Formula(dimacs=f.read()))
+        report['instances'] = list(instances)
+        groups = [(max(formula.num_vars for formula in formulae), None, formulae)]
+    else:
+        groups = (
+            (n, ratio, [
+                Formula.generate_planted_formula(n, ratio, seed=(seed, n, int(ratio * 1000), i))
+                for i in range(num_formulae)
+            ])
+            for n, ratio in itertools.product(num_vars, ratios)
+        )
+
+    backend_keywords = list(backends)
+    for n, ratio, formulae in groups:
+        for solver, measurement, values in itertools.product(
+                solvers,
+                measurements,
+                itertools.product(*(backends[keyword] for keyword in backend_keywords))):
+            case = dict(
+                solver=solver,
+                num_vars=n,
+                ratio=ratio,
+                measurement=measurement,
+                backends=dict(zip(backend_keywords, values)),
+            )
+            if verbose:
+                print(case, end=' ', flush=True)
+            case.update(run_case(
+                solver,
+                formulae,
+                measurement,
+                case['backends'],
+                max_tries,
+                flips_per_var * n,
+                seed,
+                memory=memory,
+            ))
+            if verbose:
+                print('{:.0f} flips/s'.format(case['flips_per_second'] or 0), flush=True)
+            report['results'].append(case)
+
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--output',
+        help='file to write the JSON report to; default is stdout',
+        type=str,
+    )
+    parser.add_argument(
+        '--solvers',
+        choices=list(SOLVERS),
+        nargs='+',
+        default=list(SOLVERS),
+    )
+    parser.add_argument(
+        '--num_vars',
+        help='numbers of variables of the formulae',
+        type=int,
+        nargs='+',
+        default=[100, 300],
+    )
+    parser.add_argument(
+        '--ratios',
+        help='ratios #clauses/#variables of the formulae',
+        type=float,
+        nargs='+',
+        default=[4.0, 4.2],
+    )
+    parser.add_argument(
+        '--measurements',
+        choices=list(MEASUREMENTS),
+        nargs='+',
+        default=list(MEASUREMENTS),
+    )
+    for keyword, values in BACKENDS.items():
+        parser.add_argument(
+            '--{}'.format(keyword),
+            help='backends of {}; default is {}'.format(keyword, next(iter(values))),
+            choices=list(values),
+            nargs='+',
+            default=[next(iter(values))],
+        )
+    parser.add_argument(
+        '--instances',
+        help='DIMACS files to be benchmarked, instead of generated formulae;\
+        a planted solution is not needed',
+        type=str,
+        nargs='+',
+    )
+    parser.add_argument(
+        '--num_formulae',
+        help='number of formulae per number of variables and ratio',
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        '--max_tries',
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        '--flips_per_var',
+        help='max_flips is flips_per_var times the number of variables',
+        type=int,
+        default=10,
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+    )
+    parser.add_argument(
+        '--no_memory',
+        help='do not measure the peak memory',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+    )
+    args = parser.parse_args()
+
+    write_report(
+        run(
+            solvers=args.solvers,
+            num_vars=args.num_vars,
+            ratios=args.ratios,
+            measurements=args.measurements,
+            backends={keyword: getattr(args, keyword) for keyword in BACKENDS},
+            num_formulae=args.num_formulae,
+            max_tries=args.max_tries,
+            flips_per_var=args.flips_per_var,
+            seed=args.seed,
+            memory=not args.no_memory,
+            verbose=args.verbose,
+            instances=args.instances,
+        ),
+        args.output,
+    )
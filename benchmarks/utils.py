@@ -0,0 +1,47 @@
+"""
+## Module benchmarks.utils
+
+### Contents
+    - function git_commit
+    - function metadata
+    - function write_report
+"""
+
+import sys
+import json
+import platform
+import subprocess
+
+
+def git_commit():
+    """ Hash of the checked out commit; None, if not in a git repository """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(benchmark):
+    """ Common header of all benchmark reports """
+    return dict(
+        benchmark=benchmark,
+        commit=git_commit(),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        optimize=sys.flags.optimize,
+    )
+
+
+def write_report(report, output=None):
+    """ Writes a report as JSON to the file output, or to stdout """
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
@@ -3,13 +3,14 @@ import os
 from src.formula import Formula
 
 def usage():
-    print('Usage: python generate_formulae.py [--usage | DIR NUM NUM_VARS RATIO [--seed SEED] [--poolsize POOLSIZE]] [--verbose]')
+    print('Usage: python generate_formulae.py [--usage | DIR NUM NUM_VARS RATIO [--seed SEED] [--poolsize POOLSIZE] [--clause_length K]] [--verbose]')
     print('  DIR        str     target directory')
     print('  NUM        int     number of formulae to generate')
     print('  NUM_VARS   int     number of variables of each formula')
     print('  RATIO      float   ratio #clauses/#variables')
     print('  SEED       int     random seed; default = current time')
     print('  POOLSIZE   int     number of processes to generate; default = 1')
+    print('  K          int     number of literals per clause; default = 3')
     print('  --usage    prints this help message')
     print('  --verbose  prints written filenames')
     print('')
@@ -37,7 +38,8 @@ if __name__ == '__main__':
 
     # default values
     seed = None
-    pool_size = 1
+    poolsize = 1
+    clause_length = 3
     verbose = False
 
     flags = sys.argv[1:]
@@ -97,6 +99,17 @@ if __name__ == '__main__':
                 if poolsize <= 0:
                     die('POOLSIZE must be greater than 0')
 
+            elif flag == '--clause_length':
+                try:
+                    clause_length = int(flags[flag_idx+1])
+                    flag_idx += 1
+
+                except ValueError:
+                    die('K is not an integer')
+
+                if clause_length <= 0:
+                    die('K must be greater than 0')
+
             elif flag == '--verbose':
                 verbose = True
 
@@ -111,8 +124,10 @@ if __name__ == '__main__':
             num,
             num_vars,
             ratio,
+            clause_length=clause_length,
             poolsize=poolsize,
-            verbose=verbose
+            verbose=verbose,
+            seed=seed,
         )
     except Exception as e:
         die(
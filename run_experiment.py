@@ -2,11 +2,20 @@ import argparse
 import time
 import random
 import os
+import shutil
+import tempfile
+import cProfile
 
 from functools import partial
 
 from src.experiment.experiment import DynamicExperiment, StaticExperiment
-from src.experiment.measurement import EntropyMeasurement, RuntimeMeasurement
+from src.experiment.measurement import EntropyMeasurement
+from src.experiment.cache import ResultCache
+from src.experiment.pool import WorkerPool, load_formula
+from src.experiment.profiling import merge_stats, profile_summary
+from src.experiment.progress import Progress
+from src.solver.probsat import WEIGHTINGS
+from src.solver.restart import RESTARTS
 
 parser = argparse.ArgumentParser()
 
@@ -55,12 +64,20 @@ solver_group.add_argument(
 )
 solver_group.add_argument(
     '--probsat',
-    help = 'run with ProbSAT algorithm with polynomial phi function and break weight C_BREAK',
+    help = 'run with ProbSAT algorithm with break weight C_BREAK; see --weighting',
     metavar='C_BREAK',
     nargs = 1,
     type = float,
 )
 
+parser.add_argument(
+    '--weighting',
+    help = 'break weighting function of ProbSAT: poly 1/(1+b^cb), exp cb^-b,\
+    or poly-eps (1+b)^-cb; has no effect for other solvers',
+    choices = list(WEIGHTINGS),
+    default = 'poly',
+)
+
 parser.add_argument(
     '--poolsize',
     help = 'number of parallel processes',
@@ -88,13 +105,120 @@ parser.add_argument(
     action = 'store_true',
 )
 
+parser.add_argument(
+    '--aggregate',
+    help='only save per formula summaries of the search runs of dynamic experiments,\
+    instead of every single search run',
+    action='store_true',
+)
+
+parser.add_argument(
+    '--random_source',
+    help='random number generator of the solvers: python\'s mersenne twister,\
+    or buffered numpy PCG64 or Philox',
+    choices=['mt', 'pcg64', 'philox'],
+    default='mt',
+)
+
 parser.add_argument(
     '--seeds',
-    help='random seeds for the experiments',
+    help='random seeds for the experiments; the seeds of the single formulae\
+    are derived from them',
     type=int,
     nargs='+'
 )
 
+parser.add_argument(
+    '--cache',
+    help='file for caching results; runs with --seeds already computed with\
+    the same parameters are reused instead of run again; without --seeds,\
+    nothing is cached',
+    type=str,
+)
+
+parser.add_argument(
+    '--start_method',
+    help='start method of the worker processes; forkserver imports the solvers\
+    only once, in the server; default is the platform\'s default',
+    choices=['fork', 'spawn', 'forkserver'],
+)
+
+parser.add_argument(
+    '--instrument',
+    help='sample the flip loop every K flips, and save the time spent in the\
+    heuristic and the update, the falselist size and the plateaus of each run;\
+    has no effect for static experiments',
+    metavar='K',
+    type=int,
+    default=0,
+)
+
+parser.add_argument(
+    '--restart',
+    help='restart policy of dynamic experiments: NAME or NAME:KEY=VALUE,...;\
+    fixed restarts after MAX_FLIPS flips, luby:unit=U after U times the luby\
+    sequence, geometric:factor=F,first=N after N*F^i flips, and\
+    adaptive:window=W,patience=P, when the false clauses have not decreased\
+    for P windows of W flips; U and N default to MAX_FLIPS.\
+    Policies: {}'.format(', '.join(RESTARTS)),
+    metavar='POLICY',
+    type=str,
+)
+
+parser.add_argument(
+    '--preprocess',
+    help='simplify the formulae by unit propagation, pure literals and\
+    subsumption before the search; the search is measured on the reduced\
+    formulae; has no effect for static experiments',
+    action='store_true',
+)
+
+parser.add_argument(
+    '--try_time',
+    help='abort a try after SECONDS seconds of wall time, and start the next one;\
+    has no effect for static experiments',
+    metavar='SECONDS',
+    type=float,
+)
+
+parser.add_argument(
+    '--time_budget',
+    help='abort the run on a formula after SECONDS seconds of wall time;\
+    has no effect for static experiments',
+    metavar='SECONDS',
+    type=float,
+)
+
+parser.add_argument(
+    '--flip_budget',
+    help='abort the run on a formula after FLIPS flips in total;\
+    has no effect for static experiments',
+    metavar='FLIPS',
+    type=int,
+)
+
+parser.add_argument(
+    '--progress',
+    help='print the formulae done, tries, flips per second and ETA every\
+    SECONDS seconds',
+    metavar='SECONDS',
+    type=float,
+)
+
+parser.add_argument(
+    '--status_file',
+    help='write the progress as JSON to this file; every 60 seconds,\
+    if --progress is not given',
+    type=str,
+)
+
+parser.add_argument(
+    '--profile',
+    help='profile the main process and the workers with cProfile; the merged\
+    stats are saved to the given file, and a summary is printed',
+    type=str,
+)
+
 def calc_time(seconds):
     s = seconds % 60
     m = (seconds // 60) % 60
@@ -113,7 +237,54 @@ if __name__ == '__main__':
         setup = dict(noise_param=args.walksat[0])
     elif args.probsat:
         solver = 'probsat'
-        setup = dict(noise_param=args.probsat[0])
+        setup = dict(noise_param=args.probsat[0], weighting=args.weighting)
+
+    cache = ResultCache(args.cache) if args.cache else None
+
+    budget = {
+        keyword: value
+        for keyword, value in (
+            ('try_time', args.try_time),
+            ('time', args.time_budget),
+            ('flips', args.flip_budget),
+        )
+        if value is not None
+    }
+
+    if args.profile:
+        profile_dir = tempfile.mkdtemp()
+        main_profile = cProfile.Profile()
+        main_profile.enable()
+    else:
+        profile_dir = None
+
+    input_files = list(map(
+        partial(os.path.join, args.input_dir),
+        os.listdir(args.input_dir),
+    ))
+    if args.progress or args.status_file:
+        # identical formulae are only run once per experiment; the parsed
+        # formulae are cached, and reused by the experiments
+        num_formulae = len(set(load_formula(file).digest() for file in input_files))
+        progress = Progress(
+            num_formulae * args.repeat,
+            interval=args.progress or 60,
+            status_file=args.status_file,
+        )
+        progress.start()
+    else:
+        progress = None
+
+    # the workers, and the formulae loaded into them, are shared by all repetitions
+    if args.poolsize > 1:
+        pool = WorkerPool(
+            args.poolsize,
+            input_files,
+            start_method=args.start_method,
+            progress=progress,
+        )
+    else:
+        pool = None
 
     experiment_id = None
     count = 0
@@ -125,41 +296,56 @@ if __name__ == '__main__':
         # setting seed
         if args.seeds:
             seed = args.seeds[count % len(args.seeds)]
+            random.seed(seed)
         else:
-            seed = (int(time.time() * 10**5) * 39916801) % 87178291199
-
-        random.seed(seed)
+            # the tasks draw fresh entropy, and are neither reproducible nor cached
+            seed = None
+            random.seed((int(time.time() * 10**5) * 39916801) % 87178291199)
 
         if args.dynamic:
             setup['max_tries'] = args.dynamic[0]
             setup['max_flips'] = args.dynamic[1]
+            if args.restart:
+                setup['restart'] = args.restart
             e = DynamicExperiment(
-                list(map(
-                    partial(os.path.join, args.input_dir),
-                    os.listdir(args.input_dir),
-                )),
+                input_files,
                 solver,
                 setup,
                 EntropyMeasurement,
                 poolsize=args.poolsize,
                 database=args.database_file,
                 repetition_of=experiment_id,
+                aggregate=args.aggregate,
+                instrument=args.instrument,
+                budget=budget,
+                preprocess=args.preprocess,
+                random_source=args.random_source,
+                seed=seed,
+                repetition=count,
+                cache=cache,
+                pool=pool,
+                profile_dir=profile_dir,
+                progress=progress,
             )
         elif args.static:
             e = StaticExperiment(
-                list(map(
-                    partial(os.path.join, args.input_dir),
-                    os.listdir(args.input_dir),
-                )),
+                input_files,
                 solver,
                 setup,
                 poolsize=args.poolsize,
                 database=args.database_file,
                 repetition_of=experiment_id,
+                random_source=args.random_source,
+                seed=seed,
+                repetition=count,
+                cache=cache,
+                pool=pool,
+                profile_dir=profile_dir,
+                progress=progress,
             )
 
 
-        if args.verbose:
+        if args.verbose and seed is not None:
             print('seed is {}... '.format(seed), end='', flush=True)
 
         # running
@@ -185,3 +371,15 @@ if __name__ == '__main__':
             print('saved.', flush=True)
         count += 1
 
+    if pool:
+        pool.close()
+
+    if progress:
+        progress.stop()
+
+    if args.profile:
+        main_profile.disable()
+        main_profile.dump_stats(os.path.join(profile_dir, 'main.prof'))
+        print(profile_summary(merge_stats(profile_dir, args.profile)))
+        shutil.rmtree(profile_dir)
+
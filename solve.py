@@ -0,0 +1,307 @@
+import argparse
+import sys
+import time
+
+from src.formula import Formula
+from src.experiment.experiment import SOLVERS
+from src.experiment.portfolio import FlipMeasurement, default_portfolio, solve_portfolio
+from src.experiment.components import solve_components
+from src.solver.budget import Budget
+from src.solver.preprocess import preprocess
+from src.solver.probsat import WEIGHTINGS
+from src.solver.random_source import random_source as make_random_source
+from src.solver.restart import RESTARTS
+
+# exit codes of SAT competition solvers
+EXIT_SAT = 10
+EXIT_UNSAT = 20
+EXIT_UNKNOWN = 0
+
+parser = argparse.ArgumentParser(
+    description='solve a single formula; prints "s SATISFIABLE" and the\
+    assignment as "v" line, "s UNSATISFIABLE", if refuted by --preprocess,\
+    or "s UNKNOWN", and the timing as "c" lines. Exits with {}, {} or {},\
+    respectively.'.format(EXIT_SAT, EXIT_UNSAT, EXIT_UNKNOWN),
+)
+
+parser.add_argument(
+    'input_file',
+    help='formula in DIMACS format; a planted solution is not needed',
+    type=str,
+)
+
+solver_group = parser.add_mutually_exclusive_group(required = True)
+solver_group.add_argument(
+    '--gsat',
+    help = 'solve with GSAT algorithm',
+    action = 'store_true',
+)
+solver_group.add_argument(
+    '--walksat',
+    help = 'solve with WalkSAT algorithm with noise parameter RHO',
+    metavar='RHO',
+    nargs = 1,
+    type = float,
+)
+solver_group.add_argument(
+    '--probsat',
+    help = 'solve with ProbSAT algorithm with break weight C_BREAK; see --weighting',
+    metavar='C_BREAK',
+    nargs = 1,
+    type = float,
+)
+solver_group.add_argument(
+    '--portfolio',
+    help='race GSAT, WalkSAT with --rhos and ProbSAT with --cbs, each with\
+    every seed of --seeds, on POOLSIZE processes; the first solution wins',
+    metavar='POOLSIZE',
+    type=int,
+)
+
+parser.add_argument(
+    '--components',
+    help='split the formula into its connected components, and solve them\
+    independently on POOLSIZE processes; not with --portfolio',
+    metavar='POOLSIZE',
+    type=int,
+)
+
+parser.add_argument(
+    '--bulk_size',
+    help='components with less variables are bundled, and solved in bulk;\
+    see --components',
+    type=int,
+    default=32,
+)
+
+parser.add_argument(
+    '--weighting',
+    help = 'break weighting function of ProbSAT: poly 1/(1+b^cb), exp cb^-b,\
+    or poly-eps (1+b)^-cb',
+    choices = list(WEIGHTINGS),
+    default = 'poly',
+)
+
+parser.add_argument(
+    '--rhos',
+    help='noise parameters of the WalkSAT members of the portfolio',
+    type=float,
+    nargs='+',
+    default=[0.2, 0.4, 0.57],
+)
+
+parser.add_argument(
+    '--cbs',
+    help='break weights of the ProbSAT members of the portfolio',
+    type=float,
+    nargs='+',
+    default=[2.3, 3.0],
+)
+
+parser.add_argument(
+    '--max_tries',
+    help='maximum number of tries',
+    type=int,
+    default=100,
+)
+
+parser.add_argument(
+    '--max_flips',
+    help='maximum number of flips per try; see --restart',
+    type=int,
+    default=100000,
+)
+
+parser.add_argument(
+    '--preprocess',
+    help='simplify the formula by unit propagation, pure literals and\
+    subsumption before the search',
+    action='store_true',
+)
+
+parser.add_argument(
+    '--restart',
+    help='restart policy: NAME or NAME:KEY=VALUE,...; see run_experiment.py.\
+    Policies: {}'.format(', '.join(RESTARTS)),
+    metavar='POLICY',
+    type=str,
+)
+
+parser.add_argument(
+    '--try_time',
+    help='abort a try after SECONDS seconds of wall time, and start the next one',
+    metavar='SECONDS',
+    type=float,
+)
+
+parser.add_argument(
+    '--time_budget',
+    help='give up after SECONDS seconds of wall time',
+    metavar='SECONDS',
+    type=float,
+)
+
+parser.add_argument(
+    '--flip_budget',
+    help='give up after FLIPS flips in total; per member of a portfolio, and\
+    split across the parts of --components by their number of variables',
+    metavar='FLIPS',
+    type=int,
+)
+
+parser.add_argument(
+    '--seeds',
+    help='random seed of the solver; of the portfolio, every seed is raced',
+    type=int,
+    nargs='+',
+)
+
+parser.add_argument(
+    '--random_source',
+    help='random number generator of the solvers: python\'s mersenne twister,\
+    or buffered numpy PCG64 or Philox',
+    choices=['mt', 'pcg64', 'philox'],
+    default='mt',
+)
+
+
+def literals(assgn):
+    """ The assignment as DIMACS literals """
+    return ' '.join(
+        str(var if value else -var)
+        for var, value in enumerate(assgn, start=1)
+    )
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    if args.components and args.portfolio:
+        parser.error('--components and --portfolio are mutually exclusive')
+
+    budget = {
+        keyword: value
+        for keyword, value in (
+            ('try_time', args.try_time),
+            ('time', args.time_budget),
+            ('flips', args.flip_budget),
+        )
+        if value is not None
+    }
+    seeds = args.seeds or [int(time.time() * 10**5) % 2**32]
+
+    begin = time.perf_counter()
+    with open(args.input_file, 'r') as f:
+        formula = Formula(dimacs=f.read())
+    parse_time = time.perf_counter() - begin
+
+    preprocess_time = None
+    reduction = None
+    original = formula
+    if args.preprocess:
+        begin = time.perf_counter()
+        formula, reduction = preprocess(original)
+        preprocess_time = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    config = None
+    if formula is None:
+        # solved, or refuted, by preprocessing alone
+        assgn = None if reduction.unsat else reduction.extend()
+        flips = 0
+        tries = 0
+    elif args.portfolio:
+        configs = default_portfolio(rhos=args.rhos, cbs=args.cbs, seeds=seeds)
+        if args.restart:
+            for config in configs:
+                config['restart'] = args.restart
+        for config in configs:
+            if config['solver'] == 'probsat':
+                config['weighting'] = args.weighting
+        result = solve_portfolio(
+            formula,
+            configs,
+            args.max_tries,
+            args.max_flips,
+            poolsize=args.portfolio,
+            budget=budget,
+            random_source=args.random_source,
+        )
+        assgn = result['assignment']
+        flips = sum(member['flips'] for member in result['members'])
+        tries = sum(member['tries'] for member in result['members'])
+        config = result['config']
+    else:
+        if args.gsat:
+            config = dict(solver='gsat', noise_param=0)
+        elif args.walksat:
+            config = dict(solver='walksat', noise_param=args.walksat[0])
+        elif args.probsat:
+            config = dict(solver='probsat', noise_param=args.probsat[0], weighting=args.weighting)
+        if args.restart:
+            config['restart'] = args.restart
+        config['seed'] = seeds[0]
+
+        params = dict(config)
+        solver = params.pop('solver')
+        seed = params.pop('seed')
+        if args.components:
+            assgn, parts = solve_components(
+                formula,
+                solver,
+                dict(params, max_tries=args.max_tries, max_flips=args.max_flips),
+                poolsize=args.components,
+                bulk_size=args.bulk_size,
+                budget=budget,
+                random_source=args.random_source,
+                seed=seed,
+            )
+            config['components'] = len(parts)
+            flips = sum(part['flips'] for part in parts)
+            tries = sum(part['tries'] for part in parts)
+        else:
+            assgn, measurement = SOLVERS[solver](
+                formula,
+                FlipMeasurement,
+                args.max_tries,
+                args.max_flips,
+                **params,
+                rand_gen=make_random_source(args.random_source, seed),
+                budget=Budget(**budget) if budget else None,
+            )
+            flips = measurement.flips
+            tries = measurement.tries
+    if formula is not None and reduction is not None and assgn is not None:
+        assgn = reduction.extend(assgn)
+    solve_time = time.perf_counter() - begin
+
+    print('c file: {}'.format(args.input_file))
+    print('c variables: {}, clauses: {}'.format(original.num_vars, original.num_clauses))
+    if reduction is not None:
+        print('c reduced variables: {}, clauses: {}, fixed: {}'.format(
+            formula.num_vars if formula is not None else 0,
+            formula.num_clauses if formula is not None else 0,
+            len(reduction.fixed),
+        ))
+    if config:
+        print('c solver: {}'.format(
+            ', '.join('{}={}'.format(key, value) for key, value in config.items())
+        ))
+    print('c parse time: {:.3f} s'.format(parse_time))
+    if preprocess_time is not None:
+        print('c preprocess time: {:.3f} s'.format(preprocess_time))
+    print('c solve time: {:.3f} s'.format(solve_time))
+    print('c tries: {}, flips: {}, flips/s: {:.0f}'.format(
+        tries,
+        flips,
+        flips / solve_time if solve_time > 0 else 0,
+    ))
+    if reduction is not None and reduction.unsat:
+        print('s UNSATISFIABLE')
+        sys.exit(EXIT_UNSAT)
+    elif assgn is not None:
+        print('s SATISFIABLE')
+        print('v {} 0'.format(literals(assgn)))
+        sys.exit(EXIT_SAT)
+    else:
+        print('s UNKNOWN')
+        sys.exit(EXIT_UNKNOWN)
@@ -1,5 +1,4 @@
 import sqlite3
-import pandas
 import os
 import sys
 
@@ -8,6 +7,7 @@ import numpy as np
 from functools import partial
 
 def path_entropy_to_runtime(folder, field, verbose=False):
+    import pandas
     results = []
     files = map(partial(os.path.join, folder), os.listdir(folder))
     for file in files:
@@ -71,6 +71,7 @@ def path_entropy_to_runtime(folder, field, verbose=False):
 
 
 def noise_to_performance(folder, verbose=False):
+    import pandas
     results = []
     files = map(partial(os.path.join, folder), os.listdir(folder))
     for file in files:
@@ -113,6 +114,7 @@ def noise_to_performance(folder, verbose=False):
 
 
 def noise_param_to_path_entropy(folder, field, verbose=False):
+    import pandas
     results = []
     files = map(partial(os.path.join, folder), os.listdir(folder))
     for file in files:
@@ -1,14 +1,13 @@
 import sqlite3
-import pandas
 import math
 
 import numpy as np
 import numpy.linalg as la
-import scipy.optimize as opt
 
 
 def get_state_entropy_to_hamming_dist(file, formula=None):
     """Return state entropy of all formulae with their respective hamming distance"""
+    import pandas
     with sqlite3.connect(file) as conn:
         cursor = conn.cursor()
         cursor.execute(
@@ -33,6 +32,7 @@ def log_square(x, a, b, c, d):
 
 
 def fit_state_entropy_avg_to_log_square(file):
+    import scipy.optimize as opt
     with sqlite3.connect(file) as conn:
         rows = conn.cursor().execute(
             """ SELECT hamming_dist, avg(entropy_avg) \
@@ -56,6 +56,7 @@ def fit_state_entropy_avg_to_log_square(file):
 
 
 def get_state_entropy_avg_to_hamming_dist(file):
+    import pandas
     with sqlite3.connect(file) as conn:
         rows = conn.cursor().execute(
             """ SELECT hamming_dist, avg(entropy_avg) \
@@ -75,6 +76,7 @@ def get_state_entropy_avg_to_hamming_dist(file):
 
 
 def get_unsat_clause_avg_to_hamming_dist(file):
+    import pandas
     with sqlite3.connect(file) as conn:
         rows = conn.cursor().execute(
             """ SELECT hamming_dist, avg(unsat_clauses) \
@@ -93,6 +95,7 @@ def get_unsat_clause_avg_to_hamming_dist(file):
         )
 
 def get_unsat_clause_to_hamming_dist(file):
+    import pandas
     with sqlite3.connect(file) as conn:
         rows = conn.cursor().execute(
             """ SELECT hamming_dist, unsat_clauses \
@@ -15,9 +15,9 @@ from functools import partial
 import multiprocessing as mp
 
 import numpy as np
-import pandas
 
 import src.analysis.utils as utils
+from src.experiment.profiling import ProfiledTask
 
 
 CREATE_TMS_ENTROPY = """
@@ -49,7 +49,8 @@ SET value = ?, converged = ?, eps_exp = ?, max_loops = ?
 WHERE series_id = ?
 """
 
-def add_tms_entropy(file, eps_exp=15, max_loops=10000, update=True, poolsize=3):
+def add_tms_entropy(file, eps_exp=15, max_loops=10000, update=True, poolsize=3,
+                    profile_dir=None):
     """ Adds the table holding the TMS-entropy to the given database file
 
     Positionals:
@@ -59,7 +60,12 @@ def add_tms_entropy(file, eps_exp=15, max_loops=10000, update=True, poolsize=3):
         eps_exp: the exponent setting the tolerance for the approximation
                  of stationary distribution; eps = 2 ** -eps_exp
         max_loops: maximum number of iterations for appriximating the stationary distribution
+        profile_dir: if given, the workers profile their tasks into this directory
     """
+    task = partial(utils.calculate_tms_entropy, eps=2**-eps_exp, max_loops=max_loops)
+    if profile_dir:
+        task = ProfiledTask(task, profile_dir)
+
     with sqlite3.connect(file, timeout=30) as conn:
         conn.cursor().execute(CREATE_TMS_ENTROPY)
         series_ids = conn.cursor().execute(
@@ -84,7 +90,7 @@ def add_tms_entropy(file, eps_exp=15, max_loops=10000, update=True, poolsize=3):
                     (series_id,)
                 )
                 future_result = pool.apply_async(
-                    partial(utils.calculate_tms_entropy, eps=2**-eps_exp, max_loops=max_loops),
+                    task,
                     (
                         list(probs),
                     )
@@ -103,6 +109,9 @@ def add_tms_entropy(file, eps_exp=15, max_loops=10000, update=True, poolsize=3):
                         SAVE_TMS_ENTROPY,
                         (series_id, tms_entropy, converged, eps_exp, max_loops)
                     )
+            # profiled workers dump their stats, when they exit
+            pool.close()
+            pool.join()
         conn.commit()
 
 
@@ -118,6 +127,7 @@ def tms_entropy_values(in_filepath, only_convergent=True, verbose=False):
     Returns:
         DataFrame having the columns ['solver', 'noise_param', 'formula_id', 'tms_entropy']
     """
+    import pandas
     results = []
     for file in map(partial(os.path.join, in_filepath), os.listdir(in_filepath)):
         if verbose:
@@ -145,6 +155,7 @@ def tms_entropy_values(in_filepath, only_convergent=True, verbose=False):
 
 
 def tms_entropy_to_noise_param(folder, solver):
+    import pandas
     params = dict(
         gsat=('gsat.db', np.array(0)),
         walksat=('walksat-rho{:.1f}.db', np.concatenate(([0.57], np.arange(0, 1.1, 0.1)))),
@@ -171,6 +182,7 @@ def tms_entropy_to_noise_param(folder, solver):
 
 
 def tms_entropy_to_performance(folder, only_convergend=True):
+    import pandas
     results = []
     for file in os.listdir(folder):
         with sqlite3.connect(os.path.join(folder, file), timeout=30) as conn:
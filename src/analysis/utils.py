@@ -12,8 +12,6 @@
 import numpy as np
 import numpy.linalg as la
 
-from scipy.special import binom
-
 from src.experiment.utils import eta
 
 
@@ -24,6 +22,7 @@ def bin_h(p):
 
 def binomial_vec(length):
     """ Binomial distribution vector """
+    from scipy.special import binom
     return np.array([binom(length-1, x) / 2**(length-1) for x in range(0, length)])
 
 
@@ -0,0 +1,93 @@
+"""
+## Module src.experiment.cache
+
+### Contents
+    - function derive_seed
+    - class ResultCache
+"""
+
+import json
+import hashlib
+import pickle
+
+
+CREATE_RESULT_CACHE = """
+CREATE TABLE IF NOT EXISTS result_cache
+    ( cache_key     TEXT PRIMARY KEY
+    , result        BLOB NOT NULL
+    )
+"""
+
+
+def derive_seed(seed, formula_hash, repetition=0):
+    """ Derive the seed of a single task from the experiment seed,
+    the content hash of the formula and the repetition.
+
+    Positionals:
+        seed -- experiment seed; if None, fresh entropy is used
+        formula_hash -- hex digest of the formula's content
+
+    Keywords:
+        repetition -- index of the repetition of the experiment
+
+    Returns:
+        seed -- 128 bit int
+    """
+    import numpy as np
+    sequence = np.random.SeedSequence(
+        seed,
+        spawn_key=(int(formula_hash[:16], 16), repetition),
+    )
+    low, high = sequence.generate_state(2, dtype=np.uint64).tolist()
+    return (high << 64) | low
+
+
+class ResultCache:
+    """ Persistent cache of task results, keyed by
+    (formula hash, solver, parameters, seed); saved in an sqlite file
+    """
+
+    def __init__(self, database):
+        assert isinstance(database, str),\
+            "database = {} :: {} is no str".format(database, type(database))
+
+        import sqlite3
+        self.database = database
+        with sqlite3.connect(self.database, timeout=60) as conn:
+            conn.execute(CREATE_RESULT_CACHE)
+            conn.commit()
+
+
+    @staticmethod
+    def key(formula_hash, solver, params, seed):
+        """ Returns the cache key of a task; params must be JSON serializable """
+        return hashlib.sha256(
+            json.dumps([formula_hash, solver, params, seed], sort_keys=True).encode()
+        ).hexdigest()
+
+
+    def get_many(self, keys):
+        """ Returns a dict of the cached results of the given keys """
+        import sqlite3
+        results = {}
+        with sqlite3.connect(self.database, timeout=60) as conn:
+            for key in keys:
+                row = conn.execute(
+                    'SELECT result FROM result_cache WHERE cache_key = ?',
+                    (key,)
+                ).fetchone()
+                if row:
+                    results[key] = pickle.loads(row[0])
+
+        return results
+
+
+    def put_many(self, items):
+        """ Saves the given (key, result) pairs """
+        import sqlite3
+        with sqlite3.connect(self.database, timeout=60) as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO result_cache (cache_key, result) VALUES (?, ?)',
+                ((key, pickle.dumps(result)) for key, result in items)
+            )
+            conn.commit()
@@ -0,0 +1,262 @@
+"""
+## Module src.experiment.components
+
+### Contents
+    - function connected_components
+    - function split_formula
+    - function solve_part
+    - function solve_components
+"""
+
+import time
+import multiprocessing as mp
+
+from src.formula import Formula, Assignment
+from src.experiment.experiment import SOLVERS
+from src.experiment.cache import derive_seed
+from src.experiment.portfolio import FlipMeasurement
+from src.solver.budget import Budget
+from src.solver.random_source import random_source as make_random_source
+
+
+def connected_components(formula):
+    """ Connected components of the variable-clause graph of a formula,
+    found by a search over its occurrence index; variables occurring
+    in no clause belong to no component.
+
+    Positionals:
+        formula -- formula to be decomposed
+
+    Returns:
+        components -- list of (variables, clause indices), both sorted,
+                      in the order of their smallest variable
+    """
+    assert isinstance(formula, Formula),\
+        "formula = {} :: {} is no Formula".format(formula, type(formula))
+
+    n = formula.num_vars
+    occurrences = formula.occurrences
+    visited_vars = [False] * (n + 1)
+    visited_clauses = [False] * formula.num_clauses
+
+    components = []
+    for start in range(1, n + 1):
+        if visited_vars[start] or not (occurrences[n + start] or occurrences[n - start]):
+            continue
+        visited_vars[start] = True
+        variables = [start]
+        clause_idxs = []
+        stack = [start]
+        while stack:
+            var = stack.pop()
+            for clause_idx in occurrences[n + var] + occurrences[n - var]:
+                if visited_clauses[clause_idx]:
+                    continue
+                visited_clauses[clause_idx] = True
+                clause_idxs.append(clause_idx)
+                for lit in formula.clauses[clause_idx]:
+                    other = abs(lit)
+                    if not visited_vars[other]:
+                        visited_vars[other] = True
+                        variables.append(other)
+                        stack.append(other)
+        variables.sort()
+        clause_idxs.sort()
+        components.append((variables, clause_idxs))
+
+    return components
+
+
+def split_formula(formula, bulk_size=32):
+    """ Splits a formula into independent parts, one per connected
+    component; components with less than bulk_size variables are
+    bundled into parts of at least bulk_size variables, if possible,
+    and solved in bulk.
+
+    Positionals:
+        formula -- formula to be split
+
+    Keywords:
+        bulk_size -- minimum number of variables of a component solved alone
+
+    Returns:
+        parts -- list of (part, var_map), where part is a Formula with
+                 the variables renumbered, and var_map[i-1] the variable
+                 of formula of its variable i; the planted solution, if any,
+                 is restricted to the variables of the part
+    """
+    assert isinstance(bulk_size, int),\
+        "bulk_size = {} :: {} is no int".format(bulk_size, type(bulk_size))
+    assert bulk_size > 0,\
+        "bulk_size = {} <= 0".format(bulk_size)
+
+    groups = []
+    bundle = ([], [])
+    for variables, clause_idxs in connected_components(formula):
+        if len(variables) >= bulk_size:
+            groups.append((variables, clause_idxs))
+            continue
+        bundle[0].extend(variables)
+        bundle[1].extend(clause_idxs)
+        if len(bundle[0]) >= bulk_size:
+            groups.append(bundle)
+            bundle = ([], [])
+    if bundle[0]:
+        groups.append(bundle)
+
+    planted = formula.satisfying_assignment
+    parts = []
+    for variables, clause_idxs in groups:
+        var_map = sorted(variables)
+        clause_idxs = sorted(clause_idxs)
+        new_var = {var: idx for idx, var in enumerate(var_map, start=1)}
+        clauses = [
+            [new_var[lit] if lit > 0 else -new_var[-lit] for lit in formula.clauses[clause_idx]]
+            for clause_idx in clause_idxs
+        ]
+        part = Formula(
+            clauses=clauses,
+            num_vars=len(var_map),
+            sat_assignment=Assignment([planted[var] for var in var_map], len(var_map))
+            if planted is not None else None,
+        )
+        parts.append((part, var_map))
+
+    return parts
+
+
+def solve_part(args):
+    """ Solves one part of a split formula.
+
+    Positionals:
+        args -- (index, part, solver, solver_params, budget, random_source, seed, deadline)
+                where solver_params holds max_tries, max_flips and the keywords
+                of the solver, budget the keywords of its Budget, and deadline
+                the time.time() the whole formula is to be given up at, or None
+
+    Returns:
+        result -- dict with index, assignment, flips, tries, abort_reason and runtime
+    """
+    index, part, solver, solver_params, budget, random_source, seed, deadline = args
+    if deadline is not None:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            # parts still queued at the deadline are not started at all
+            return dict(index=index, assignment=None, flips=0, tries=0,
+                        abort_reason='time', runtime=0)
+        budget = dict(budget, time=remaining)
+    budget = Budget(**budget) if budget else None
+    begin = time.perf_counter()
+    assgn, measurement = SOLVERS[solver](
+        part,
+        FlipMeasurement,
+        **solver_params,
+        rand_gen=make_random_source(random_source, seed),
+        budget=budget,
+    )
+    return dict(
+        index=index,
+        assignment=assgn,
+        flips=measurement.flips,
+        tries=measurement.tries,
+        abort_reason=budget.reason if budget else None,
+        runtime=time.perf_counter() - begin,
+    )
+
+
+def solve_components(
+        formula,
+        solver,
+        solver_params,
+        poolsize=1,
+        bulk_size=32,
+        budget=None,
+        random_source='mt',
+        seed=None,
+        start_method=None):
+    """ Splits a formula into its connected components, solves them
+    independently, in parallel, and merges their assignments.
+
+    Positionals:
+        formula -- formula to be solved
+        solver -- name of the solver in SOLVERS
+        solver_params -- dict with max_tries, max_flips and further keywords of the solver
+
+    Keywords:
+        poolsize -- number of processes; the parts are solved in this process, if 1
+        bulk_size -- see split_formula
+        budget -- keywords of the Budget of the whole formula; its time is a
+                  deadline shared by all parts, and its flips are split across
+                  the parts, in proportion to their number of variables
+        random_source -- random number generator; mt, pcg64 or philox
+        seed -- seed, the seeds of the parts are derived from
+        start_method -- start method of the processes; the platform's default, if None
+
+    Returns:
+        assignment -- assignment of the formula, or None, if a part was not solved;
+                      variables occurring in no clause keep their planted value,
+                      or are False
+        parts -- results of solve_part, with num_vars and num_clauses of each part
+    """
+    assert solver in SOLVERS,\
+        "solver = {} not in {}".format(solver, list(SOLVERS))
+    assert 'max_tries' in solver_params and 'max_flips' in solver_params,\
+        "max_tries or max_flips is not in {}".format(solver_params)
+    assert isinstance(poolsize, int),\
+        "poolsize = {} :: {} is no int".format(poolsize, type(poolsize))
+    assert poolsize > 0,\
+        "poolsize = {} <= 0".format(poolsize)
+
+    budget = dict(budget or {})
+    # checks the keywords
+    Budget(**budget)
+    time_budget = budget.pop('time', None)
+    deadline = time.time() + time_budget if time_budget is not None else None
+
+    parts = split_formula(formula, bulk_size=bulk_size)
+    num_vars = sum(part.num_vars for part, _ in parts)
+
+    def part_budget(part):
+        if 'flips' not in budget:
+            return budget
+        return dict(budget, flips=max(1, budget['flips'] * part.num_vars // num_vars))
+
+    args = [
+        (
+            index,
+            part,
+            solver,
+            solver_params,
+            part_budget(part),
+            random_source,
+            derive_seed(seed, part.digest()),
+            deadline,
+        )
+        for index, (part, _) in enumerate(parts)
+    ]
+    # the largest parts first, so they do not end up last
+    args.sort(key=lambda arg: -arg[1].num_vars)
+
+    if poolsize > 1 and len(parts) > 1:
+        context = mp.get_context(start_method)
+        with context.Pool(processes=min(poolsize, len(parts))) as pool:
+            results = pool.map(solve_part, args)
+    else:
+        results = list(map(solve_part, args))
+    results.sort(key=lambda result: result['index'])
+
+    for result, (part, _) in zip(results, parts):
+        result.update(num_vars=part.num_vars, num_clauses=part.num_clauses)
+
+    if any(result['assignment'] is None for result in results):
+        return None, results
+
+    if formula.satisfying_assignment is not None:
+        atoms = list(formula.satisfying_assignment.atoms)
+    else:
+        atoms = [False] * formula.num_vars
+    for result, (_, var_map) in zip(results, parts):
+        for new_var, var in enumerate(var_map, start=1):
+            atoms[var-1] = result['assignment'][new_var]
+
+    return Assignment(atoms, formula.num_vars), results
@@ -1,21 +1,27 @@
 """ Module defining an random experiment """
 
 import os
-import random
-import sqlite3
 import math
+import warnings
 import multiprocessing as mp
 from functools import partial
 
-from src.formula import Formula
-
 from src.solver.utils import DiffScores, Scores
 from src.solver.generic_solver import Context
 from src.solver.gsat import gsat, gsat_distribution
 from src.solver.walksat import walksat, walksat_distribution
 from src.solver.probsat import probsat, probsat_distribution
+from src.solver.random_source import random_source as make_random_source
+from src.solver.instrumentation import Instrumentation
+from src.solver.budget import Budget
+from src.solver.restart import restart_policy
+from src.solver.preprocess import preprocess
 
 from src.experiment.utils import arr_entropy
+from src.experiment.cache import ResultCache, derive_seed
+from src.experiment.pool import WorkerPool, load_formula, worker_formula
+from src.experiment.profiling import ProfiledTask
+from src.experiment.progress import Progress, set_queue, reporter
 
 
 CREATE_EXPERIMENT = """
@@ -28,10 +34,22 @@ CREATE TABLE IF NOT EXISTS experiment
     , max_flips     INTEGER NOT NULL
     , sample_size   INT NOT NULL
     , static        BOOL NOT NULL
+    , weighting     TEXT
+    , restart       TEXT
+    , preprocess    BOOL
+    , duplicates    INTEGER
     , FOREIGN KEY(repetition_of) REFERENCES experiment(experiment_id)
     )
 """
 
+# columns added to the experiment table after its first version
+EXPERIMENT_COLUMNS = (
+    ('weighting', 'TEXT'),
+    ('restart', 'TEXT'),
+    ('preprocess', 'BOOL'),
+    ('duplicates', 'INTEGER'),
+)
+
 SAVE_EXPERIMENT = """
 INSERT INTO experiment
     ( repetition_of
@@ -41,8 +59,12 @@ INSERT INTO experiment
     , max_flips
     , sample_size
     , static
+    , weighting
+    , restart
+    , preprocess
+    , duplicates
     )
-VALUES (?,?,?,?,?,?,?)
+VALUES (?,?,?,?,?,?,?,?,?,?,?)
 """
 
 CREATE_FORMULA = """
@@ -51,18 +73,29 @@ CREATE TABLE IF NOT EXISTS formula
     , formula_file  TEXT NOT NULL
     , num_vars      INTEGER NOT NULL
     , num_clauses   INTEGER NOT NULL
-    , sat_assgn     TEXT NOT NULL
+    , sat_assgn     TEXT
+    , formula_hash  TEXT
     )
 """
 
+# columns added to the formula table after its first version
+FORMULA_COLUMNS = (
+    ('formula_hash', 'TEXT'),
+)
+
+CREATE_FORMULA_HASH_INDEX = """
+CREATE INDEX IF NOT EXISTS formula_hash_index ON formula(formula_hash)
+"""
+
 SAVE_FORMULA = """
 INSERT INTO formula
     ( formula_file 
     , num_vars
     , num_clauses
     , sat_assgn
+    , formula_hash
     )
-VALUES (?, ?, ?, ?)
+VALUES (?, ?, ?, ?, ?)
 """
 
 CREATE_ALGORITHM_RUN = """
@@ -72,19 +105,26 @@ CREATE TABLE IF NOT EXISTS algorithm_run
     , formula_id        INTEGER NOT NULL
     , sat               BOOL NOT NULL
     , total_runtime     INTEGER NOT NULL
+    , abort_reason      TEXT
     , FOREIGN KEY(experiment_id) REFERENCES experiment(experiment_id)
     , FOREIGN KEY(formula_id) REFERENCES formula(formula_id)
     )
 """
 
+# columns added to the algorithm_run table after its first version
+ALGORITHM_RUN_COLUMNS = (
+    ('abort_reason', 'TEXT'),
+)
+
 SAVE_ALGORITHM_RUN = """
 INSERT INTO algorithm_run
     ( experiment_id
     , formula_id
     , sat
     , total_runtime
+    , abort_reason
     )
-VALUES (?,?,?,?)
+VALUES (?,?,?,?,?)
 """
 
 CREATE_SEARCH_RUN = """
@@ -96,10 +136,11 @@ CREATE TABLE IF NOT EXISTS search_run
     , joint_entropy         INTEGER
     , mutual_information    INTEGER
     , cond_entropy          INTEGER
-    , hamming_dist          INT NOT NULL
+    , hamming_dist          INT
     , start_assgn           TEXT NOT NULL
     , end_assgn             TEXT NOT NULL
     , success               BOOL NOT NULL
+    , abort_reason          TEXT
     , FOREIGN KEY(run_id) REFERENCES algorithm_run(run_id)
     , FOREIGN KEY(single_entropy) REFERENCES entropy_data(data_id)
     , FOREIGN KEY(joint_entropy) REFERENCES entropy_data(data_id)
@@ -107,6 +148,11 @@ CREATE TABLE IF NOT EXISTS search_run
     )
 """
 
+# columns added to the search_run table after its first version
+SEARCH_RUN_COLUMNS = (
+    ('abort_reason', 'TEXT'),
+)
+
 SAVE_SEARCH_RUN = """
 INSERT INTO search_run
     ( run_id
@@ -119,8 +165,9 @@ INSERT INTO search_run
     , start_assgn
     , end_assgn
     , success
+    , abort_reason
     )
-VALUES (?,?,?,?,?,?,?,?,?,?)
+VALUES (?,?,?,?,?,?,?,?,?,?,?)
 """
 
 CREATE_ENTROPY_DATA = """
@@ -149,6 +196,76 @@ INSERT INTO entropy_data
 VALUES (?,?,?,?,?,?,?)
 """
 
+CREATE_RUN_SUMMARY = """
+CREATE TABLE IF NOT EXISTS run_summary
+    ( summary_id    INTEGER PRIMARY KEY
+    , run_id        INTEGER NOT NULL
+    , measure       TEXT NOT NULL
+    , count         INTEGER NOT NULL
+    , mean          REAL
+    , variance      REAL
+    , minimum       REAL
+    , maximum       REAL
+    , q25           REAL
+    , median        REAL
+    , q75           REAL
+    , FOREIGN KEY(run_id) REFERENCES algorithm_run(run_id)
+    )
+"""
+
+SAVE_RUN_SUMMARY = """
+INSERT INTO run_summary
+    ( run_id
+    , measure
+    , count
+    , mean
+    , variance
+    , minimum
+    , maximum
+    , q25
+    , median
+    , q75
+    )
+VALUES (?,?,?,?,?,?,?,?,?,?)
+"""
+
+CREATE_INSTRUMENTATION = """
+CREATE TABLE IF NOT EXISTS instrumentation
+    ( instrumentation_id        INTEGER PRIMARY KEY
+    , run_id                    INTEGER NOT NULL
+    , sample_every              INTEGER NOT NULL
+    , flips                     INTEGER NOT NULL
+    , samples                   INTEGER NOT NULL
+    , heuristic_time            REAL NOT NULL
+    , update_time               REAL NOT NULL
+    , falselist_size            INTEGER NOT NULL
+    , plateau_samples           INTEGER NOT NULL
+    , plateau_heuristic_time    REAL NOT NULL
+    , plateaus                  INTEGER NOT NULL
+    , plateau_flips             INTEGER NOT NULL
+    , max_plateau               INTEGER NOT NULL
+    , FOREIGN KEY(run_id) REFERENCES algorithm_run(run_id)
+    )
+"""
+
+SAVE_INSTRUMENTATION = """
+INSERT INTO instrumentation
+    ( run_id
+    , sample_every
+    , flips
+    , samples
+    , heuristic_time
+    , update_time
+    , falselist_size
+    , plateau_samples
+    , plateau_heuristic_time
+    , plateaus
+    , plateau_flips
+    , max_plateau
+    )
+VALUES (?,?,?,?,?,?,?,?,?,?,?,?)
+"""
+
 CREATE_MEASUREMENT_SERIES = """
 CREATE TABLE IF NOT EXISTS measurement_series
     ( series_id     INTEGER PRIMARY KEY
@@ -251,9 +368,28 @@ CONTEXTS = dict(
 )
 
 
+def add_missing_columns(cursor, table, columns):
+    """ Adds the given (name, type) columns to a table created by an older version """
+    existing = set(row[1] for row in cursor.execute('PRAGMA table_info({})'.format(table)))
+    for name, column_type in columns:
+        if name not in existing:
+            cursor.execute('ALTER TABLE {} ADD COLUMN {} {}'.format(table, name, column_type))
+
+
+def not_null_columns(cursor, table):
+    """ Names of the columns of a table declared NOT NULL """
+    return set(row[1] for row in cursor.execute('PRAGMA table_info({})'.format(table)) if row[3])
+
+
 class AbstractExperiment:
     """ Abstract Experiment class, managing file loading, saving and multiprocessing """
 
+    # (table, columns) added to the tables of a subclass after their first version
+    ADDED_COLUMNS = ()
+    # (table, column) left NULL for formulae without a planted solution;
+    # databases created by older versions may still declare them NOT NULL
+    PLANTED_COLUMNS = (('formula', 'sat_assgn'),)
+
     def __init__(
             self,
             input_files,
@@ -263,7 +399,15 @@ class AbstractExperiment:
             repetition_of,
             *init_database,
             poolsize=1,
-            database='experiments.db'):
+            database='experiments.db',
+            random_source='mt',
+            seed=None,
+            repetition=0,
+            cache=None,
+            pool=None,
+            profile_dir=None,
+            progress=None,
+            preprocess=False):
 
         assert all([os.path.isfile(input_file) for input_file in input_files]),\
             "input_files = {} is no List[str]".format(input_files)
@@ -281,6 +425,12 @@ class AbstractExperiment:
             "database = {} :: {} is no str"
         assert all(isinstance(query, str) for query in init_database),\
             "init_database = {} is not a list of str"
+        assert cache is None or isinstance(cache, ResultCache),\
+            "cache = {} :: {} is no ResultCache".format(cache, type(cache))
+        assert pool is None or isinstance(pool, WorkerPool),\
+            "pool = {} :: {} is no WorkerPool".format(pool, type(pool))
+        assert progress is None or isinstance(progress, Progress),\
+            "progress = {} :: {} is no Progress".format(progress, type(progress))
 
         # get solver functions
         self.solver = solver
@@ -289,27 +439,85 @@ class AbstractExperiment:
 
         # save poolsize
         self.poolsize = poolsize
+        # externally managed pool of warm workers; if None, a pool is opened per call
+        self.pool = pool
+        # if given, the tasks run by pool workers are profiled into this directory
+        self.profile_dir = profile_dir
+        # if True, the formulae are simplified by preprocess before the search
+        self.preprocess = preprocess
+        # if given, the tasks report their tries and flips to it
+        self.progress = progress
+        self.report_progress = progress is not None
+        # name of the random number generator for the solvers
+        self.random_source = random_source
+        # the seeds of the single tasks are derived from seed and repetition
+        self.seed = seed
+        self.repetition = repetition
+        # cache of results of already computed tasks; only used, if a seed is given
+        self.cache = cache
         # save database file
         self.database = database
         # no results yet
         self.results = None
+        # only the main process touches the database
+        import sqlite3
         with sqlite3.connect(self.database, timeout=60) as conn:
             # init database, if not already done
             c = conn.cursor()
             c.execute(CREATE_EXPERIMENT)
+            add_missing_columns(c, 'experiment', EXPERIMENT_COLUMNS)
             c.execute(CREATE_FORMULA)
+            add_missing_columns(c, 'formula', FORMULA_COLUMNS)
+            c.execute(CREATE_FORMULA_HASH_INDEX)
             for statement in init_database:
                 c.execute(statement)
+            for table, columns in self.ADDED_COLUMNS:
+                add_missing_columns(c, table, columns)
+            # checked before anything is saved, not by an IntegrityError midway
+            planted_needed = [
+                '{}.{}'.format(table, column)
+                for table, column in self.PLANTED_COLUMNS
+                if column in not_null_columns(c, table)
+            ]
 
             self.formulae = []
+            self.formula_hashes = []
+            # input files of a formula already seen
+            self.duplicates = []
+            seen = set()
             for file in input_files:
-                with open(file, 'r') as f:
-                    formula = Formula(dimacs=f.read())
-                res = c.execute(
-                    'SELECT formula_id FROM formula WHERE formula_file like ?',
-                    (file,)
-                )
-                res = list(res)
+                formula = load_formula(file)
+                if formula.satisfying_assignment is None and planted_needed:
+                    raise RuntimeError(
+                        '{} has no planted solution, but {} of {} are NOT NULL; '
+                        'the database was created by an older version, use a new one'.format(
+                            file,
+                            ', '.join(planted_needed),
+                            self.database,
+                        )
+                    )
+                formula_hash = formula.digest()
+                # identical formulae are only run once
+                if formula_hash in seen:
+                    self.duplicates.append(file)
+                    continue
+                seen.add(formula_hash)
+
+                res = list(c.execute(
+                    'SELECT formula_id FROM formula WHERE formula_hash = ?',
+                    (formula_hash,)
+                ))
+                if not res:
+                    # rows saved by older versions have no hash yet
+                    res = list(c.execute(
+                        'SELECT formula_id FROM formula WHERE formula_hash IS NULL AND formula_file like ?',
+                        (file,)
+                    ))
+                    if res:
+                        c.execute(
+                            'UPDATE formula SET formula_hash = ? WHERE formula_id = ?',
+                            (formula_hash, res[0][0])
+                        )
                 if not res:
                     c.execute(
                         SAVE_FORMULA,
@@ -318,6 +526,8 @@ class AbstractExperiment:
                             formula.num_vars,
                             formula.num_clauses,
                             str(formula.satisfying_assignment)
+                            if formula.satisfying_assignment is not None else None,
+                            formula_hash,
                         )
                     )
                     formula_id = c.lastrowid
@@ -325,6 +535,16 @@ class AbstractExperiment:
                     formula_id, = res[0]
 
                 self.formulae.append((formula_id, formula))
+                self.formula_hashes.append(formula_hash)
+
+            if self.duplicates:
+                warnings.warn(
+                    '{} of {} input files are duplicates, and are run only once: {}'.format(
+                        len(self.duplicates),
+                        len(input_files),
+                        ', '.join(self.duplicates),
+                    )
+                )
 
             c.execute(
                 SAVE_EXPERIMENT,
@@ -334,8 +554,12 @@ class AbstractExperiment:
                     solver_params['noise_param'],
                     solver_params['max_tries'],
                     solver_params['max_flips'],
-                    len(input_files),
-                    is_static
+                    len(self.formulae),
+                    is_static,
+                    solver_params.get('weighting'),
+                    solver_params.get('restart'),
+                    preprocess,
+                    len(self.duplicates),
                 )
             )
 
@@ -347,27 +571,86 @@ class AbstractExperiment:
         return hash(id(self)) % pow(2, 32)
 
 
+    def __getstate__(self):
+        # the workers only need the parameters; formulae are sent with the tasks
+        state = self.__dict__.copy()
+        state.update(formulae=None, pool=None, results=None, cache=None, progress=None)
+        return state
+
+
+    def cache_params(self):
+        """ Parameters determining the result of a task, besides formula and seed;
+        extend this, if a subclass has more.
+        """
+        return dict(
+            solver_params=self.solver_params,
+            random_source=self.random_source,
+        )
+
+
     def __call__(self):
         """ Runs the prepared experiment """
         if self.results:
             raise RuntimeError('Experiment already performed')
 
-        rand_gens = iter(
-            random.Random()
-            for _ in range(0, len(self.formulae))
-        )
-
-        arg_iter = iter(
-            (f_id, formula, rg)
-            for (f_id, formula), rg in zip(self.formulae, rand_gens)
-        )
+        seeds = [
+            derive_seed(self.seed, formula_hash, self.repetition)
+            for formula_hash in self.formula_hashes
+        ]
+
+        # look up already computed results; without a seed, nothing is reproducible
+        use_cache = self.cache is not None and self.seed is not None
+        keys = [
+            ResultCache.key(formula_hash, self.solver, self.cache_params(), seed)
+            for formula_hash, seed in zip(self.formula_hashes, seeds)
+        ]
+        cached = self.cache.get_many(keys) if use_cache else {}
+        if self.progress and cached:
+            self.progress.add(formulae=len(cached))
+
+        # preloaded formulae are only sent as digest to the pool
+        task_formula = self.pool.task_formula if self.pool else lambda formula: formula
+        args = [
+            (f_id, task_formula(formula), make_random_source(self.random_source, seed))
+            for (f_id, formula), seed, key in zip(self.formulae, seeds, keys)
+            if key not in cached
+        ]
+
+        # tasks run in the main process are profiled by the caller
+        task = self._run_experiment
+        if self.profile_dir:
+            task = ProfiledTask(task, self.profile_dir)
+
+        if self.pool and len(args) > 1:
+            new_results = self.pool.map(task, args)
+        elif self.poolsize > 1 and len(args) > 1:
+            with mp.Pool(
+                    processes=self.poolsize,
+                    initializer=set_queue,
+                    initargs=(self.progress.queue if self.progress else None,)) as pool:
+                new_results = pool.map(task, args)
+                # profiled workers dump their stats, when they exit
+                pool.close()
+                pool.join()
+        else:
+            new_results = list(map(self._run_experiment, args))
 
+        if use_cache:
+            self.cache.put_many(
+                (key, result)
+                for key, result in zip((key for key in keys if key not in cached), new_results)
+            )
 
-        if self.poolsize > 1:
-            with mp.Pool(processes=self.poolsize) as pool:
-                self.results = pool.map(self._run_experiment, arg_iter)
-        else:
-            self.results = list(map(self._run_experiment, arg_iter))
+        # merge cached and new results in the order of the formulae
+        new_results = iter(new_results)
+        self.results = []
+        for (f_id, _), key in zip(self.formulae, keys):
+            if key in cached:
+                result = cached[key]
+                result['formula_id'] = f_id
+            else:
+                result = next(new_results)
+            self.results.append(result)
 
         return self.results
 
@@ -380,6 +663,7 @@ class AbstractExperiment:
     def save_results(self):
         """ Saves the results of the experiment """
         assert self.results, "experiment not run"
+        import sqlite3
         with sqlite3.connect(self.database, timeout=60) as conn:
             c = conn.cursor()
             def execute(query, *args):
@@ -395,6 +679,13 @@ class AbstractExperiment:
 
 class DynamicExperiment(AbstractExperiment):
     """ Experiments to measure path entropies """
+
+    ADDED_COLUMNS = (
+        ('algorithm_run', ALGORITHM_RUN_COLUMNS),
+        ('search_run', SEARCH_RUN_COLUMNS),
+    )
+    PLANTED_COLUMNS = AbstractExperiment.PLANTED_COLUMNS + (('search_run', 'hamming_dist'),)
+
     def __init__(
             self,
             input_files,            # list of input files
@@ -404,7 +695,25 @@ class DynamicExperiment(AbstractExperiment):
             poolsize=1,             # number of parallel processes
             database='experiments.db',
             hamming_dist=0,         # start hamming distance
-            repetition_of=None):
+            repetition_of=None,
+            aggregate=False,        # only ship and save summaries of the search runs
+            random_source='mt',     # random number generator; mt, pcg64 or philox
+            seed=None,              # experiment seed
+            repetition=0,           # index of the repetition, for seeding
+            cache=None,             # ResultCache of already computed results
+            pool=None,              # WorkerPool shared with other experiments
+            profile_dir=None,       # directory for the profiles of the workers
+            instrument=0,           # sample the flip loop every instrument flips; 0 disables
+            progress=None,          # Progress the tasks report to
+            budget=None,            # keywords of the Budget of each formula; try_time, time, flips
+            preprocess=False):      # simplify the formulae before the search
+
+        if 'restart' in solver_params:
+            # the restart policy is saved, and shipped to the workers, by its description
+            solver_params = dict(
+                solver_params,
+                restart=str(restart_policy(solver_params['restart'])),
+            )
 
         super(DynamicExperiment, self).__init__(
             input_files,
@@ -415,8 +724,18 @@ class DynamicExperiment(AbstractExperiment):
             CREATE_ALGORITHM_RUN,
             CREATE_SEARCH_RUN,
             CREATE_ENTROPY_DATA,
+            CREATE_RUN_SUMMARY,
+            CREATE_INSTRUMENTATION,
             poolsize=poolsize,
             database=database,
+            random_source=random_source,
+            seed=seed,
+            repetition=repetition,
+            cache=cache,
+            pool=pool,
+            profile_dir=profile_dir,
+            progress=progress,
+            preprocess=preprocess,
         )
         assert 'max_tries' in solver_params and\
                'max_flips' in solver_params and\
@@ -438,6 +757,22 @@ class DynamicExperiment(AbstractExperiment):
             "max_flips = {} <= 0".format(solver_params['max_flips'])
         assert callable(measurement_constructor),\
             "measurement_constructor = {} is not callable".format(measurement_constructor)
+        assert isinstance(instrument, int),\
+            "instrument = {} :: {} is no int".format(instrument, type(instrument))
+        assert instrument >= 0,\
+            "instrument = {} < 0".format(instrument)
+
+        self.aggregate = aggregate
+        self.instrument = instrument
+        # checks the keywords
+        self.budget = Budget(**budget).as_dict() if budget else None
+        self.measurement_name = '{}.{}'.format(
+            getattr(measurement_constructor, '__module__', ''),
+            getattr(measurement_constructor, '__qualname__', repr(measurement_constructor)),
+        )
+        if aggregate:
+            # the single runs are only streamed into summaries inside the workers
+            measurement_constructor = partial(measurement_constructor, keep_runs=False)
 
         self.meta = dict(
             measurement_constructor=measurement_constructor,
@@ -445,29 +780,101 @@ class DynamicExperiment(AbstractExperiment):
         )
 
 
+    def cache_params(self):
+        params = super(DynamicExperiment, self).cache_params()
+        params.update(
+            static=False,
+            measurement=self.measurement_name,
+            hamming_dist=self.meta['hamming_dist'],
+            aggregate=self.aggregate,
+            instrument=self.instrument,
+            budget=self.budget,
+            preprocess=self.preprocess,
+        )
+        return params
+
+
     def _run_experiment(self, args):
         f_id, formula, rand_gen = args
+        formula = worker_formula(formula)
+        on_try = reporter() if self.report_progress else None
+        if self.preprocess:
+            # the search runs, and is measured, on the reduced formula
+            formula, reduction = preprocess(formula)
+            if formula is None:
+                # solved, or refuted, by preprocessing alone
+                if on_try:
+                    on_try.flush(formulae=1)
+                result = dict(formula_id=f_id, sat=not reduction.unsat)
+                if self.aggregate:
+                    result['summaries'] = {}
+                else:
+                    result['runs'] = []
+                return result
+
+        instrumentation = Instrumentation(self.instrument) if self.instrument else None
+        budget = Budget(**self.budget) if self.budget else None
         assgn, measurement = SOLVERS[self.solver](
             formula,
             **self.solver_params,
             **self.meta,
-            rand_gen=rand_gen
+            rand_gen=rand_gen,
+            instrumentation=instrumentation,
+            on_try=on_try,
+            budget=budget,
         )
+        if on_try:
+            on_try.flush(formulae=1)
+
+        if self.aggregate:
+            result = dict(
+                formula_id=f_id,
+                sat=bool(assgn),
+                summaries={
+                    measure: summary.as_dict()
+                    for measure, summary in measurement.summaries.items()
+                },
+            )
+        else:
+            result = dict(
+                formula_id=f_id,
+                sat=bool(assgn),
+                runs=measurement.run_measurements,
+            )
 
-        return dict(
-            formula_id=f_id,
-            sat=bool(assgn),
-            runs=measurement.run_measurements,
-        )
+        if instrumentation:
+            result['instrumentation'] = instrumentation.as_dict()
+
+        if budget:
+            result['abort_reason'] = budget.reason
+            for run, reason in zip(result.get('runs', ()), budget.try_reasons):
+                run['abort_reason'] = reason
+
+        return result
 
 
     def save_result(self, execute, result):
+        if 'summaries' in result:
+            run_id = self.__save_summaries(execute, result)
+        else:
+            run_id = self.__save_runs(execute, result)
+
+        if 'instrumentation' in result:
+            execute(
+                SAVE_INSTRUMENTATION,
+                run_id,
+                *(result['instrumentation'][field] for field in Instrumentation.FIELDS)
+            )
+
+
+    def __save_runs(self, execute, result):
         run_id = execute(
             SAVE_ALGORITHM_RUN,
             self.experiment_id,
             result['formula_id'],
             result['sat'],
             sum(iter(run['flips'] for run in result['runs'])),
+            result.get('abort_reason'),
         )
         for run in result['runs']:
             single_entropy_id = DynamicExperiment.__save_entropy_data(
@@ -499,8 +906,38 @@ class DynamicExperiment(AbstractExperiment):
                 run['start_assgn'],
                 run['final_assgn'],
                 run['success'],
+                run.get('abort_reason'),
+            )
+
+        return run_id
+
+    def __save_summaries(self, execute, result):
+        summaries = result['summaries']
+        run_id = execute(
+            SAVE_ALGORITHM_RUN,
+            self.experiment_id,
+            result['formula_id'],
+            result['sat'],
+            summaries['flips']['total'] if 'flips' in summaries else 0,
+            result.get('abort_reason'),
+        )
+        for measure, summary in summaries.items():
+            execute(
+                SAVE_RUN_SUMMARY,
+                run_id,
+                measure,
+                summary['count'],
+                summary['mean'],
+                summary['variance'],
+                summary['minimum'],
+                summary['maximum'],
+                summary['q25'],
+                summary['median'],
+                summary['q75'],
             )
 
+        return run_id
+
     @staticmethod
     def __save_entropy_data(execute, data):
         assert isinstance(data, dict),\
@@ -544,16 +981,35 @@ class StaticExperiment(AbstractExperiment):
             solver_params,          # solver specific parameters
             poolsize=1,             # number of parallel processes
             database='experiments.db',
-            repetition_of=None):
+            repetition_of=None,
+            random_source='mt',     # random number generator; mt, pcg64 or philox
+            seed=None,              # experiment seed
+            repetition=0,           # index of the repetition, for seeding
+            cache=None,             # ResultCache of already computed results
+            pool=None,              # WorkerPool shared with other experiments
+            profile_dir=None,       # directory for the profiles of the workers
+            progress=None):         # Progress the tasks report to
+
+        # the state and TMS entropies are measured along the planted solution;
+        # checked, also under -O, before anything is saved or run
+        for file in input_files:
+            if load_formula(file).satisfying_assignment is None:
+                raise RuntimeError(
+                    '{} has no planted solution, which static experiments need'.format(file)
+                )
+
+        params = dict(
+            max_tries=0,
+            max_flips=0,
+            noise_param=solver_params['noise_param'],
+        )
+        if 'weighting' in solver_params:
+            params['weighting'] = solver_params['weighting']
 
         super(StaticExperiment, self).__init__(
             input_files,
             solver,
-            dict(
-                max_tries=0,
-                max_flips=0,
-                noise_param=solver_params['noise_param'],
-            ),
+            params,
             True,
             repetition_of,
             CREATE_MEASUREMENT_SERIES,
@@ -562,9 +1018,22 @@ class StaticExperiment(AbstractExperiment):
             CREATE_UNSAT_CLAUSES,
             poolsize=poolsize,
             database=database,
+            random_source=random_source,
+            seed=seed,
+            repetition=repetition,
+            cache=cache,
+            pool=pool,
+            profile_dir=profile_dir,
+            progress=progress,
         )
 
 
+    def cache_params(self):
+        params = super(StaticExperiment, self).cache_params()
+        params.update(static=True)
+        return params
+
+
     def save_result(self, execute, result):
         series_id = execute(
             SAVE_MEASUREMENT_SERIES,
@@ -603,6 +1072,7 @@ class StaticExperiment(AbstractExperiment):
 
     def _run_experiment(self, args):
         f_id, formula, rand_gen = args
+        formula = worker_formula(formula)
         # calculate the total number of measured states
         n = formula.num_vars
         # get the satisfying assignment
@@ -610,7 +1080,13 @@ class StaticExperiment(AbstractExperiment):
         # calculate the assignment with maximum hamming distance to the satisfying one
         furthest_assgn = sat_assgn.negation()
         # init distribution function
-        distr_f = DISTRS[self.solver](self.solver_params['noise_param'])
+        if 'weighting' in self.solver_params:
+            distr_f = DISTRS[self.solver](
+                self.solver_params['noise_param'],
+                weighting=self.solver_params['weighting'],
+            )
+        else:
+            distr_f = DISTRS[self.solver](self.solver_params['noise_param'])
 
         path_count = lambda i: max(1, i // 3 * 2)
 
@@ -718,6 +1194,10 @@ class StaticExperiment(AbstractExperiment):
             )
         )
 
+        on_formula = reporter() if self.report_progress else None
+        if on_formula:
+            on_formula.flush(formulae=1)
+
         return dict(
             formula_id=f_id,
             measured_states=len(measured_states),
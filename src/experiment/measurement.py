@@ -4,13 +4,14 @@
 ### Contents
     - function entropy_data
     - function update_entropy_data
+    - function summarize_run
     - class EntropyMeasurement
 """
 
 
 import math
 from src.solver.utils import Formula, Assignment
-from src.experiment.utils import WindowEntropy
+from src.experiment.utils import WindowEntropy, StreamSummary
 
 
 def entropy_data(window_width):
@@ -41,15 +42,57 @@ def update_entropy_data(data, curr_entropy, curr_hamming_dist):
     data['count'] += 1
 
 
+ENTROPY_MEASURES = ('single_entropy', 'joint_entropy', 'mutual_information', 'cond_entropy')
+
+
+def summarize_run(summaries, run):
+    """ Add the values of a finished search run to the given summaries;
+    for the entropy measures, the average over the run is added.
+    """
+    for measure in ('flips', 'hamming_dist'):
+        # without a planted solution, unsuccessful runs have no hamming distance
+        if run[measure] is None:
+            continue
+        if measure not in summaries:
+            summaries[measure] = StreamSummary()
+        summaries[measure].add(run[measure])
+
+    if 'success' not in summaries:
+        summaries['success'] = StreamSummary()
+    summaries['success'].add(1 if run['success'] else 0)
+
+    for measure in ENTROPY_MEASURES:
+        data = run[measure]
+        if data['count'] > 0:
+            if measure not in summaries:
+                summaries[measure] = StreamSummary()
+            summaries[measure].add(data['accum']/data['count'])
+
+
 class EntropyMeasurement:
     """ Counts probability distribution of
         - Single steps
         - Joint steps
         - Mutual Information
         - TMS steps
+
+    The hamming distances, and the TMS steps, need the planted solution
+    of the formula; without one, they are not tracked, and the hamming
+    distance of a successful run is the one of its start assignment to
+    the solution found.
     """
 
-    def __init__(self, formula, window_width):
+    def __init__(self, formula, window_width, keep_runs=True):
+        """ Initialize the measurement.
+
+        Positionals:
+            formula -- formula to be solved
+            window_width -- width of the window for the path entropies
+
+        Keywords:
+            keep_runs -- if False, the results of the single runs are not kept
+                         in run_measurements, but only streamed into summaries
+        """
         assert isinstance(formula, Formula),\
             "formula = {} is no Formula".format(formula)
         assert isinstance(window_width, int),\
@@ -59,7 +102,9 @@ class EntropyMeasurement:
         self.window_width = window_width
 
 
+        self.keep_runs = keep_runs
         self.run_measurements = []
+        self.summaries = {}
 
         self.sat_assgn = formula.satisfying_assignment
         self.formula = formula
@@ -80,6 +125,7 @@ class EntropyMeasurement:
         self.mutual_information_data = None
         self.cond_entropy_data = None
         self.start_assgn = None
+        self.initial_assgn = None
         self.curr_assgn = None
 
     def count(self, flip):
@@ -126,6 +172,9 @@ class EntropyMeasurement:
                 )
         self.last_step = flip
 
+        if self.sat_assgn is None:
+            return
+
         # TMS entropy
         #  there are no sideway-steps considering hamming distance!
         tmp = self.curr_hamming_dist
@@ -166,22 +215,37 @@ class EntropyMeasurement:
         # TMS entropy
         self.start_assgn = assgn
         self.curr_assgn = assgn
-        self.curr_hamming_dist = self.sat_assgn.hamming_dist(assgn)
+        if self.sat_assgn is not None:
+            self.curr_hamming_dist = self.sat_assgn.hamming_dist(assgn)
+        else:
+            self.curr_hamming_dist = None
+            # the assignment is modified by the solver; copied to compare the solution with
+            self.initial_assgn = Assignment(list(assgn.atoms), assgn.num_vars)
         # self.tms_steps = {}
 
 
     def end_run(self, success=False):
         """ End the current run """
-        self.run_measurements.append(
-            dict(
-                flips=self.steps,
-                single_entropy=self.simple_entropy_data,
-                joint_entropy=self.joint_entropy_data,
-                mutual_information=self.mutual_information_data,
-                cond_entropy=self.cond_entropy_data,
-                hamming_dist=self.formula.satisfying_assignment.hamming_dist(self.start_assgn),
-                start_assgn=str(self.start_assgn),
-                final_assgn=str(self.curr_assgn),
-                success=success,
-            )
+        if self.sat_assgn is not None:
+            hamming_dist = self.sat_assgn.hamming_dist(self.start_assgn)
+        elif success:
+            # the solution found instead of the planted one
+            hamming_dist = self.curr_assgn.hamming_dist(self.initial_assgn)
+        else:
+            hamming_dist = None
+
+        run = dict(
+            flips=self.steps,
+            single_entropy=self.simple_entropy_data,
+            joint_entropy=self.joint_entropy_data,
+            mutual_information=self.mutual_information_data,
+            cond_entropy=self.cond_entropy_data,
+            hamming_dist=hamming_dist,
+            success=success,
         )
+        summarize_run(self.summaries, run)
+
+        if self.keep_runs:
+            run['start_assgn'] = str(self.start_assgn)
+            run['final_assgn'] = str(self.curr_assgn)
+            self.run_measurements.append(run)
@@ -0,0 +1,126 @@
+"""
+## Module src.experiment.pool
+
+### Contents
+    - function load_formula
+    - function preload_formulae
+    - function worker_formula
+    - class WorkerPool
+"""
+
+import os
+import multiprocessing as mp
+
+from src.formula import Formula
+from src.experiment.progress import set_queue
+
+
+# modules imported once by the forkserver, instead of by every worker
+FORKSERVER_PRELOAD = [
+    'src.solver.gsat',
+    'src.solver.walksat',
+    'src.solver.probsat',
+]
+
+# parsed formulae of this process, by (path, modification time, size)
+_PARSED = {}
+
+# formulae preloaded into a worker process, by digest
+_PRELOADED = {}
+
+
+def load_formula(file):
+    """ Parses a DIMACS file; files already parsed by this process,
+    and not modified since, are taken from a cache.
+    """
+    stat = os.stat(file)
+    key = (os.path.abspath(file), stat.st_mtime_ns, stat.st_size)
+    if key not in _PARSED:
+        with open(file, 'r') as f:
+            _PARSED[key] = Formula(dimacs=f.read())
+
+    return _PARSED[key]
+
+
+def preload_formulae(input_files, progress_queue=None):
+    """ Pool initializer; parses the given files once per worker process,
+    and sets the queue the tasks report their progress to.
+    """
+    for file in input_files:
+        formula = load_formula(file)
+        _PRELOADED[formula.digest()] = formula
+    set_queue(progress_queue)
+
+
+def worker_formula(formula):
+    """ Resolves a formula sent to a worker, either as Formula
+    or as digest of a formula preloaded into the worker.
+    """
+    if isinstance(formula, str):
+        return _PRELOADED[formula]
+
+    return formula
+
+
+class WorkerPool:
+    """ Long-lived pool of worker processes with preloaded formulae,
+    to be shared by several experiments, e.g. all repetitions and
+    parameter values of one invocation.
+
+    The start method of the workers may be chosen; with 'forkserver',
+    the solver modules are imported once by the server, and each worker
+    is forked from it, without inheriting the state of the main process.
+    If a Progress is given, the tasks report to it.
+    """
+
+    def __init__(self, poolsize, input_files=(), start_method=None, progress=None):
+        assert isinstance(poolsize, int),\
+            "poolsize = {} :: {} is no int".format(poolsize, type(poolsize))
+        assert poolsize > 0,\
+            "poolsize = {} <= 0".format(poolsize)
+        assert start_method is None or start_method in mp.get_all_start_methods(),\
+            "start_method = {} not in {}".format(start_method, mp.get_all_start_methods())
+
+        self.poolsize = poolsize
+        input_files = list(input_files)
+        self.preloaded = set(load_formula(file).digest() for file in input_files)
+        context = mp.get_context(start_method)
+        if start_method == 'forkserver':
+            context.set_forkserver_preload(FORKSERVER_PRELOAD)
+        self.pool = context.Pool(
+            processes=poolsize,
+            initializer=preload_formulae,
+            initargs=(input_files, progress.queue if progress else None),
+        )
+
+
+    def task_formula(self, formula):
+        """ Returns what to send to the workers for the given formula;
+        only its digest, if it is preloaded.
+        """
+        digest = formula.digest()
+        return digest if digest in self.preloaded else formula
+
+
+    def map(self, func, iterable):
+        """ Parallel map over the workers """
+        return self.pool.map(func, iterable)
+
+
+    def close(self):
+        """ Shuts the workers down, after the pending tasks are done """
+        self.pool.close()
+        self.pool.join()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            # the workers exit cleanly, and run their finalizers; see ProfiledTask
+            self.close()
+        else:
+            self.pool.terminate()
+            self.pool.join()
@@ -0,0 +1,198 @@
+"""
+## Module src.experiment.portfolio
+
+### Contents
+    - function default_portfolio
+    - class FlipMeasurement
+    - function set_cancel
+    - function run_member
+    - function solve_portfolio
+"""
+
+import time
+import multiprocessing as mp
+
+from src.formula import Formula
+from src.experiment.experiment import SOLVERS
+from src.solver.budget import Budget
+from src.solver.random_source import random_source as make_random_source
+
+
+# event of the portfolio of this process; set in the workers by set_cancel
+_CANCEL = None
+
+
+def default_portfolio(rhos=(0.2, 0.4, 0.57), cbs=(2.3, 3.0), seeds=(0,)):
+    """ Configurations of a portfolio: GSAT, WalkSAT for every rho,
+    and ProbSAT for every cb, each with every seed.
+
+    Keywords:
+        rhos -- noise parameters of the WalkSAT members
+        cbs -- break weights of the ProbSAT members
+        seeds -- seeds of the random number generators
+
+    Returns:
+        configs -- list of dicts with solver, noise_param and seed
+    """
+    configs = []
+    for seed in seeds:
+        configs.append(dict(solver='gsat', noise_param=0, seed=seed))
+        for rho in rhos:
+            configs.append(dict(solver='walksat', noise_param=float(rho), seed=seed))
+        for cb in cbs:
+            configs.append(dict(solver='probsat', noise_param=float(cb), seed=seed))
+
+    return configs
+
+
+class FlipMeasurement:
+    """ Measurement only counting the flips and tries of a run """
+
+    def __init__(self, formula, *more_args):
+        self.flips = 0
+        self.tries = 0
+
+    def count(self, flip):
+        self.flips += 1
+
+    def init_run(self, assgn):
+        self.tries += 1
+
+    def end_run(self, success=False):
+        pass
+
+
+def set_cancel(cancel_event):
+    """ Pool initializer; sets the event, the members of this process
+    are cancelled by
+    """
+    global _CANCEL
+    _CANCEL = cancel_event
+
+
+def run_member(args):
+    """ Runs one member of a portfolio; cancelled by the event set by
+    set_cancel, which is set, as soon as it has found a solution.
+
+    Positionals:
+        args -- (index, config, formula, max_tries, max_flips, budget, random_source)
+                where config holds solver, noise_param, seed, and further
+                keywords of the solver, and budget the keywords of its Budget
+
+    Returns:
+        result -- dict with index, sat, assignment, flips, tries, abort_reason and runtime
+    """
+    index, config, formula, max_tries, max_flips, budget, random_source = args
+    config = dict(config)
+    solver = config.pop('solver')
+    seed = config.pop('seed', None)
+    cancel = _CANCEL.is_set if _CANCEL is not None else None
+
+    result = dict(index=index, sat=False, assignment=None, flips=0, tries=0)
+    # members still queued, when the race is decided, are not started at all
+    if cancel is not None and cancel():
+        result.update(abort_reason='cancelled', runtime=0)
+        return result
+
+    budget = Budget(**budget, cancel=cancel)
+    begin = time.perf_counter()
+    assgn, measurement = SOLVERS[solver](
+        formula,
+        FlipMeasurement,
+        max_tries,
+        max_flips,
+        **config,
+        rand_gen=make_random_source(random_source, seed),
+        budget=budget,
+    )
+    runtime = time.perf_counter() - begin
+    if assgn is not None and _CANCEL is not None:
+        _CANCEL.set()
+
+    result.update(
+        sat=assgn is not None,
+        assignment=assgn,
+        flips=measurement.flips,
+        tries=measurement.tries,
+        abort_reason=budget.reason,
+        runtime=runtime,
+    )
+    return result
+
+
+def solve_portfolio(
+        formula,
+        configs,
+        max_tries,
+        max_flips,
+        poolsize=None,
+        budget=None,
+        random_source='mt',
+        start_method=None):
+    """ Races the configurations of a portfolio on one formula, in parallel;
+    as soon as one member has found a satisfying assignment, the others
+    are cancelled, at their next budget check.
+
+    Positionals:
+        formula -- formula to be solved
+        configs -- list of dicts with solver, noise_param, seed, and
+                   further keywords of the solver; see default_portfolio
+        max_tries -- max_tries of every member
+        max_flips -- max_flips of every member
+
+    Keywords:
+        poolsize -- number of processes; by default, one per member, up to the number of cpus
+        budget -- keywords of the Budget of every member; its check_every
+                  is also the latency of the cancellation
+        random_source -- random number generator of the members; mt, pcg64 or philox
+        start_method -- start method of the processes; the platform's default, if None
+
+    Returns:
+        result -- dict with
+                  assignment -- the satisfying assignment, or None
+                  winner -- index of the winning configuration, or None
+                  config -- the winning configuration, or None
+                  members -- results of run_member, by index of the configuration
+    """
+    assert isinstance(formula, Formula),\
+        "formula = {} :: {} is no Formula".format(formula, type(formula))
+    assert configs,\
+        "configs = {} is empty".format(configs)
+    assert all(config.get('solver') in SOLVERS for config in configs),\
+        "configs = {} has solvers not in {}".format(configs, list(SOLVERS))
+    assert poolsize is None or isinstance(poolsize, int),\
+        "poolsize = {} :: {} is no int".format(poolsize, type(poolsize))
+    assert poolsize is None or poolsize > 0,\
+        "poolsize = {} <= 0".format(poolsize)
+
+    if poolsize is None:
+        poolsize = min(len(configs), mp.cpu_count())
+    budget = dict(budget or {})
+    # checks the keywords
+    Budget(**budget)
+
+    args = [
+        (index, config, formula, max_tries, max_flips, budget, random_source)
+        for index, config in enumerate(configs)
+    ]
+
+    context = mp.get_context(start_method)
+    cancel_event = context.Event()
+    members = [None] * len(configs)
+    winner = None
+    with context.Pool(
+            processes=poolsize,
+            initializer=set_cancel,
+            initargs=(cancel_event,)) as pool:
+        for result in pool.imap_unordered(run_member, args):
+            members[result['index']] = result
+            if result['sat'] and winner is None:
+                winner = result['index']
+                cancel_event.set()
+
+    return dict(
+        assignment=members[winner]['assignment'] if winner is not None else None,
+        winner=winner,
+        config=configs[winner] if winner is not None else None,
+        members=members,
+    )
@@ -0,0 +1,157 @@
+"""
+## Module src.experiment.profiling
+
+### Contents
+    - class ProfiledTask
+    - function merge_stats
+    - function time_breakdown
+    - function profile_summary
+"""
+
+import io
+import os
+import glob
+import pstats
+import tempfile
+import cProfile
+import multiprocessing.util
+
+
+# profile of the tasks run by this worker process
+_WORKER_PROFILE = None
+
+
+class ProfiledTask:
+    """ Wraps a task run by pool workers; every worker profiles its tasks
+    with cProfile, and dumps the stats of all of them once, when it exits,
+    to a new worker-*.prof file in the directory of its first profiled task;
+    the names are unique, also if a later worker gets the pid of an earlier one.
+
+    The stats are only dumped by workers shut down by close and join of
+    their pool; terminated workers do not dump them. Only for tasks run in
+    worker processes; tasks run in the main process are to be profiled
+    by the caller.
+    """
+
+    def __init__(self, task, directory):
+        assert callable(task),\
+            "task = {} :: {} is not callable".format(task, type(task))
+        assert os.path.isdir(directory),\
+            "directory = {} is no directory".format(directory)
+
+        self.task = task
+        self.directory = directory
+
+
+    def __call__(self, *args):
+        global _WORKER_PROFILE
+        if _WORKER_PROFILE is None:
+            _WORKER_PROFILE = cProfile.Profile()
+            # run by the worker, when it exits
+            multiprocessing.util.Finalize(
+                None,
+                _dump_worker_profile,
+                args=(_WORKER_PROFILE, self.directory),
+                exitpriority=0,
+            )
+
+        _WORKER_PROFILE.enable()
+        try:
+            return self.task(*args)
+        finally:
+            _WORKER_PROFILE.disable()
+
+
+def _dump_worker_profile(profile, directory):
+    """ Dumps the profile of a worker to a new file in directory """
+    fd, path = tempfile.mkstemp(prefix='worker-', suffix='.prof', dir=directory)
+    os.close(fd)
+    profile.dump_stats(path)
+
+
+def merge_stats(directory, output=None):
+    """ Merges all stats files (*.prof) in a directory.
+
+    Positionals:
+        directory -- directory of the stats files
+
+    Keywords:
+        output -- if given, the merged stats are saved to this file
+
+    Returns:
+        stats -- pstats.Stats
+    """
+    files = sorted(glob.glob(os.path.join(directory, '*.prof')))
+    assert files,\
+        "directory = {} has no stats files".format(directory)
+
+    stats = pstats.Stats(*files, stream=io.StringIO())
+    if output:
+        stats.dump_stats(output)
+
+    return stats
+
+
+def _breakdown_functions():
+    """ Functions of each part of an experiment, by part """
+    from src.formula import Formula
+    from src.solver.generic_solver import Context
+    from src.solver.gsat import gsat_heuristic
+    from src.solver.walksat import walksat_heuristic
+    from src.solver.probsat import probsat_heuristic
+    from src.experiment.measurement import EntropyMeasurement
+    from src.experiment.experiment import AbstractExperiment
+
+    return dict(
+        parse=[Formula.__init__],
+        context_setup=[Context.__init__],
+        heuristic=[gsat_heuristic(), walksat_heuristic(0.5), probsat_heuristic(2.3)],
+        score_update=[Context.update],
+        measurement=[
+            EntropyMeasurement.init_run,
+            EntropyMeasurement.count,
+            EntropyMeasurement.end_run,
+        ],
+        db_write=[AbstractExperiment.save_results],
+    )
+
+
+def time_breakdown(stats):
+    """ Cumulative time spent in each part of an experiment; parse,
+    context setup, heuristic, score update, measurement and DB write.
+
+    Positionals:
+        stats -- pstats.Stats of an experiment
+
+    Returns:
+        dict of the seconds spent in each part
+    """
+    breakdown = {}
+    for part, functions in _breakdown_functions().items():
+        keys = set(
+            (f.__code__.co_filename, f.__code__.co_firstlineno, f.__code__.co_name)
+            for f in functions
+        )
+        breakdown[part] = sum(
+            cumulative
+            for key, (_, _, _, cumulative, _) in stats.stats.items()
+            if key in keys
+        )
+
+    return breakdown
+
+
+def profile_summary(stats, top=20):
+    """ Returns the time breakdown, and the top functions
+    by cumulative and by internal time, as str.
+    """
+    stream = io.StringIO()
+    stream.write('Time breakdown:\n')
+    for part, seconds in time_breakdown(stats).items():
+        stream.write('    {:<16}{:>12.3f}s\n'.format(part, seconds))
+    stream.write('\n')
+
+    stats.stream = stream
+    stats.sort_stats('cumulative').print_stats(top)
+    stats.sort_stats('tottime').print_stats(top)
+    return stream.getvalue()
@@ -0,0 +1,187 @@
+"""
+## Module src.experiment.progress
+
+### Contents
+    - function set_queue
+    - function reporter
+    - class TryReporter
+    - class Progress
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import threading
+import multiprocessing as mp
+
+
+# seconds between two reports of a worker
+REPORT_INTERVAL = 1.0
+
+# queue of the Progress of the main process; set in the workers by set_queue
+_QUEUE = None
+
+
+def set_queue(progress_queue):
+    """ Pool initializer; sets the queue the tasks of this process report to """
+    global _QUEUE
+    _QUEUE = progress_queue
+
+
+def reporter():
+    """ TryReporter of the current task, or None, if no progress is reported """
+    return TryReporter(_QUEUE) if _QUEUE is not None else None
+
+
+class TryReporter:
+    """ Counts the tries and flips of a task; the on_try callback of
+    generic_sls. The counts are sent to the main process at most
+    every interval seconds, and by flush.
+    """
+
+    def __init__(self, progress_queue, interval=REPORT_INTERVAL):
+        self.queue = progress_queue
+        self.interval = interval
+        self.tries = 0
+        self.flips = 0
+        self.last_report = time.monotonic()
+
+
+    def __call__(self, flips, success):
+        self.tries += 1
+        self.flips += flips
+        if time.monotonic() - self.last_report >= self.interval:
+            self.flush()
+
+
+    def flush(self, formulae=0):
+        """ Sends the counts not sent yet, and the number of formulae done """
+        if self.tries or formulae:
+            self.queue.put((self.tries, self.flips, formulae))
+        self.tries = 0
+        self.flips = 0
+        self.last_report = time.monotonic()
+
+
+class Progress:
+    """ Collects the reports of the tasks in a thread of the main process,
+    and prints a progress line with ETA every interval seconds;
+    optionally also written to a JSON status file.
+    """
+
+    def __init__(self, total_formulae, interval=60, status_file=None, stream=sys.stdout):
+        assert isinstance(total_formulae, int),\
+            "total_formulae = {} :: {} is no int".format(total_formulae, type(total_formulae))
+        assert interval > 0,\
+            "interval = {} <= 0".format(interval)
+
+        self.total_formulae = total_formulae
+        self.interval = interval
+        self.status_file = status_file
+        self.stream = stream
+        self.queue = mp.Queue()
+
+        self.formulae = 0
+        self.tries = 0
+        self.flips = 0
+        self.begin = None
+        self.last_flips = 0
+        self.last_time = None
+        self.thread = None
+        self.stopped = threading.Event()
+
+
+    def start(self):
+        """ Starts collecting; tasks run by the main process report as well """
+        set_queue(self.queue)
+        self.begin = self.last_time = time.monotonic()
+        self.thread = threading.Thread(target=self.__collect, daemon=True)
+        self.thread.start()
+
+
+    def stop(self):
+        """ Stops collecting, after reporting once more """
+        self.stopped.set()
+        self.thread.join()
+        set_queue(None)
+
+
+    def add(self, formulae):
+        """ Counts formulae done without tasks, e.g. taken from a cache """
+        self.queue.put((0, 0, formulae))
+
+
+    def __collect(self):
+        next_report = self.begin + self.interval
+        while True:
+            stopping = self.stopped.is_set()
+            try:
+                tries, flips, formulae = self.queue.get(timeout=0.2)
+            except queue.Empty:
+                # all reports sent before stop are collected
+                if stopping:
+                    self.report()
+                    return
+            else:
+                self.tries += tries
+                self.flips += flips
+                self.formulae += formulae
+
+            if time.monotonic() >= next_report:
+                self.report()
+                next_report += self.interval
+
+
+    def status(self):
+        """ Current progress as dict """
+        now = time.monotonic()
+        elapsed = now - self.begin
+        recent = now - self.last_time
+        remaining = self.total_formulae - self.formulae
+        return dict(
+            formulae=self.formulae,
+            total_formulae=self.total_formulae,
+            tries=self.tries,
+            flips=self.flips,
+            flips_per_second=(self.flips - self.last_flips) / recent if recent > 0 else None,
+            elapsed=elapsed,
+            eta=elapsed / self.formulae * remaining if self.formulae else None,
+            time=time.time(),
+        )
+
+
+    def report(self):
+        """ Prints the progress line, and writes the status file """
+        status = self.status()
+        self.last_flips = self.flips
+        self.last_time = time.monotonic()
+
+        self.stream.write(
+            'progress: {}/{} formulae, {} tries, {} flips/s, elapsed {}, ETA {}\n'.format(
+                status['formulae'],
+                status['total_formulae'],
+                status['tries'],
+                '{:.0f}'.format(status['flips_per_second'])
+                if status['flips_per_second'] is not None else '-',
+                Progress.__format_time(status['elapsed']),
+                Progress.__format_time(status['eta']),
+            )
+        )
+        self.stream.flush()
+
+        if self.status_file:
+            # replaced at once, so readers never see a partial file
+            tmp_file = '{}.tmp'.format(self.status_file)
+            with open(tmp_file, 'w') as f:
+                json.dump(status, f, indent=2)
+            os.replace(tmp_file, self.status_file)
+
+
+    @staticmethod
+    def __format_time(seconds):
+        if seconds is None:
+            return '-'
+        seconds = int(seconds)
+        return '{}h {}m {}s'.format(seconds // 3600, (seconds // 60) % 60, seconds % 60)
@@ -8,6 +8,9 @@
     - function mutual_information
     - class Queue
     - class WindowEntropy
+    - class RunningStats
+    - class P2Quantile
+    - class StreamSummary
 """
 
 
@@ -190,3 +193,154 @@ class WindowEntropy:
             return if_not_ready
 
         return self.current_entropy
+
+
+class RunningStats:
+    """ Streaming count, mean and variance after Welford """
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.mean = 0
+        self.m2 = 0
+        self.minimum = None
+        self.maximum = None
+
+
+    def add(self, x):
+        """ Add a new value """
+        self.count += 1
+        self.total += x
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+        if self.minimum is None or x < self.minimum:
+            self.minimum = x
+        if self.maximum is None or x > self.maximum:
+            self.maximum = x
+
+
+    def variance(self):
+        """ Return the sample variance of the values added so far """
+        if self.count < 2:
+            return 0
+        return self.m2 / (self.count - 1)
+
+
+class P2Quantile:
+    """ Streaming estimate of a single quantile with the P^2 algorithm
+    by Jain and Chlamtac; uses constant memory.
+    """
+    def __init__(self, p):
+        assert 0 < p < 1,\
+            "p = {} not in (0,1)".format(p)
+
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2*p, 1 + 4*p, 3 + 2*p, 5]
+        self.increments = [0, p/2, p, (1 + p)/2, 1]
+
+
+    def add(self, x):
+        """ Add a new value """
+        self.count += 1
+
+        # the first five values are the initial markers
+        if self.count <= 5:
+            self.heights.append(x)
+            self.heights.sort()
+            return
+
+        heights = self.heights
+        positions = self.positions
+
+        # find the cell k, such that heights[k] <= x < heights[k+1]
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k+1]:
+                k += 1
+
+        for i in range(k+1, 5):
+            positions[i] += 1
+        for i in range(0, 5):
+            self.desired[i] += self.increments[i]
+
+        # adjust the heights of the three middle markers
+        for i in range(1, 4):
+            d = self.desired[i] - positions[i]
+            if (d >= 1 and positions[i+1] - positions[i] > 1)\
+               or (d <= -1 and positions[i-1] - positions[i] < -1):
+                d = 1 if d > 0 else -1
+                h = self.__parabolic(i, d)
+                if not heights[i-1] < h < heights[i+1]:
+                    h = self.__linear(i, d)
+                heights[i] = h
+                positions[i] += d
+
+
+    def __parabolic(self, i, d):
+        h, n = self.heights, self.positions
+        return h[i] + d / (n[i+1] - n[i-1]) * (
+            (n[i] - n[i-1] + d) * (h[i+1] - h[i]) / (n[i+1] - n[i])
+            + (n[i+1] - n[i] - d) * (h[i] - h[i-1]) / (n[i] - n[i-1])
+        )
+
+
+    def __linear(self, i, d):
+        h, n = self.heights, self.positions
+        return h[i] + d * (h[i+d] - h[i]) / (n[i+d] - n[i])
+
+
+    def get_value(self):
+        """ Return the current estimate; None, if nothing was added yet """
+        if self.count == 0:
+            return None
+
+        if self.count <= 5:
+            return self.heights[round(self.p * (self.count - 1))]
+
+        return self.heights[2]
+
+
+class StreamSummary:
+    """ Constant size summary of a stream of values:
+    count, mean, variance, extrema and quartiles
+    """
+    QUANTILES = (('q25', 0.25), ('median', 0.5), ('q75', 0.75))
+
+    def __init__(self):
+        self.stats = RunningStats()
+        self.quantiles = [
+            (name, P2Quantile(p)) for name, p in StreamSummary.QUANTILES
+        ]
+
+
+    def add(self, x):
+        """ Add a new value """
+        self.stats.add(x)
+        for _, quantile in self.quantiles:
+            quantile.add(x)
+
+
+    def as_dict(self):
+        """ Return the summary as plain dict, e.g. for pickling or saving """
+        summary = dict(
+            count=self.stats.count,
+            total=self.stats.total,
+            mean=self.stats.mean,
+            variance=self.stats.variance(),
+            minimum=self.stats.minimum,
+            maximum=self.stats.maximum,
+        )
+        for name, quantile in self.quantiles:
+            summary[name] = quantile.get_value()
+
+        return summary
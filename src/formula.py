@@ -15,8 +15,14 @@ import random
 import platform
 import os
 import re
+import sys
+import math
+import io
+import hashlib
 import multiprocessing as mp
 
+from array import array
+
 from collections.abc import Sequence
 
 
@@ -43,11 +49,53 @@ if platform.sys.version_info.minor < 6:
     random.choices = choices
 
 
+# ratio between the weights of a clause pattern with i+1 and with i literals
+# satisfied by the planted assignment; yields 0.191, 0.118, 0.073 for 3-CNF
+PLANTED_WEIGHT_RATIO = (math.sqrt(5) - 1) / 2
+
+
+def _binomial(n, k):
+    """ Binomial coefficient n over k; math.comb needs python 3.8 """
+    result = 1
+    for i in range(1, k + 1):
+        result = result * (n - k + i) // i
+    return result
+
+
+def _write_planted_formula(args):
+    """ Generates a planted formula and writes it into the given directory;
+    returns the path of the written file.
+    """
+    directory, num_vars, ratio, clause_length, seed = args
+    formula = Formula.generate_planted_formula(
+        num_vars,
+        ratio,
+        clause_length=clause_length,
+        seed=seed,
+    )
+    filename = os.path.join(
+        directory,
+        'n{}-r{:.2f}-k{}-{}.cnf'.format(
+            num_vars,
+            ratio,
+            clause_length,
+            formula.digest()[:16].upper(),
+        )
+    )
+    with open(filename, 'w') as target:
+        formula.write_dimacs(target)
+
+    return filename
+
+
 class Formula:
     """ CNF formulae in DIMACS format """
 
     def __init__(self, dimacs=None, clauses=None, num_vars=None, sat_assignment=None):
-        """ Load a formula from a .cnf (DIMACS) file """
+        """ Load a formula from a .cnf (DIMACS) file, or from its clauses;
+        the planted satisfying assignment ('c assgn' line) is optional,
+        satisfying_assignment is None without one.
+        """
         # check for argument validity
         assert not dimacs or isinstance(dimacs, str),\
             "dimacs = {} :: {} is no str".format(dimacs, type(dimacs))
@@ -77,25 +125,51 @@ class Formula:
         if dimacs:
             numbers = re.compile(r'-?\d+')           # find numbers
             hex_numbers = re.compile(r'-?0x[0-9a-fA-F]+') # find hex numbers
+            # only formulae with a planted solution have a 'c assgn' line
+            hex_val = None
+            # literals of a clause continued on the next line
+            clause = []
 
             for line in dimacs.splitlines():
+                line = line.strip()
+                if not line:
+                    continue
                 if line[0] == 'c':
                     if line.startswith('c assgn'):
                         hex_val, = hex_numbers.findall(line)
                     else:
                         self.comments.append(line)
                 elif line[0] == 'p':
-                    num_vars, num_clauses = numbers.findall(line)
+                    # the number of clauses is taken from the clauses themselves
+                    num_vars, _ = numbers.findall(line)
                     self.num_vars = int(num_vars)
-                    self.num_clauses = int(num_clauses)
-                    self.satisfying_assignment = Assignment(int(hex_val, 16), int(num_vars))
+                    if hex_val is not None:
+                        self.satisfying_assignment = Assignment(int(hex_val, 16), int(num_vars))
+                elif line[0] == '%':
+                    # end of the clauses in SATLIB files
+                    break
                 else:
-                    self.clauses.append(list(map(int, numbers.findall(line)))[:-1])
-                    if len(self.clauses[-1]) > self.max_clause_length:
-                        self.max_clause_length = len(self.clauses[-1])
+                    literals = list(map(int, numbers.findall(line)))
+                    if not clause and literals and literals[-1] == 0 and 0 not in literals[:-1]:
+                        # one clause per line, as usual
+                        self.clauses.append(literals[:-1])
+                        continue
+                    for lit in literals:
+                        if lit == 0:
+                            self.clauses.append(clause)
+                            clause = []
+                        else:
+                            clause.append(lit)
+
+            if clause:
+                # the last clause may lack its terminating 0
+                self.clauses.append(clause)
+            self.num_clauses = len(self.clauses)
+            if self.clauses:
+                self.max_clause_length = max(map(len, self.clauses))
 
         # or use the given stuff
-        elif not dimacs and clauses and num_vars and sat_assignment:
+        elif not dimacs and clauses and num_vars:
             self.satisfying_assignment = sat_assignment
             self.clauses = clauses
             self.num_clauses = len(clauses)
@@ -104,7 +178,7 @@ class Formula:
 
         else:
             raise ValueError(
-                "Either 'dimacs' or 'clauses', 'num_vars' and 'sat_assignment' must be provided"
+                "Either 'dimacs' or 'clauses' and 'num_vars' must be provided"
             )
 
         self.occurrences = [[] for _ in range(0, self.num_vars*2+1)]
@@ -120,6 +194,31 @@ class Formula:
 
         self.ratio = self.num_clauses / self.num_vars
 
+        # content digest; computed on demand
+        self._digest = None
+
+
+    def digest(self):
+        """ Returns a stable hex digest (SHA-256) of the formula's content,
+        i.e. the number of variables, the canonical clause array and the
+        planted satisfying assignment; it is computed once and cached.
+        The clause array has the literals of each clause, and the clauses,
+        sorted, so formulae only differing in their order get the same digest.
+        """
+        if self._digest is None:
+            canonical = array('q', [self.num_vars, self.num_clauses])
+            for clause in sorted(sorted(clause) for clause in self.clauses):
+                canonical.append(len(clause))
+                canonical.extend(clause)
+            if sys.byteorder == 'big':
+                canonical.byteswap()
+
+            sha = hashlib.sha256(canonical.tobytes())
+            sha.update(str(self.satisfying_assignment).encode())
+            self._digest = sha.hexdigest()
+
+        return self._digest
+
 
     def __eq__(self, formula):
         if not formula:
@@ -134,19 +233,27 @@ class Formula:
 
     def __str__(self):
         """ Represent formula in DIMACS format """
+        text = io.StringIO()
+        self.write_dimacs(text)
+        return text.getvalue()
 
-        to_return = "\n".join(self.comments)
 
-        #for comment in self.comments:
-        #    to_return += comment
-        to_return += 'c assgn {}\n'.format(str(self.satisfying_assignment))
-        to_return += 'p cnf {} {}\n'.format(self.num_vars, self.num_clauses)
-        for clause in self.clauses:
-            for literal in clause:
-                to_return += '{} '.format(literal)
-            to_return += '0\n'
+    def write_dimacs(self, target, chunk_size=4096):
+        """ Write the formula in DIMACS format to a text file handle,
+        including the planted assignment as 'c assgn' comment;
+        the clauses are formatted and written in chunks.
+        """
+        for comment in self.comments:
+            target.write(comment + '\n')
+        if self.satisfying_assignment:
+            target.write('c assgn {}\n'.format(str(self.satisfying_assignment)))
+        target.write('p cnf {} {}\n'.format(self.num_vars, self.num_clauses))
 
-        return to_return
+        for begin in range(0, len(self.clauses), chunk_size):
+            target.write(''.join(
+                ' '.join(map(str, clause)) + ' 0\n'
+                for clause in self.clauses[begin:begin+chunk_size]
+            ))
 
 
     def is_satisfied_by(self, assignment):
@@ -234,6 +341,86 @@ class Formula:
         return formula
 
 
+    @staticmethod
+    def generate_planted_formula(num_vars, ratio, clause_length=3, seed=None):
+        """ Randomly generates a formula with a planted satisfying assignment,
+        for any clause length k; all clauses are drawn in NumPy batches.
+
+        The sign pattern of a clause with i literals satisfied by the planted
+        assignment has weight PLANTED_WEIGHT_RATIO^i (0 for i = 0), like the
+        weights in generate_satisfiable_formula for k = 3.
+
+        Positionals:
+            num_vars -- number of variables
+            ratio -- ratio #clauses/#variables
+
+        Keywords:
+            clause_length -- number of literals per clause
+            seed -- seed or numpy.random.SeedSequence
+
+        Needs numpy 1.17 or later, for default_rng, as pinned in req.txt.
+        """
+        assert isinstance(clause_length, int),\
+            "clause_length = {} :: {} is no int".format(clause_length, type(clause_length))
+        assert clause_length > 0,\
+            "clause_length = {} <= 0".format(clause_length)
+        assert isinstance(num_vars, int),\
+            "num_vars = {} :: {} is no int".format(num_vars, type(num_vars))
+        assert num_vars >= clause_length,\
+            "num_vars = {} < {} = clause_length".format(num_vars, clause_length)
+        assert isinstance(ratio, float),\
+            "ratio = {} :: {} is no float".format(ratio, type(ratio))
+        assert ratio > 0,\
+            "ratio = {} <= 0".format(ratio)
+
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        num_clauses = int(ratio * num_vars)
+        k = clause_length
+
+        planted = rng.random(num_vars) < 0.5
+
+        # k distinct variables per clause; redraw clauses with duplicates
+        variables = rng.integers(1, num_vars + 1, size=(num_clauses, k))
+        while k > 1:
+            ordered = np.sort(variables, axis=1)
+            duplicates = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+            if not duplicates.any():
+                break
+            variables[duplicates] = rng.integers(
+                1, num_vars + 1, size=(int(duplicates.sum()), k)
+            )
+
+        # number of satisfied literals per clause; there are binom(k,i) patterns with i
+        probs = np.array([
+            _binomial(k, i) * PLANTED_WEIGHT_RATIO ** i for i in range(1, k + 1)
+        ])
+        num_true = rng.choice(np.arange(1, k + 1), size=num_clauses, p=probs / probs.sum())
+
+        # choose the satisfied positions uniformly among the clause's literals
+        keys = rng.random((num_clauses, k))
+        thresholds = np.sort(keys, axis=1)[np.arange(num_clauses), num_true - 1]
+        satisfied = keys <= thresholds[:, None]
+
+        # a literal is positive, iff it is satisfied and the variable is true,
+        # or it is unsatisfied and the variable is false
+        literals = np.where(planted[variables - 1] == satisfied, variables, -variables)
+
+        formula = Formula(
+            clauses=literals.tolist(),
+            num_vars=num_vars,
+            sat_assignment=Assignment(planted.tolist(), num_vars),
+        )
+
+        assert formula.is_satisfied_by(formula.satisfying_assignment),\
+            "satisfying_assignment = {} does not satisfy formula".format(
+                formula.satisfying_assignment
+            )
+
+        return formula
+
+
     @staticmethod
     def generate_formula_pool(
             directory,
@@ -242,8 +429,17 @@ class Formula:
             ratio,
             clause_length=3,
             poolsize=1,
-            verbose=False):
-        """ Generates a set of random formulae and writes them into the given directory """
+            verbose=False,
+            seed=None):
+        """ Generates a set of random formulae and writes them into the given directory;
+        every file is written as soon as its formula is generated.
+
+        Keywords:
+            clause_length -- number of literals per clause
+            poolsize -- number of parallel processes
+            verbose -- print the written file names
+            seed -- seed, from which the seeds of the single formulae are spawned
+        """
         assert isinstance(directory, str),\
             "directory = {} :: {} is no str".format(directory, type(directory))
         assert isinstance(number, int),\
@@ -268,51 +464,30 @@ class Formula:
         except FileExistsError:
             pass
 
-        with mp.Pool(processes=poolsize) as pool:
-            future_formulae = []
-            for _ in range(0, number):
-                future_formula = pool.apply_async(
-                    Formula.generate_satisfiable_formula,
-                    (
-                        num_vars,
-                        ratio,
-                        clause_length
-                    )
-                )
-                future_formulae.append(future_formula)
-            for future_formula in future_formulae:
-                formula = future_formula.get()
-                filename = 'n{}-r{:.2f}-k{}-{:016X}.cnf'.format(
-                    num_vars,
-                    ratio,
-                    clause_length,
-                    hash(formula),
-                )
-                with open(os.path.join(directory, filename), 'w') as target:
-                    target.write(str(formula))
+        import numpy as np
 
+        tasks = iter(
+            (directory, num_vars, ratio, clause_length, file_seed)
+            for file_seed in np.random.SeedSequence(seed).spawn(number)
+        )
 
+        def collect(written):
+            filenames = []
+            for filename in written:
+                filenames.append(filename)
                 if verbose:
-                    print(
-                        'File {} written.'.format(
-                            os.path.join(directory, filename)
-                        )
-                    )
+                    print('File {} written.'.format(filename))
+            return filenames
 
+        if poolsize > 1:
+            with mp.Pool(processes=poolsize) as pool:
+                return collect(pool.imap_unordered(_write_planted_formula, tasks))
+        else:
+            return collect(map(_write_planted_formula, tasks))
 
 
     def __hash__(self):
-        return abs(
-            hash(
-                '{}{}{}{}{}'.format(
-                    self.num_vars,
-                    self.max_clause_length,
-                    self.ratio,
-                    str(self.satisfying_assignment),
-                    id(self)
-                )
-            )
-        )
+        return int(self.digest()[:16], 16)
 
 
 class Assignment:
@@ -338,25 +513,21 @@ class Assignment:
     @staticmethod
     def atoms_from_integer(number):
         """ Takes a number and converts it into a list of booleans """
-        atoms = []
-        num = number
-        while num > 0:
-            atoms.append(num % 2 == 1)
-            num //= 2
+        if number <= 0:
+            return []
 
-        return atoms
+        # via the binary representation, for the bitwise way is quadratic for big numbers
+        return [digit == '1' for digit in reversed(bin(number)[2:])]
 
 
     @staticmethod
     def integer_from_atoms(atoms):
         """ Takes a list of booleans and converts it into a number """
-        num = 0
-        tmp = atoms.copy()
-        while tmp:
-            num *= 2
-            num += 1 if tmp.pop() else 0
+        if not atoms:
+            return 0
 
-        return num
+        # via the binary representation, for the bitwise way is quadratic for big numbers
+        return int(''.join('1' if atom else '0' for atom in reversed(atoms)), 2)
 
 
     def flip(self, var_index):
@@ -0,0 +1,112 @@
+"""
+## Module src.solver.budget
+
+### Contents
+    - class Budget
+"""
+
+from time import monotonic
+
+
+class Budget:
+    """ Wall time and flip budgets of a run of generic_sls on one formula,
+    besides max_tries and max_flips.
+
+    The flip budget is enforced exactly, by shortening the tries; the time
+    budgets are checked every check_every flips, and after every try.
+    If cancel is given, it is called at the same times; the run is
+    aborted, as soon as it returns True, e.g. when another solver
+    has already found a solution.
+    After the run, reason holds why the run was aborted, and try_reasons
+    why each try was; None for tries ended regularly.
+
+    Reasons:
+        'try_time' -- the try exceeded its wall time; the next try starts
+        'time' -- the run exceeded its wall time
+        'flips' -- the run exceeded its total number of flips
+        'cancelled' -- the run was cancelled
+    """
+
+    REASONS = ('try_time', 'time', 'flips', 'cancelled')
+
+    def __init__(self, try_time=None, time=None, flips=None, check_every=1000, cancel=None):
+        assert try_time is None or try_time > 0,\
+            "try_time = {} <= 0".format(try_time)
+        assert time is None or time > 0,\
+            "time = {} <= 0".format(time)
+        assert flips is None or isinstance(flips, int),\
+            "flips = {} :: {} is no int".format(flips, type(flips))
+        assert flips is None or flips > 0,\
+            "flips = {} <= 0".format(flips)
+        assert isinstance(check_every, int),\
+            "check_every = {} :: {} is no int".format(check_every, type(check_every))
+        assert check_every > 0,\
+            "check_every = {} <= 0".format(check_every)
+        assert cancel is None or callable(cancel),\
+            "cancel = {} :: {} is not callable".format(cancel, type(cancel))
+
+        self.try_time = try_time
+        self.time = time
+        self.max_flips = flips
+        self.check_every = check_every
+        self.cancel = cancel
+        self.start()
+
+
+    def start(self):
+        """ Starts the run """
+        self.begin = monotonic()
+        self.flips = 0
+        self.reason = None
+        self.try_reasons = []
+
+
+    def start_try(self, max_flips):
+        """ Starts a try; returns its number of flips, limited by the flip budget """
+        self.try_begin = monotonic()
+        self.try_reason = None
+        if self.max_flips is None:
+            return max_flips
+
+        return min(max_flips, self.max_flips - self.flips)
+
+
+    def exceeded(self):
+        """ Checks the time budgets; True, if the current try is to be aborted """
+        now = monotonic()
+        if self.cancel is not None and self.cancel():
+            self.reason = self.try_reason = 'cancelled'
+        elif self.time is not None and now - self.begin >= self.time:
+            self.reason = self.try_reason = 'time'
+        elif self.try_time is not None and now - self.try_begin >= self.try_time:
+            self.try_reason = 'try_time'
+
+        return self.try_reason is not None
+
+
+    def end_try(self, flips, success):
+        """ Ends a try with the given number of flips;
+        True, if the run is to be aborted.
+        """
+        self.flips += flips
+        if not success and self.try_reason is None:
+            if self.max_flips is not None and self.flips >= self.max_flips:
+                self.reason = self.try_reason = 'flips'
+            elif self.cancel is not None and self.cancel():
+                self.reason = 'cancelled'
+            elif self.time is not None and monotonic() - self.begin >= self.time:
+                # the try ended regularly, but there is no time for another one
+                self.reason = 'time'
+        self.try_reasons.append(self.try_reason)
+
+        return not success and self.reason is not None
+
+
+    def as_dict(self):
+        """ Parameters of the budget, by keyword; without cancel """
+        return dict(
+            try_time=self.try_time,
+            time=self.time,
+            flips=self.max_flips,
+            check_every=self.check_every,
+        )
@@ -10,12 +10,24 @@
 import random
 
 from src.formula import Formula, Assignment
-from src.solver.utils import Falselist
+from src.solver.utils import ArrayFalselist
+from src.solver.restart import restart_policy
 
 class Context:
     """ Context for GSAT, WalkSAT and ProbSAT solvers """
 
-    def __init__(self, score_constr, formula, assgn):
+    def __init__(self, score_constr, formula, assgn, falselist=None):
+        """ Initialize the context.
+
+        Positionals:
+            score_constr -- constructor of the score table
+            formula -- formula to be solved
+            assgn -- current assignment
+
+        Keywords:
+            falselist -- empty falselist to be (re)used; if not given,
+                         a new one is allocated
+        """
         assert isinstance(formula, Formula),\
             "formula = {} :: {} is no Formula".format(formula, type(formula))
         assert isinstance(assgn, Assignment),\
@@ -24,7 +36,11 @@ class Context:
         self.formula = formula
         self.assgn = assgn
         self.variables = list(range(1, formula.num_vars+1))
-        self.falselist = Falselist()
+        if falselist is None:
+            falselist = ArrayFalselist(formula.num_clauses)
+        assert not falselist,\
+            "falselist = {} is not empty".format(list(falselist))
+        self.falselist = falselist
         self.score = score_constr(self.formula, self.assgn, self.falselist)
 
     def update(self, flipped_var):
@@ -60,9 +76,23 @@ def generic_sls(
         context_constructor,
         measurement_constructor,
         hamming_dist=0,
-        rand_gen=random):
+        rand_gen=random,
+        instrumentation=None,
+        on_try=None,
+        budget=None,
+        restart=None):
     """ Generic SLS-Solver according to Algorithm 1,
     including measurement facilities.
+
+    If an Instrumentation is given, every flip is counted by it, and
+    every sample_every-th flip of a try is done, and timed, by it.
+    If on_try is given, it is called after each try with the number
+    of flips of the try, and whether it was successful.
+    If a Budget is given, the tries are run in chunks of its check_every
+    flips, and its time budgets are checked between them; the run is
+    aborted, when it is exhausted.
+    The number of flips of each try is given by the restart policy,
+    see restart_policy; by default, it is max_flips.
     """
 
     assert callable(heuristic),\
@@ -79,17 +109,31 @@ def generic_sls(
         "max_flips = {} <= 0".format(max_flips)
     assert callable(context_constructor),\
         "context_constructor = {} :: {} is not callable"
+    assert hamming_dist == 0 or formula.satisfying_assignment is not None,\
+        "hamming_dist = {} > 0, but the formula has no planted solution".format(hamming_dist)
 
 
     #initialize measurement object
     measurement = measurement_constructor(formula, formula.num_vars)
 
+    # the falselist is allocated once, and cleared for each try
+    falselist = ArrayFalselist(formula.num_clauses)
+
+    if instrumentation is not None:
+        sample_every = instrumentation.sample_every
+
+    restart = restart_policy(restart)
+    restart.start()
+    if budget is not None:
+        budget.start()
+
     for _ in range(max_tries):
         # generate random assingnment
         if hamming_dist > 0:
             # if a hamming distance > 0 is given
-            # flip 'hamming_dist' steps away from the satisfying assignment
-            current_assignment = formula.satisfying_assignment
+            # flip 'hamming_dist' steps away from the satisfying assignment;
+            # on a copy, as the formula may be shared by later runs
+            current_assignment = formula.satisfying_assignment.copy()
             for flip in rand_gen.sample(range(1, formula.num_vars+1), hamming_dist):
                 current_assignment.flip(flip)
         else:
@@ -102,29 +146,86 @@ def generic_sls(
         measurement.init_run(current_assignment)
 
         # initialize context
-        context = context_constructor(formula, current_assignment)
+        falselist.clear()
+        context = context_constructor(formula, current_assignment, falselist=falselist)
         assert hasattr(context, 'update') and callable(context.update),\
             "context = {} has no method update"
         assert hasattr(context, 'is_sat') and callable(context.is_sat),\
             "context = {} has no method is_sat"
 
-        for _ in range(max_flips):
-            # check, if the current assignment is a solution
-            if context.is_sat():
-                measurement.end_run(success=True)
-                return current_assignment, measurement
-
-            # choose variable to flip
-            to_flip = heuristic(context, rand_gen)
-
-            # update context
-            # also modifies 'current_assignment'
-            context.update(to_flip)
-
-            # register flip in measurement object
-            measurement.count(to_flip)
-
-        measurement.end_run(success=False)
+        # without a budget or stagnation checks, the try is done in a single chunk
+        try_flips = restart.cutoff(max_flips)
+        if budget is not None:
+            try_flips = budget.start_try(try_flips)
+        chunk_size = min(
+            try_flips,
+            budget.check_every if budget is not None else try_flips,
+            restart.check_every or try_flips,
+        )
+        restart.start_try(context)
+        if instrumentation is not None:
+            instrumentation.start_try(context)
+
+        flips = 0
+        success = False
+        while flips < try_flips:
+            chunk = min(chunk_size, try_flips - flips)
+            if instrumentation is None:
+                for done in range(chunk):
+                    # check, if the current assignment is a solution
+                    if context.is_sat():
+                        success = True
+                        break
+
+                    # choose variable to flip
+                    to_flip = heuristic(context, rand_gen)
+
+                    # update context
+                    # also modifies 'current_assignment'
+                    context.update(to_flip)
+
+                    # register flip in measurement object
+                    measurement.count(to_flip)
+                else:
+                    done = chunk
+            else:
+                # the same loop, with the hooks of the instrumentation
+                for done in range(chunk):
+                    if context.is_sat():
+                        success = True
+                        break
+
+                    if (flips + done) % sample_every == 0:
+                        # choose and flip the variable, timed
+                        to_flip = instrumentation.sample(heuristic, context, rand_gen)
+                    else:
+                        to_flip = heuristic(context, rand_gen)
+                        context.update(to_flip)
+
+                    measurement.count(to_flip)
+                    instrumentation.count(context)
+                else:
+                    done = chunk
+            flips += done
+
+            if success or flips >= try_flips:
+                break
+            if budget is not None and budget.exceeded():
+                break
+            if restart.stagnated(context, flips):
+                break
+
+        if instrumentation is not None:
+            instrumentation.end_try()
+        measurement.end_run(success=success)
+        if on_try is not None:
+            on_try(flips, success)
+
+        if budget is not None and budget.end_try(flips, success):
+            break
+
+        if success:
+            return current_assignment, measurement
 
     # If no solution is found,
     # return None
@@ -70,7 +70,7 @@ def gsat_heuristic(noise_param=0):
             var -- variable to be flipped
         """
         _, best = context.score.get_best_bucket()
-        return rand_gen.choice(list(best))
+        return rand_gen.choice(best.lst)
 
     return heur
 
@@ -81,7 +81,11 @@ def gsat(
         max_tries, max_flips,
         noise_param=0,              # will be ignored
         hamming_dist=0,
-        rand_gen=random):
+        rand_gen=random,
+        instrumentation=None,
+        on_try=None,
+        budget=None,
+        restart=None):
 
     """ GSAT Solver.
 
@@ -96,6 +100,10 @@ def gsat(
         hamming_dist -- force random assignment to be at a certain hamming distance
                         to the known satsifying one.
         rand_gen -- random number generator
+        instrumentation -- Instrumentation of the flip loop, or None
+        on_try -- callback after each try, see generic_sls
+        budget -- Budget of the run, or None
+        restart -- restart policy, or its description; see restart_policy
     """
 
     return generic_sls(
@@ -107,4 +115,8 @@ def gsat(
         measurement_constructor,
         hamming_dist=hamming_dist,
         rand_gen=rand_gen,
+        instrumentation=instrumentation,
+        on_try=on_try,
+        budget=budget,
+        restart=restart,
     )
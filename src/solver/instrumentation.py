@@ -0,0 +1,123 @@
+"""
+## Module src.solver.instrumentation
+
+### Contents
+    - class Instrumentation
+"""
+
+import time
+
+
+class Instrumentation:
+    """ Counters and timers of the flip loop of generic_sls.
+
+    Every flip counts towards the number of flips and the plateaus, i.e.
+    runs of consecutive flips not changing the number of false clauses.
+    Every sample_every-th flip is sampled; the time spent in the heuristic
+    and in the update of the context, and the size of the falselist are
+    accumulated. Samples taken on a plateau are accumulated separately as well.
+
+    generic_sls calls start_try and end_try around each try, does every
+    sample_every-th flip of a try by sample, and counts every flip by count;
+    without an Instrumentation, it does none of these.
+    """
+
+    FIELDS = (
+        'sample_every',
+        'flips',
+        'samples',
+        'heuristic_time',
+        'update_time',
+        'falselist_size',
+        'plateau_samples',
+        'plateau_heuristic_time',
+        'plateaus',
+        'plateau_flips',
+        'max_plateau',
+    )
+
+    def __init__(self, sample_every=64):
+        assert isinstance(sample_every, int),\
+            "sample_every = {} :: {} is no int".format(sample_every, type(sample_every))
+        assert sample_every > 0,\
+            "sample_every = {} <= 0".format(sample_every)
+
+        self.sample_every = sample_every
+        self.flips = 0
+        self.samples = 0
+        self.heuristic_time = 0.0
+        self.update_time = 0.0
+        self.falselist_size = 0
+        self.plateau_samples = 0
+        self.plateau_heuristic_time = 0.0
+        self.plateaus = 0
+        self.plateau_flips = 0
+        self.max_plateau = 0
+        self.__unsat = 0
+        self.__plateau = 0
+
+
+    def start_try(self, context):
+        """ Starts the counters of a try on its initial context """
+        self.__unsat = len(context.falselist)
+        self.__plateau = 0
+
+
+    def sample(self, heuristic, context, rand_gen):
+        """ Does a sampled flip: chooses the variable to flip by heuristic,
+        and updates context, timing both.
+
+        Positionals:
+            heuristic -- heuristic choosing the variable to flip
+            context -- context of the try
+            rand_gen -- random number generator
+
+        Returns:
+            to_flip -- the flipped variable
+        """
+        clock = time.perf_counter
+        begin = clock()
+        to_flip = heuristic(context, rand_gen)
+        chosen = clock()
+        context.update(to_flip)
+        updated = clock()
+
+        self.samples += 1
+        self.heuristic_time += chosen - begin
+        self.update_time += updated - chosen
+        self.falselist_size += self.__unsat
+        if self.__plateau:
+            self.plateau_samples += 1
+            self.plateau_heuristic_time += chosen - begin
+
+        return to_flip
+
+
+    def count(self, context):
+        """ Counts a flip, sampled or not, after context was updated """
+        self.flips += 1
+        unsat = len(context.falselist)
+        if unsat == self.__unsat:
+            self.__plateau += 1
+        elif self.__plateau:
+            self.__end_plateau(self.__plateau)
+            self.__plateau = 0
+        self.__unsat = unsat
+
+
+    def end_try(self):
+        """ Ends the plateau the try stopped on, if any """
+        if self.__plateau:
+            self.__end_plateau(self.__plateau)
+            self.__plateau = 0
+
+
+    def __end_plateau(self, length):
+        self.plateaus += 1
+        self.plateau_flips += length
+        self.max_plateau = max(self.max_plateau, length)
+
+
+    def as_dict(self):
+        """ The accumulated counters, by name """
+        return {field: getattr(self, field) for field in Instrumentation.FIELDS}
@@ -0,0 +1,234 @@
+"""
+## Module src.solver.preprocess
+
+### Contents
+    - class Reduction
+    - function simplify_clauses
+    - function preprocess
+"""
+
+from src.formula import Formula, Assignment
+
+
+class Reduction:
+    """ Mapping of a formula reduced by preprocess back to the original one """
+
+    def __init__(self, num_vars, fixed, var_map, planted=None, unsat=False):
+        """ Initialize the reduction.
+
+        Positionals:
+            num_vars -- number of variables of the original formula
+            fixed -- dict of the values of the variables fixed by preprocessing
+            var_map -- var_map[i-1] is the original variable of the variable i
+                       of the reduced formula
+
+        Keywords:
+            planted -- planted solution of the original formula, or None
+            unsat -- True, if preprocessing derived the empty clause
+        """
+        self.num_vars = num_vars
+        self.fixed = fixed
+        self.var_map = var_map
+        self.planted = planted
+        self.unsat = unsat
+
+
+    def reduce(self, assgn):
+        """ Restricts an assignment of the original formula to the reduced one """
+        assert isinstance(assgn, Assignment),\
+            "assgn = {} :: {} is no Assignment".format(assgn, type(assgn))
+        assert assgn.num_vars == self.num_vars,\
+            "assgn.num_vars = {} != {}".format(assgn.num_vars, self.num_vars)
+
+        return Assignment([assgn[var] for var in self.var_map], len(self.var_map))
+
+
+    def extend(self, assgn=None):
+        """ Extends an assignment of the reduced formula to the original one;
+        the fixed variables get their fixed value, the variables removed
+        without being fixed the one of the planted solution, or False.
+
+        Keywords:
+            assgn -- assignment of the reduced formula; None, if every
+                     clause was removed
+
+        Returns:
+            full -- assignment of the original formula
+        """
+        assert not self.unsat,\
+            "the formula is unsatisfiable"
+        assert assgn is None or assgn.num_vars == len(self.var_map),\
+            "assgn.num_vars = {} != {}".format(assgn.num_vars, len(self.var_map))
+
+        if self.planted is not None:
+            atoms = list(self.planted.atoms)
+        else:
+            atoms = [False] * self.num_vars
+        for var, value in self.fixed.items():
+            atoms[var-1] = value
+        if assgn is not None:
+            for new_var, var in enumerate(self.var_map, start=1):
+                atoms[var-1] = assgn[new_var]
+
+        return Assignment(atoms, self.num_vars)
+
+
+def simplify_clauses(clauses):
+    """ Removes repeated literals, tautologies and duplicate clauses,
+    keeping the order of the remaining ones.
+
+    Positionals:
+        clauses -- list of clauses, as lists of literals
+
+    Returns:
+        clauses -- list of the remaining clauses
+    """
+    seen = set()
+    simplified = []
+    for clause in clauses:
+        clause = list(dict.fromkeys(clause))
+        literals = frozenset(clause)
+        if any(-lit in literals for lit in clause):
+            continue
+        if literals in seen:
+            continue
+        seen.add(literals)
+        simplified.append(clause)
+
+    return simplified
+
+
+def _subsumed(clauses):
+    """ Indices of the clauses subsumed by a shorter or earlier one """
+    occurrences = {}
+    sets = [frozenset(clause) for clause in clauses]
+    for idx, clause in enumerate(clauses):
+        for lit in clause:
+            occurrences.setdefault(lit, []).append(idx)
+
+    subsumed = set()
+    for idx in sorted(range(len(clauses)), key=lambda i: len(clauses[i])):
+        if idx in subsumed:
+            continue
+        # every clause subsumed contains the rarest literal of the clause
+        rarest = min(clauses[idx], key=lambda lit: len(occurrences[lit]))
+        for other in occurrences[rarest]:
+            if other != idx and other not in subsumed and sets[idx] <= sets[other]:
+                subsumed.add(other)
+
+    return subsumed
+
+
+def preprocess(formula, units=True, pure_literals=True, subsumption=True):
+    """ Simplifies a formula before the local search: removes repeated
+    literals, tautologies and duplicate clauses, and, until nothing
+    changes any more, propagates unit clauses, fixes pure literals
+    and removes subsumed clauses. The remaining variables are numbered
+    consecutively; the planted solution, if any, is restricted to them,
+    and still satisfies the reduced formula.
+
+    Positionals:
+        formula -- formula to be simplified
+
+    Keywords:
+        units -- propagate unit clauses
+        pure_literals -- fix pure literals
+        subsumption -- remove subsumed clauses
+
+    Returns:
+        reduced -- reduced formula; None, if no clause is left, or the
+                   formula is unsatisfiable
+        reduction -- Reduction mapping assignments of reduced to formula
+    """
+    assert isinstance(formula, Formula),\
+        "formula = {} :: {} is no Formula".format(formula, type(formula))
+
+    clauses = simplify_clauses(formula.clauses)
+    fixed = {}
+    if any(not clause for clause in clauses):
+        return None, Reduction(
+            formula.num_vars, fixed, [],
+            planted=formula.satisfying_assignment,
+            unsat=True,
+        )
+
+    changed = True
+    while changed and clauses:
+        changed = False
+
+        if units:
+            unit_clauses = [clause[0] for clause in clauses if len(clause) == 1]
+            while unit_clauses:
+                for lit in unit_clauses:
+                    if fixed.get(abs(lit), lit > 0) != (lit > 0):
+                        return None, Reduction(
+                            formula.num_vars, fixed, [],
+                            planted=formula.satisfying_assignment,
+                            unsat=True,
+                        )
+                    fixed[abs(lit)] = lit > 0
+                true_lits = set(unit_clauses)
+                remaining = []
+                for clause in clauses:
+                    if any(lit in true_lits for lit in clause):
+                        continue
+                    reduced_clause = [lit for lit in clause if -lit not in true_lits]
+                    if not reduced_clause:
+                        return None, Reduction(
+                            formula.num_vars, fixed, [],
+                            planted=formula.satisfying_assignment,
+                            unsat=True,
+                        )
+                    remaining.append(reduced_clause)
+                clauses = remaining
+                changed = True
+                unit_clauses = list(set(clause[0] for clause in clauses if len(clause) == 1))
+
+        if pure_literals and clauses:
+            lits = set(lit for clause in clauses for lit in clause)
+            pure = set(lit for lit in lits if -lit not in lits)
+            if pure:
+                for lit in pure:
+                    fixed[abs(lit)] = lit > 0
+                clauses = [
+                    clause for clause in clauses
+                    if not any(lit in pure for lit in clause)
+                ]
+                changed = True
+
+        if subsumption and clauses:
+            subsumed = _subsumed(clauses)
+            if subsumed:
+                clauses = [clause for idx, clause in enumerate(clauses) if idx not in subsumed]
+                changed = True
+
+        # removing clauses may have left duplicates
+        if changed:
+            clauses = simplify_clauses(clauses)
+
+    var_map = sorted(set(abs(lit) for clause in clauses for lit in clause))
+    reduction = Reduction(
+        formula.num_vars,
+        fixed,
+        var_map,
+        planted=formula.satisfying_assignment,
+    )
+    if not clauses:
+        return None, reduction
+
+    new_var = {var: idx for idx, var in enumerate(var_map, start=1)}
+    reduced_clauses = [
+        [new_var[lit] if lit > 0 else -new_var[-lit] for lit in clause]
+        for clause in clauses
+    ]
+    planted = None
+    if formula.satisfying_assignment is not None:
+        planted = reduction.reduce(formula.satisfying_assignment)
+
+    reduced = Formula(
+        clauses=reduced_clauses,
+        num_vars=len(var_map),
+        sat_assignment=planted,
+    )
+    reduced.comments = list(formula.comments)
+    return reduced, reduction
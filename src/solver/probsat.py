@@ -2,6 +2,11 @@
 ## Module src.solver.probsat
 
 ### Contents
+    - function poly
+    - function poly_weight
+    - function exp_weight
+    - function poly_eps_weight
+    - function break_weights
     - function probsat_distribution
     - function probsat_heuristic
     - function probsat
@@ -18,14 +23,64 @@ def poly(br_score):
     """ Calculate weighted break score """
     return 1/(1+br_score)
 
-BREAKS = []
 
-def probsat_distribution(noise_param):
+# epsilon of the poly-eps weighting, (eps + b)^-cb
+POLY_EPS = 1.0
+
+
+def poly_weight(br_score, noise_param):
+    """ Polynomial weighting 1/(1+b^cb) """
+    return poly(pow(br_score, noise_param))
+
+
+def exp_weight(br_score, noise_param):
+    """ Exponential weighting cb^-b """
+    return pow(noise_param, -br_score)
+
+
+def poly_eps_weight(br_score, noise_param):
+    """ Polynomial weighting (eps+b)^-cb, as in the original ProbSAT """
+    return pow(POLY_EPS + br_score, -noise_param)
+
+
+WEIGHTINGS = {
+    'poly': poly_weight,
+    'exp': exp_weight,
+    'poly-eps': poly_eps_weight,
+}
+
+
+def break_weights(noise_param, max_break, weighting='poly'):
+    """ Precomputes the weights of all break scores up to max_break.
+
+    Positionals:
+        noise_param -- parameter cb for ProbSAT
+        max_break -- maximum break score
+
+    Keywords:
+        weighting -- name of the weighting function in WEIGHTINGS
+
+    Returns:
+        weights -- list, where weights[b] is the weight of break score b
+    """
+    assert weighting in WEIGHTINGS,\
+        "weighting = {} not in {}".format(weighting, list(WEIGHTINGS))
+    assert weighting != 'exp' or noise_param > 0,\
+        "noise_param = {} <= 0 for exponential weighting".format(noise_param)
+
+    weight = WEIGHTINGS[weighting]
+    return [weight(b, noise_param) for b in range(0, max_break+1)]
+
+
+def probsat_distribution(noise_param, weighting='poly'):
     """ Constructs a function, returning the specific distribution of the ProbSAT heuristic.
 
     Positionals:
         noise_param -- parameter cb for ProbSAT; should hold 0 <= cb
 
+    Keywords:
+        weighting -- name of the break weighting function; poly, exp or poly-eps
+
     Returns:
         dist -- function return a probability distribution, given a context value
     """
@@ -35,6 +90,10 @@ def probsat_distribution(noise_param):
     assert 0 <= noise_param,\
         "noise_param = {} < 0"
 
+    # weights of the break scores; (re)built for the first formula
+    # with more occurrences than the table covers
+    weights = []
+
     def probsat_distr(context):
         """ Returns the specific probability distribution for the ProbSAT heuristic,
         given a context.
@@ -46,12 +105,11 @@ def probsat_distribution(noise_param):
             distr -- list, where distr[i] is the probability of variable i to be flipped
         """
 
-        global BREAKS
-        if not BREAKS:
-            BREAKS = [pow(x, noise_param) for x in range(0, context.formula.max_occs*2)]
+        nonlocal weights
+        if len(weights) <= context.formula.max_occs:
+            weights = break_weights(noise_param, context.formula.max_occs, weighting)
 
-        get_break_score = context.score.get_break_score
-        f = lambda i: poly(BREAKS[get_break_score(i)])
+        breaks = context.score.breaks
         distr = [0] * (context.formula.num_vars + 1)
 
         false_clauses = len(context.falselist)
@@ -61,13 +119,12 @@ def probsat_distribution(noise_param):
 
         clauses = context.formula.clauses
         for clause_idx in context.falselist:
-            clause = clauses[clause_idx]
-            score_sum = sum(map(f, map(abs, clause)))
-            for var in map(abs, clause):
-                # probability
-                tmp = f(var)/score_sum
-                # weighting
-                distr[var] += tmp/false_clauses
+            clause_vars = [abs(lit) for lit in clauses[clause_idx]]
+            clause_score = [weights[breaks[var]] for var in clause_vars]
+            score_sum = sum(clause_score)
+            for var, score in zip(clause_vars, clause_score):
+                # probability, weighted
+                distr[var] += score/score_sum/false_clauses
 
         assert abs(sum(distr) - 1) < 0.0001,\
             "sum(distr) = {} != 1".format(sum(distr))
@@ -77,12 +134,15 @@ def probsat_distribution(noise_param):
     return probsat_distr
 
 
-def probsat_heuristic(noise_param):
+def probsat_heuristic(noise_param, weighting='poly'):
     """ Constructs the ProbSAT heuristik.
 
     Positionals:
         noise_param -- parameter cb for ProbSAT; should hold 0 <= cb
 
+    Keywords:
+        weighting -- name of the break weighting function; poly, exp or poly-eps
+
     Returns:
         heur -- function, choosing a variable to be flipped.
     """
@@ -92,6 +152,10 @@ def probsat_heuristic(noise_param):
     assert 0 <= noise_param,\
         "noise_param = {} < 0"
 
+    # weights of the break scores; (re)built for the first formula
+    # with more occurrences than the table covers
+    weights = []
+
     def heur(context, rand_gen=random):
         """ The ProbSAT heuristic.
 
@@ -102,24 +166,23 @@ def probsat_heuristic(noise_param):
             var -- variable to be flipped
         """
 
-        global BREAKS
-        if not BREAKS:
-            BREAKS = [pow(x, noise_param) for x in range(0, context.formula.max_occs*2)]
+        nonlocal weights
+        if len(weights) <= context.formula.max_occs:
+            weights = break_weights(noise_param, context.formula.max_occs, weighting)
 
-        get_break_score = context.score.get_break_score
-        f = lambda i: poly(BREAKS[get_break_score(i)])
+        breaks = context.score.breaks
 
         clause_idx = rand_gen.choice(context.falselist.lst)
-        clause_vars = map(abs, context.formula.clauses[clause_idx])
-        clause_score = list(map(f, clause_vars))
+        clause_vars = [abs(lit) for lit in context.formula.clauses[clause_idx]]
+        clause_score = [weights[breaks[var]] for var in clause_vars]
         score_sum = sum(clause_score)
 
         dice = rand_gen.random() * score_sum
         acc = 0
-        for (i, s) in enumerate(clause_score):
-            acc += s
+        for var, score in zip(clause_vars, clause_score):
+            acc += score
             if dice < acc:
-                return abs(context.formula.clauses[clause_idx][i])
+                return var
 
         raise RuntimeError("No variable chosen")
 
@@ -133,7 +196,12 @@ def probsat(
         max_flips,
         noise_param=2.3,
         hamming_dist=0,
-        rand_gen=random):
+        rand_gen=random,
+        weighting='poly',
+        instrumentation=None,
+        on_try=None,
+        budget=None,
+        restart=None):
     """ ProbSAT Solver.
 
     Positionals:
@@ -147,14 +215,23 @@ def probsat(
         hamming_dist -- force random assignment to be at a certain hamming distance
                         to the known satsifying one.
         rand_gen -- random number generator
+        weighting -- name of the break weighting function; poly, exp or poly-eps
+        instrumentation -- Instrumentation of the flip loop, or None
+        on_try -- callback after each try, see generic_sls
+        budget -- Budget of the run, or None
+        restart -- restart policy, or its description; see restart_policy
     """
     return generic_sls(
-        probsat_heuristic(noise_param),
+        probsat_heuristic(noise_param, weighting=weighting),
         formula,
         max_tries,
         max_flips,
         partial(Context, Scores),
         measurement_constructor,
         hamming_dist=hamming_dist,
-        rand_gen=rand_gen
+        rand_gen=rand_gen,
+        instrumentation=instrumentation,
+        on_try=on_try,
+        budget=budget,
+        restart=restart,
     )
@@ -0,0 +1,149 @@
+"""
+## Module src.solver.random_source
+
+### Contents
+    - class BufferedRandom
+    - function random_source
+"""
+
+import random
+
+
+# names of the NumPy bit generators; numpy is only imported, when one is used
+BIT_GENERATORS = dict(
+    pcg64='PCG64',
+    philox='Philox',
+)
+
+
+def _bit_generator(name, seed=None):
+    import numpy as np
+    return getattr(np.random, BIT_GENERATORS[name])(seed)
+
+
+class BufferedRandom(random.Random):
+    """ Drop-in replacement for random.Random, drawing its numbers from a
+    NumPy bit generator (PCG64 or Philox) in blocks.
+
+    Uniform floats and raw 64 bit words are generated block-wise into
+    buffers; random(), choice() and getrandbits() only pull the next value
+    from them. All other methods of random.Random (sample, randrange,
+    choices, shuffle, ...) are built on these, thus results are
+    reproducible from the seed.
+    """
+
+    def __init__(self, seed=None, bit_generator='pcg64', block_size=4096):
+        assert bit_generator in BIT_GENERATORS,\
+            "bit_generator = {} not in {}".format(bit_generator, list(BIT_GENERATORS))
+        assert isinstance(block_size, int),\
+            "block_size = {} :: {} is no int".format(block_size, type(block_size))
+        assert block_size > 0,\
+            "block_size = {} <= 0".format(block_size)
+
+        self.bit_generator = bit_generator
+        self.block_size = block_size
+        super(BufferedRandom, self).__init__(seed)
+
+
+    def seed(self, a=None, version=2):
+        """ (Re)initialize the bit generator; a may be None, an int or a
+        numpy.random.SeedSequence.
+        """
+        import numpy as np
+        if a is not None and not isinstance(a, (int, np.random.SeedSequence)):
+            a = int.from_bytes(str(a).encode(), 'big')
+        # called by random.Random.__init__ before the attributes are set
+        bit_generator = getattr(self, 'bit_generator', 'pcg64')
+        self.generator = np.random.Generator(_bit_generator(bit_generator, a))
+        self.floats = iter(())
+        self.words = iter(())
+
+
+    def __refill_floats(self):
+        self.floats = iter(self.generator.random(self.block_size).tolist())
+
+
+    def __refill_words(self):
+        self.words = iter(
+            self.generator.bit_generator.random_raw(self.block_size).tolist()
+        )
+
+
+    def random(self):
+        """ Return the next uniform float in [0,1) """
+        try:
+            return next(self.floats)
+        except StopIteration:
+            self.__refill_floats()
+            return next(self.floats)
+
+
+    def choice(self, seq):
+        """ Choose a random element from a non-empty sequence """
+        try:
+            u = next(self.floats)
+        except StopIteration:
+            self.__refill_floats()
+            u = next(self.floats)
+        return seq[int(u * len(seq))]
+
+
+    def getrandbits(self, k):
+        """ Return an int with k random bits """
+        if k <= 0:
+            return 0
+
+        number = 0
+        bits = 0
+        while bits < k:
+            try:
+                word = next(self.words)
+            except StopIteration:
+                self.__refill_words()
+                word = next(self.words)
+            number = (number << 64) | word
+            bits += 64
+
+        return number >> (bits - k)
+
+
+    def getstate(self):
+        """ Return the internal state, including the unused buffered values """
+        floats = list(self.floats)
+        words = list(self.words)
+        self.floats = iter(floats)
+        self.words = iter(words)
+        return (
+            self.bit_generator,
+            self.block_size,
+            self.generator.bit_generator.state,
+            floats,
+            words,
+        )
+
+
+    def setstate(self, state):
+        """ Restore the internal state from getstate() """
+        import numpy as np
+        self.bit_generator, self.block_size, bg_state, floats, words = state
+        bit_generator = _bit_generator(self.bit_generator)
+        bit_generator.state = bg_state
+        self.generator = np.random.Generator(bit_generator)
+        self.floats = iter(floats)
+        self.words = iter(words)
+
+
+def random_source(name, seed=None):
+    """ Construct a random number generator by name.
+
+    Positionals:
+        name -- 'mt' for random.Random, or the name of a NumPy bit generator
+                for BufferedRandom; 'pcg64' or 'philox'
+
+    Keywords:
+        seed -- random seed
+    """
+    if name == 'mt':
+        return random.Random(seed)
+
+    return BufferedRandom(seed, bit_generator=name)
@@ -0,0 +1,225 @@
+"""
+## Module src.solver.restart
+
+### Contents
+    - function luby
+    - class FixedRestarts
+    - class LubyRestarts
+    - class GeometricRestarts
+    - class AdaptiveRestarts
+    - function restart_policy
+"""
+
+
+def luby(i):
+    """ i-th element of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, ...
+
+    Positionals:
+        i -- index of the element, starting at 1
+
+    Returns:
+        element -- the element, a power of two
+    """
+    assert isinstance(i, int),\
+        "i = {} :: {} is no int".format(i, type(i))
+    assert i > 0,\
+        "i = {} <= 0".format(i)
+
+    while True:
+        k = i.bit_length()
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+class FixedRestarts:
+    """ Restart policy of generic_sls: the number of flips of each try
+    is given by cutoff; if check_every is not None, the try is also
+    restarted, as soon as stagnated is True, which is checked every
+    check_every flips.
+
+    The fixed policy restarts after max_flips flips, always.
+    """
+
+    NAME = 'fixed'
+
+    check_every = None
+
+    def start(self):
+        """ Starts a run """
+        self.tries = 0
+
+
+    def cutoff(self, max_flips):
+        """ Number of flips of the next try, given the max_flips of the solver """
+        self.tries += 1
+        return max_flips
+
+
+    def start_try(self, context):
+        """ Starts a try from the given context """
+        pass
+
+
+    def stagnated(self, context, flips):
+        """ True, if the current try is to be restarted early,
+        after the given number of flips
+        """
+        return False
+
+
+    def params(self):
+        """ Parameters of the policy, by keyword """
+        return {}
+
+
+    def __str__(self):
+        params = self.params()
+        if not params:
+            return self.NAME
+        return '{}:{}'.format(
+            self.NAME,
+            ','.join('{}={}'.format(key, value) for key, value in sorted(params.items())),
+        )
+
+
+class LubyRestarts(FixedRestarts):
+    """ Restarts after unit * luby(i) flips in the i-th try;
+    unit defaults to max_flips.
+    """
+
+    NAME = 'luby'
+
+    def __init__(self, unit=None):
+        assert unit is None or isinstance(unit, int),\
+            "unit = {} :: {} is no int".format(unit, type(unit))
+        assert unit is None or unit > 0,\
+            "unit = {} <= 0".format(unit)
+        self.unit = unit
+
+
+    def cutoff(self, max_flips):
+        self.tries += 1
+        unit = self.unit if self.unit is not None else max_flips
+        return unit * luby(self.tries)
+
+
+    def params(self):
+        return dict(unit=self.unit) if self.unit is not None else {}
+
+
+class GeometricRestarts(FixedRestarts):
+    """ Restarts after first * factor^(i-1) flips in the i-th try;
+    first defaults to max_flips.
+    """
+
+    NAME = 'geometric'
+
+    def __init__(self, factor=1.5, first=None):
+        assert factor >= 1,\
+            "factor = {} < 1".format(factor)
+        assert first is None or isinstance(first, int),\
+            "first = {} :: {} is no int".format(first, type(first))
+        assert first is None or first > 0,\
+            "first = {} <= 0".format(first)
+        self.factor = float(factor)
+        self.first = first
+
+
+    def cutoff(self, max_flips):
+        self.tries += 1
+        first = self.first if self.first is not None else max_flips
+        return max(1, round(first * self.factor ** (self.tries - 1)))
+
+
+    def params(self):
+        params = dict(factor=self.factor)
+        if self.first is not None:
+            params['first'] = self.first
+        return params
+
+
+class AdaptiveRestarts(FixedRestarts):
+    """ Restarts after max_flips flips, or earlier, when the number of
+    false clauses, looked at every window flips, has not dropped below
+    its minimum of the try for patience windows.
+    """
+
+    NAME = 'adaptive'
+
+    def __init__(self, window=100, patience=5):
+        assert isinstance(window, int),\
+            "window = {} :: {} is no int".format(window, type(window))
+        assert window > 0,\
+            "window = {} <= 0".format(window)
+        assert isinstance(patience, int),\
+            "patience = {} :: {} is no int".format(patience, type(patience))
+        assert patience > 0,\
+            "patience = {} <= 0".format(patience)
+        self.window = window
+        self.patience = patience
+        self.check_every = window
+
+
+    def start_try(self, context):
+        self.best = len(context.falselist)
+        self.stagnant = 0
+        self.next_check = self.window
+
+
+    def stagnated(self, context, flips):
+        # the chunks of a budget may be shorter than a window
+        if flips < self.next_check:
+            return False
+        self.next_check = flips + self.window
+
+        false_clauses = len(context.falselist)
+        if false_clauses < self.best:
+            self.best = false_clauses
+            self.stagnant = 0
+        else:
+            self.stagnant += 1
+        return self.stagnant >= self.patience
+
+
+    def params(self):
+        return dict(window=self.window, patience=self.patience)
+
+
+RESTARTS = {
+    policy.NAME: policy
+    for policy in (FixedRestarts, LubyRestarts, GeometricRestarts, AdaptiveRestarts)
+}
+
+
+def restart_policy(spec=None):
+    """ Constructs a restart policy from its description.
+
+    Positionals:
+        spec -- None for the fixed policy, a policy, or a str
+                'name' or 'name:key=value,...', e.g. 'luby:unit=100',
+                with name in RESTARTS and the keywords of its constructor
+
+    Returns:
+        policy -- the restart policy
+    """
+    if spec is None:
+        return FixedRestarts()
+    if isinstance(spec, FixedRestarts):
+        return spec
+
+    assert isinstance(spec, str),\
+        "spec = {} :: {} is no str".format(spec, type(spec))
+    name, _, args = spec.partition(':')
+    assert name in RESTARTS,\
+        "name = {} not in {}".format(name, list(RESTARTS))
+
+    params = {}
+    for arg in filter(None, args.split(',')):
+        key, _, value = arg.partition('=')
+        try:
+            params[key.strip()] = int(value)
+        except ValueError:
+            params[key.strip()] = float(value)
+
+    return RESTARTS[name](**params)
@@ -3,7 +3,10 @@
 
 ### Contents
     - function max_seq
+    - function min_break
+    - class IndexedSet
     - class Falselist
+    - class ArrayFalselist
     - class DiffScores
     - class scores
 """
@@ -11,6 +14,7 @@
 
 import sys
 import operator
+from array import array
 from collections.abc import Sequence
 from src.formula import Formula, Assignment
 
@@ -37,43 +41,181 @@ def max_seq(seq, key=lambda x: x, compare=operator.gt, modifier=lambda x: x):
     return max_val, max_seqence
 
 
-class Falselist:
-    """ Models a list with no need for order,
-    for the list of unsatisfied clauses.
+def min_break(clause, breaks):
+    """ Finds all variables of a clause with minimum break score;
+    specialized version of max_seq for the WalkSAT heuristic.
+
+    Positionals:
+        clause -- list of literals
+        breaks -- break scores, indexed by variable
+
+    Returns:
+        best_score -- minimum break score
+        best_vars -- list of the variables with minimum break score
+    """
+    assert clause,\
+        "clause = {} is empty".format(clause)
+
+    if len(clause) == 3:
+        return _min_break_3(clause, breaks)
+
+    best_vars = []
+    best_score = None
+    for lit in clause:
+        var = lit if lit > 0 else -lit
+        score = breaks[var]
+        if best_score is None or score < best_score:
+            best_score = score
+            best_vars = [var]
+        elif score == best_score:
+            best_vars.append(var)
+
+    return best_score, best_vars
+
+
+def _min_break_3(clause, breaks):
+    """ min_break unrolled for clauses of length 3 """
+    a, b, c = clause
+    a = a if a > 0 else -a
+    b = b if b > 0 else -b
+    c = c if c > 0 else -c
+    score_a, score_b, score_c = breaks[a], breaks[b], breaks[c]
+
+    if score_a < score_b:
+        if score_a < score_c:
+            return score_a, [a]
+        if score_a == score_c:
+            return score_a, [a, c]
+        return score_c, [c]
+
+    if score_a == score_b:
+        if score_a < score_c:
+            return score_a, [a, b]
+        if score_a == score_c:
+            return score_a, [a, b, c]
+        return score_c, [c]
+
+    if score_b < score_c:
+        return score_b, [b]
+    if score_b == score_c:
+        return score_b, [b, c]
+    return score_c, [c]
+
+
+class IndexedSet:
+    """ Models a set as a list with no need for order, and a mapping from the
+    elements to their positions in the list; thus adding, removing and
+    choosing a random element (from 'lst') is possible in O(1).
     """
 
-    def __init__(self):
+    def __init__(self, elems=()):
         self.lst = []
         self.mapping = {}
+        for elem in elems:
+            self.add(elem)
 
     def __iter__(self):
         return iter(self.lst)
 
 
+    def __contains__(self, elem):
+        return elem in self.mapping
+
+
     def remove(self, elem):
-        """ remove element from falselist """
+        """ remove element from the set """
         assert elem in self.mapping
 
-        idx = self.mapping[elem]
-        tmp = self.lst[idx]
-        if idx == len(self.lst)-1:
-            self.lst.pop()
-        else:
-            self.lst[idx] = self.lst.pop()
-            self.mapping[self.lst[idx]] = idx
-        del self.mapping[tmp]
+        # swap the last element into the gap
+        idx = self.mapping.pop(elem)
+        last = self.lst.pop()
+        if last != elem:
+            self.lst[idx] = last
+            self.mapping[last] = idx
 
 
     def add(self, elem):
-        """ add element to falselist """
+        """ add element to the set """
+        self.mapping[elem] = len(self.lst)
         self.lst.append(elem)
-        self.mapping[elem] = len(self.lst)-1
 
 
     def __len__(self):
         return len(self.lst)
 
 
+class Falselist(IndexedSet):
+    """ Models a list with no need for order,
+    for the list of unsatisfied clauses.
+    """
+
+
+class ArrayFalselist:
+    """ Falselist for the clause indices in [0, capacity); like Falselist,
+    it keeps its elements in 'lst', but maps clause indices to their
+    positions by a list preallocated for all of them instead of a dict.
+    A list is used rather than an array('l'), as indexing it is faster.
+
+    The positions are validated against the list of elements (sparse set),
+    thus clearing the falselist does not need to reset the position list,
+    and it can be reused between tries.
+    """
+
+    def __init__(self, capacity):
+        assert isinstance(capacity, int),\
+            "capacity = {} :: {} is no int".format(capacity, type(capacity))
+        assert capacity >= 0,\
+            "capacity = {} < 0".format(capacity)
+
+        self.lst = []
+        self.capacity = capacity
+        self.positions = [0] * capacity
+
+
+    def __iter__(self):
+        return iter(self.lst)
+
+
+    def __len__(self):
+        return len(self.lst)
+
+
+    def __contains__(self, elem):
+        idx = self.positions[elem]
+        return idx < len(self.lst) and self.lst[idx] == elem
+
+
+    def remove(self, elem):
+        """ remove element from falselist """
+        assert elem in self
+
+        # swap the last element into the gap
+        idx = self.positions[elem]
+        last = self.lst.pop()
+        if last != elem:
+            self.lst[idx] = last
+            self.positions[last] = idx
+
+
+    def add(self, elem):
+        """ add element to falselist """
+        assert 0 <= elem < self.capacity,\
+            "elem = {} not in [0,{})".format(elem, self.capacity)
+
+        self.positions[elem] = len(self.lst)
+        self.lst.append(elem)
+
+
+    def clear(self):
+        """ remove all elements """
+        self.lst.clear()
+
+
+    def as_array(self):
+        """ Returns the current elements as int array, e.g. for numpy.frombuffer """
+        return array('l', self.lst)
+
+
 class DiffScores:
     """ Score table for GSAT """
 
@@ -133,7 +275,7 @@ class DiffScores:
             "formula = {} :: {} is no Formula".format(formula, type(formula))
         assert isinstance(assignment, Assignment), \
             "assignment = {} :: {} is no Assignment".format(formula, type(assignment))
-        assert isinstance(falselist, Falselist), \
+        assert isinstance(falselist, (Falselist, ArrayFalselist)), \
             "falselist = {} :: {} is no Falselist".format(formula, type(falselist))
 
         self.max_score = formula.max_occs
@@ -144,7 +286,7 @@ class DiffScores:
 
 
         self.buckets = {
-            k: set() for k in range(-formula.max_occs, formula.max_occs+1)
+            k: IndexedSet() for k in range(-formula.max_occs, formula.max_occs+1)
         }
 
 
@@ -224,7 +366,7 @@ class DiffScores:
         # while updating, the break score may temporarily be greater than normally possible;
         # in this case, add a new bucket as buffer
         if self.score[variable] not in self.buckets:
-            self.buckets[self.score[variable]] = {variable}
+            self.buckets[self.score[variable]] = IndexedSet((variable,))
         else:
             self.buckets[self.score[variable]].add(variable)
 
@@ -249,7 +391,7 @@ class DiffScores:
         # while updating, the break score may temporarily be greater than normally possible;
         # in this case, add a new bucket as buffer
         if self.score[variable] not in self.buckets:
-            self.buckets[self.score[variable]] = {variable}
+            self.buckets[self.score[variable]] = IndexedSet((variable,))
         else:
             self.buckets[self.score[variable]].add(variable)
 
@@ -271,7 +413,7 @@ class DiffScores:
             "formula = {} :: {} is no Formula".format(formula, type(formula))
         assert isinstance(assignment, Assignment), \
             "assignment = {} :: {} is no Assignment".format(formula, type(assignment))
-        assert isinstance(falselist, Falselist), \
+        assert isinstance(falselist, (Falselist, ArrayFalselist)), \
             "falselist = {} :: {} is no Falselist".format(formula, type(falselist))
 
         # a[v] = -a[v]
@@ -384,7 +526,7 @@ class Scores:
             "formula = {} :: {} is no Formula".format(formula, type(formula))
         assert isinstance(assignment, Assignment), \
             "assignment = {} :: {} is no Assignment".format(formula, type(assignment))
-        assert isinstance(falselist, Falselist), \
+        assert isinstance(falselist, (Falselist, ArrayFalselist)), \
             "falselist = {} :: {} is no Falselist".format(formula, type(falselist))
 
 
@@ -514,7 +656,7 @@ class Scores:
             "formula = {} :: {} is no Formula".format(formula, type(formula))
         assert isinstance(assignment, Assignment), \
             "assignment = {} :: {} is no Assignment".format(formula, type(assignment))
-        assert isinstance(falselist, Falselist), \
+        assert isinstance(falselist, (Falselist, ArrayFalselist)), \
             "falselist = {} :: {} is no Falselist".format(formula, type(falselist))
 
         # a[v] = -a[v]
@@ -8,11 +8,10 @@
 """
 
 import random
-import operator
 
 from functools import partial
 
-from src.solver.utils import Scores, max_seq
+from src.solver.utils import Scores, min_break
 from src.solver.generic_solver import generic_sls, Context
 
 
@@ -50,15 +49,12 @@ def walksat_distribution(noise_param):
         if false_clauses <= 0:
             distr[0] = 1
 
+        clauses = context.formula.clauses
+        breaks = context.score.breaks
         for clause_idx in context.falselist:
-            clause = context.formula.clauses[clause_idx]
+            clause = clauses[clause_idx]
 
-            best_score, clause_best = max_seq(
-                clause,
-                key=context.score.get_break_score,
-                compare=operator.lt,
-                modifier=abs,
-            )
+            best_score, clause_best = min_break(clause, breaks)
 
             if best_score == 0:
                 for var in clause_best:
@@ -106,21 +102,16 @@ def walksat_heuristic(noise_param):
         clause_idx = rand_gen.choice(context.falselist.lst)
         clause = context.formula.clauses[clause_idx]
 
-        best_score, clause_best = max_seq(
-            clause,
-            key=context.score.get_break_score,
-            compare=operator.lt,
-            modifier=abs,
-        )
+        best_score, clause_best = min_break(clause, context.score.breaks)
 
         # get random number [0,1)
         dice = rand_gen.random()
         # Greedy
         if best_score == 0 or dice > noise_param:
-            return abs(rand_gen.choice(list(clause_best)))
+            return rand_gen.choice(clause_best)
 
         # Noisy
-        return rand_gen.choice(list(map(abs, clause)))
+        return abs(rand_gen.choice(clause))
 
     return heur
 
@@ -132,7 +123,11 @@ def walksat(
         max_flips,
         noise_param=0.57,
         hamming_dist=0,
-        rand_gen=random):
+        rand_gen=random,
+        instrumentation=None,
+        on_try=None,
+        budget=None,
+        restart=None):
     """ WalkSAT Solver.
 
     Positionals:
@@ -146,6 +141,10 @@ def walksat(
         hamming_dist -- force random assignment to be at a certain hamming distance
                         to the known satsifying one.
         rand_gen -- random number generator
+        instrumentation -- Instrumentation of the flip loop, or None
+        on_try -- callback after each try, see generic_sls
+        budget -- Budget of the run, or None
+        restart -- restart policy, or its description; see restart_policy
     """
 
     return generic_sls(
@@ -156,5 +155,9 @@ def walksat(
         partial(Context, Scores),
         measurement_constructor,
         hamming_dist=hamming_dist,
-        rand_gen=rand_gen
+        rand_gen=rand_gen,
+        instrumentation=instrumentation,
+        on_try=on_try,
+        budget=budget,
+        restart=restart,
     )
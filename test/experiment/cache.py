@@ -0,0 +1,47 @@
+import unittest
+import random
+import os
+
+from src.experiment.cache import ResultCache, derive_seed
+
+
+class TestDeriveSeed(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+        self.hashes = ['{:064x}'.format(random.getrandbits(256)) for _ in range(10)]
+
+
+    def test_deterministic(self):
+        for h in self.hashes:
+            self.assertEqual(derive_seed(42, h, 3), derive_seed(42, h, 3))
+
+
+    def test_distinct(self):
+        seeds = set()
+        for h in self.hashes:
+            for repetition in range(10):
+                seeds.add(derive_seed(42, h, repetition))
+                seeds.add(derive_seed(43, h, repetition))
+        self.assertEqual(len(seeds), 2 * 10 * 10)
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+        self.db = 'cache_{:04X}.db'.format(random.randrange(0, 2**16))
+
+
+    def doCleanups(self):
+        if os.path.isfile(self.db):
+            os.remove(self.db)
+
+
+    def test_put_get(self):
+        cache = ResultCache(self.db)
+        params = dict(noise_param=0.57, max_tries=10)
+        keys = [ResultCache.key('ab' * 32, 'walksat', params, seed) for seed in range(5)]
+        self.assertEqual(len(set(keys)), 5)
+        cache.put_many((key, dict(seed=i)) for i, key in enumerate(keys[:3]))
+
+        results = ResultCache(self.db).get_many(keys)
+        self.assertEqual(results, {key: dict(seed=i) for i, key in enumerate(keys[:3])})
@@ -0,0 +1,87 @@
+import unittest
+import random
+
+from src.formula import Formula
+from src.experiment.components import connected_components, split_formula, solve_components
+
+
+class TestComponents(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+        # far below the threshold of a giant component
+        self.formula = Formula.generate_satisfiable_formula(600, 0.1)
+
+
+    def test_connected_components(self):
+        formula = Formula(clauses=[[1, -2], [4, 5], [-2, 3], [5, -6, 4]], num_vars=7)
+        self.assertEqual(
+            connected_components(formula),
+            [([1, 2, 3], [0, 2]), ([4, 5, 6], [1, 3])],
+        )
+
+        components = connected_components(self.formula)
+        clause_idxs = sorted(idx for _, idxs in components for idx in idxs)
+        self.assertEqual(clause_idxs, list(range(self.formula.num_clauses)))
+        seen = set()
+        for variables, idxs in components:
+            self.assertTrue(seen.isdisjoint(variables))
+            seen.update(variables)
+            for idx in idxs:
+                self.assertTrue(all(abs(lit) in variables for lit in self.formula.clauses[idx]))
+
+
+    def test_split_formula(self):
+        parts = split_formula(self.formula, bulk_size=20)
+        self.assertEqual(
+            sum(part.num_clauses for part, _ in parts),
+            self.formula.num_clauses,
+        )
+        # all but the last bundle are solved alone, or in bulk of at least 20 variables
+        for part, var_map in parts[:-1]:
+            self.assertGreaterEqual(part.num_vars, 20)
+        for part, var_map in parts:
+            self.assertEqual(part.num_vars, len(var_map))
+            self.assertTrue(part.is_satisfied_by(part.satisfying_assignment))
+
+
+    def test_solve_components(self):
+        for poolsize in (1, 2):
+            assgn, parts = solve_components(
+                self.formula,
+                'walksat',
+                dict(max_tries=10, max_flips=1000, noise_param=0.57),
+                poolsize=poolsize,
+                bulk_size=20,
+                seed=1,
+            )
+            self.assertIsNotNone(assgn)
+            self.assertTrue(self.formula.is_satisfied_by(assgn))
+            self.assertEqual([part['index'] for part in parts], list(range(len(parts))))
+
+
+    def test_budget(self):
+        # the deadline is shared by all parts; it has passed, before any starts
+        assgn, parts = solve_components(
+            self.formula,
+            'walksat',
+            dict(max_tries=10, max_flips=1000, noise_param=0.57),
+            bulk_size=20,
+            budget=dict(time=1e-9),
+        )
+        self.assertIsNone(assgn)
+        self.assertTrue(all(part['abort_reason'] == 'time' for part in parts))
+        self.assertEqual(sum(part['flips'] for part in parts), 0)
+
+        # the flips are split across the parts
+        assgn, parts = solve_components(
+            self.formula,
+            'gsat',
+            dict(max_tries=10**6, max_flips=1000, noise_param=0),
+            bulk_size=20,
+            budget=dict(flips=300, check_every=10),
+            seed=1,
+        )
+        num_vars = sum(part['num_vars'] for part in parts)
+        for part in parts:
+            self.assertLessEqual(part['flips'], max(1, 300 * part['num_vars'] // num_vars))
+        self.assertLessEqual(sum(part['flips'] for part in parts), 300 + len(parts))
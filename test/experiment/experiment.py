@@ -1,11 +1,14 @@
 import unittest
 import random
 import os
+import sqlite3
 
 from functools import partial
 
-from src.experiment.experiment import DynamicExperiment
+from src.experiment.experiment import DynamicExperiment, StaticExperiment, CREATE_SEARCH_RUN
 from src.experiment.measurement import EntropyMeasurement
+from src.experiment.cache import ResultCache
+from src.experiment.pool import WorkerPool
 from src.solver.generic_solver import Context
 from src.solver.gsat import gsat
 from src.solver.walksat import walksat
@@ -38,22 +41,29 @@ class TestExperiment(unittest.TestCase):
         os.rmdir(self.pool_dir)
 
 
-    def run_test_experiment(self, solver, noise_param):
+    def run_test_experiment(self, solver, noise_param, aggregate=False, seed=None, cache=None,
+                            pool=None, **solver_params):
         experiment = DynamicExperiment(
             self.pool,
             solver,
             dict(
                 max_tries=10,
                 max_flips=self.n*5,
-                noise_param=noise_param
+                noise_param=noise_param,
+                **solver_params
             ),
             EntropyMeasurement,
             poolsize = 3,
             database=self.db,
+            aggregate=aggregate,
+            seed=seed,
+            cache=cache,
+            pool=pool,
         )
         results = experiment()
         self.assertEqual(len(results),self.sample_size)
         experiment.save_results()
+        return results
 
 
     def test_experiment_with_gsat(self):
@@ -66,3 +76,222 @@ class TestExperiment(unittest.TestCase):
 
     def test_experiment_with_probsat(self):
         self.run_test_experiment('probsat', 2.3)
+
+
+    def test_experiment_with_exp_probsat(self):
+        self.run_test_experiment('probsat', 2.5, weighting='exp')
+
+
+    def test_aggregated_experiment(self):
+        results = self.run_test_experiment('walksat', 0.57, aggregate=True)
+        for result in results:
+            self.assertNotIn('runs', result)
+            flips = result['summaries']['flips']
+            self.assertLessEqual(flips['count'], 10)
+            self.assertLessEqual(flips['minimum'], flips['median'])
+            self.assertLessEqual(flips['median'], flips['maximum'])
+
+
+    def test_seeded_experiment(self):
+        runs = [
+            self.run_test_experiment('probsat', 2.3, seed=1234)
+            for _ in range(2)
+        ]
+        self.assertEqual(runs[0], runs[1])
+
+
+    def test_cached_experiment(self):
+        cache = ResultCache(self.db)
+        results = self.run_test_experiment('walksat', 0.57, seed=1234, cache=cache)
+        rerun = DynamicExperiment(
+            self.pool,
+            'walksat',
+            dict(max_tries=10, max_flips=self.n*5, noise_param=0.57),
+            EntropyMeasurement,
+            database=self.db,
+            seed=1234,
+            cache=cache,
+        )
+        # nothing is computed again
+        rerun._run_experiment = None
+        self.assertEqual(rerun(), results)
+
+
+    def test_shared_worker_pool(self):
+        with WorkerPool(3, self.pool) as pool:
+            runs = [
+                self.run_test_experiment('probsat', 2.3, seed=1234, pool=pool)
+                for _ in range(2)
+            ]
+        self.assertEqual(runs[0], runs[1])
+        self.assertEqual(runs[0], self.run_test_experiment('probsat', 2.3, seed=1234))
+
+
+    def test_forkserver_worker_pool(self):
+        with WorkerPool(3, self.pool, start_method='forkserver') as pool:
+            results = self.run_test_experiment('walksat', 0.57, seed=1234, pool=pool)
+        self.assertEqual(results, self.run_test_experiment('walksat', 0.57, seed=1234))
+
+
+    def test_instrumented_experiment(self):
+        for aggregate in (False, True):
+            experiment = DynamicExperiment(
+                self.pool,
+                'gsat',
+                dict(max_tries=10, max_flips=self.n*5, noise_param=0),
+                EntropyMeasurement,
+                database=self.db,
+                aggregate=aggregate,
+                instrument=8,
+            )
+            for result in experiment():
+                self.assertEqual(result['instrumentation']['sample_every'], 8)
+            experiment.save_results()
+            with sqlite3.connect(self.db) as conn:
+                rows = list(conn.execute(
+                    'SELECT * FROM instrumentation NATURAL JOIN algorithm_run WHERE experiment_id = ?',
+                    (experiment.experiment_id,)
+                ))
+            self.assertEqual(len(rows), self.sample_size)
+
+
+    def test_budget_experiment(self):
+        for aggregate in (False, True):
+            experiment = DynamicExperiment(
+                self.pool,
+                'gsat',
+                dict(max_tries=10, max_flips=self.n*5, noise_param=0),
+                EntropyMeasurement,
+                database=self.db,
+                aggregate=aggregate,
+                budget=dict(flips=self.n),
+            )
+            for result in experiment():
+                if not result['sat']:
+                    self.assertEqual(result['abort_reason'], 'flips')
+            experiment.save_results()
+            with sqlite3.connect(self.db) as conn:
+                rows = list(conn.execute(
+                    'SELECT sat, total_runtime, abort_reason FROM algorithm_run WHERE experiment_id = ?',
+                    (experiment.experiment_id,)
+                ))
+            self.assertEqual(len(rows), self.sample_size)
+            for sat, flips, reason in rows:
+                self.assertLessEqual(flips, self.n)
+                self.assertEqual(reason, None if sat else 'flips')
+
+
+    def test_restart_experiment(self):
+        experiment = DynamicExperiment(
+            self.pool,
+            'walksat',
+            dict(max_tries=10, max_flips=self.n*5, noise_param=0.57, restart='luby:unit={}'.format(self.n)),
+            EntropyMeasurement,
+            database=self.db,
+        )
+        experiment()
+        experiment.save_results()
+        with sqlite3.connect(self.db) as conn:
+            restart, = next(conn.execute(
+                'SELECT restart FROM experiment WHERE experiment_id = ?',
+                (experiment.experiment_id,)
+            ))
+        self.assertEqual(restart, 'luby:unit={}'.format(self.n))
+
+
+    def test_experiment_without_planted_solution(self):
+        for file in self.pool:
+            with open(file) as f:
+                lines = [line for line in f if not line.startswith('c assgn')]
+            with open(file, 'w') as f:
+                f.writelines(lines)
+
+        for aggregate in (False, True):
+            self.run_test_experiment('walksat', 0.57, aggregate=aggregate)
+
+        with sqlite3.connect(self.db) as conn:
+            self.assertEqual(
+                list(conn.execute('SELECT DISTINCT sat_assgn FROM formula')),
+                [(None,)],
+            )
+            for success, hamming_dist in conn.execute('SELECT success, hamming_dist FROM search_run'):
+                self.assertEqual(hamming_dist is None, not success)
+
+
+    def test_old_database_without_planted_solution(self):
+        for file in self.pool:
+            with open(file) as f:
+                lines = [line for line in f if not line.startswith('c assgn')]
+            with open(file, 'w') as f:
+                f.writelines(lines)
+
+        with sqlite3.connect(self.db) as conn:
+            # search_run as created by versions needing a planted solution
+            conn.execute(
+                CREATE_SEARCH_RUN.replace('hamming_dist          INT', 'hamming_dist          INT NOT NULL')
+            )
+        with self.assertRaisesRegex(RuntimeError, 'search_run.hamming_dist'):
+            DynamicExperiment(
+                self.pool,
+                'walksat',
+                dict(max_tries=10, max_flips=self.n*5, noise_param=0.57),
+                EntropyMeasurement,
+                database=self.db,
+            )
+        with sqlite3.connect(self.db) as conn:
+            self.assertEqual(list(conn.execute('SELECT * FROM formula')), [])
+
+
+    def test_static_experiment_without_planted_solution(self):
+        with open(self.pool[0]) as f:
+            lines = [line for line in f if not line.startswith('c assgn')]
+        with open(self.pool[0], 'w') as f:
+            f.writelines(lines)
+
+        with self.assertRaisesRegex(RuntimeError, 'no planted solution'):
+            StaticExperiment(
+                self.pool,
+                'walksat',
+                dict(noise_param=0.57),
+                database=self.db,
+            )
+        # raised before the database was set up
+        with sqlite3.connect(self.db) as conn:
+            self.assertEqual(list(conn.execute('SELECT name FROM sqlite_master')), [])
+
+
+    def test_preprocessed_experiment(self):
+        for aggregate in (False, True):
+            experiment = DynamicExperiment(
+                self.pool,
+                'walksat',
+                dict(max_tries=10, max_flips=self.n*5, noise_param=0.57),
+                EntropyMeasurement,
+                database=self.db,
+                aggregate=aggregate,
+                preprocess=True,
+            )
+            results = experiment()
+            self.assertEqual(len(results), self.sample_size)
+            experiment.save_results()
+        with sqlite3.connect(self.db) as conn:
+            self.assertEqual(list(conn.execute('SELECT DISTINCT preprocess FROM experiment')), [(1,)])
+
+
+    def test_duplicate_formulae(self):
+        with self.assertWarns(UserWarning):
+            experiment = DynamicExperiment(
+                self.pool + self.pool[:2],
+                'walksat',
+                dict(max_tries=10, max_flips=self.n*5, noise_param=0.57),
+                EntropyMeasurement,
+                database=self.db,
+            )
+        self.assertEqual(experiment.duplicates, self.pool[:2])
+        self.assertEqual(len(experiment()), self.sample_size)
+        experiment.save_results()
+        with sqlite3.connect(self.db) as conn:
+            self.assertEqual(
+                list(conn.execute('SELECT sample_size, duplicates FROM experiment')),
+                [(self.sample_size, 2)],
+            )
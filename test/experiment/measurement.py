@@ -43,3 +43,25 @@ class TestEntropyMeasurement(unittest.TestCase):
             for (s1,s2),v in d.items():
                     self.assertEqual(v,1)
                     self.assertTrue(s1 == s2-1 or s1 == s2+1)
+
+
+    def test_without_planted_solution(self):
+        for f in self.formulae:
+            g = Formula(clauses=f.clauses, num_vars=f.num_vars)
+            m = EntropyMeasurement(g, g.num_vars)
+            assgn = Formula.generate_satisfiable_formula(20, 4.2).satisfying_assignment
+            m.init_run(assgn)
+            flips = [var for var in range(1, g.num_vars+1) if assgn[var] != f.satisfying_assignment[var]]
+            for var in flips:
+                assgn.flip(var)
+                m.count(var)
+            m.end_run(success=True)
+            self.assertEqual(m.tms_steps, {})
+            self.assertEqual(m.run_measurements[-1]['hamming_dist'], len(flips))
+
+            m.init_run(Formula.generate_satisfiable_formula(20, 4.2).satisfying_assignment)
+            m.count(1)
+            m.end_run(success=False)
+            self.assertIsNone(m.run_measurements[-1]['hamming_dist'])
+            self.assertEqual(m.summaries['hamming_dist'].as_dict()['count'], 1)
+            self.assertEqual(m.summaries['flips'].as_dict()['count'], 2)
@@ -0,0 +1,63 @@
+import unittest
+import random
+
+from src.formula import Formula
+from src.experiment.portfolio import default_portfolio, run_member, solve_portfolio, set_cancel
+
+
+class TestPortfolio(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+        self.formula = Formula.generate_satisfiable_formula(100, 4.2)
+
+
+    def test_default_portfolio(self):
+        configs = default_portfolio(rhos=(0.4, 0.57), cbs=(2.3,), seeds=(1, 2))
+        self.assertEqual(len(configs), 8)
+        self.assertEqual(
+            [config['solver'] for config in configs[:4]],
+            ['gsat', 'walksat', 'walksat', 'probsat'],
+        )
+        self.assertEqual(set(config['seed'] for config in configs), {1, 2})
+
+
+    def test_solve(self):
+        configs = default_portfolio(rhos=(0.57,), cbs=(2.3,), seeds=(1, 2))
+        # members without a solution never run out of tries, and are cancelled;
+        # the time budget only fails the test, if no member solves the formula
+        result = solve_portfolio(
+            self.formula,
+            configs,
+            10**6,
+            1000,
+            poolsize=2,
+            budget=dict(check_every=50, time=120),
+        )
+        self.assertIsNotNone(result['winner'])
+        self.assertEqual(result['config'], configs[result['winner']])
+        self.assertTrue(self.formula.is_satisfied_by(result['assignment']))
+        self.assertEqual(len(result['members']), len(configs))
+        for index, member in enumerate(result['members']):
+            self.assertEqual(member['index'], index)
+            if member['sat']:
+                self.assertIsNone(member['abort_reason'])
+            else:
+                self.assertEqual(member['abort_reason'], 'cancelled')
+
+
+    def test_cancelled(self):
+        class Event:
+            def is_set(self):
+                return True
+
+        set_cancel(Event())
+        try:
+            result = run_member(
+                (3, dict(solver='walksat', noise_param=0.57, seed=1), self.formula, 10, 100, {}, 'mt')
+            )
+        finally:
+            set_cancel(None)
+        self.assertEqual(result['index'], 3)
+        self.assertFalse(result['sat'])
+        self.assertEqual(result['flips'], 0)
+        self.assertEqual(result['abort_reason'], 'cancelled')
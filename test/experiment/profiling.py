@@ -0,0 +1,69 @@
+import unittest
+import random
+import os
+import shutil
+import tempfile
+import multiprocessing as mp
+
+from functools import partial
+
+from src.formula import Formula
+from src.solver.walksat import walksat
+from src.experiment.measurement import EntropyMeasurement
+from src.experiment.pool import WorkerPool
+from src.experiment.profiling import ProfiledTask, merge_stats, time_breakdown, profile_summary
+
+
+def solve(formula):
+    assgn, _ = walksat(formula, EntropyMeasurement, 2, formula.num_vars * 5, noise_param=0.57)
+    return bool(assgn)
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+        self.directory = tempfile.mkdtemp()
+        self.formulae = [
+            Formula.generate_planted_formula(50, 4.2, seed=random.getrandbits(32))
+            for _ in range(4)
+        ]
+
+
+    def doCleanups(self):
+        shutil.rmtree(self.directory)
+
+
+    def test_profiled_workers(self):
+        task = ProfiledTask(solve, self.directory)
+        with mp.Pool(processes=2) as pool:
+            results = pool.map(task, self.formulae)
+            # the workers dump their stats, when they exit
+            pool.close()
+            pool.join()
+        self.assertEqual(len(results), len(self.formulae))
+
+        stats = merge_stats(self.directory)
+        breakdown = time_breakdown(stats)
+        self.assertGreater(breakdown['heuristic'], 0)
+        self.assertGreater(breakdown['score_update'], 0)
+        self.assertGreater(breakdown['measurement'], 0)
+        self.assertIn('Time breakdown', profile_summary(stats))
+
+
+    def test_one_file_per_worker(self):
+        task = ProfiledTask(solve, self.directory)
+        # fresh pools, as for repetitions without a shared WorkerPool
+        for _ in range(2):
+            with mp.Pool(processes=2) as pool:
+                pool.map(task, self.formulae)
+                pool.close()
+                pool.join()
+        # the workers of a WorkerPool dump their stats, when it is left
+        with WorkerPool(2) as pool:
+            pool.map(task, self.formulae)
+        # every worker running a task writes a file of its own; at least one per pool
+        files = [file for file in os.listdir(self.directory) if file.endswith('.prof')]
+        self.assertGreaterEqual(len(files), 3)
+        self.assertLessEqual(len(files), 6)
+        self.assertTrue(all(file.startswith('worker-') for file in files))
+        self.assertGreater(time_breakdown(merge_stats(self.directory))['heuristic'], 0)
@@ -0,0 +1,87 @@
+import unittest
+import random
+import io
+import os
+import json
+import shutil
+import tempfile
+
+from functools import partial
+
+from src.experiment.experiment import DynamicExperiment
+from src.experiment.measurement import EntropyMeasurement
+from src.experiment.pool import WorkerPool
+from src.experiment.progress import Progress, TryReporter
+from src.formula import Formula
+
+
+class TestTryReporter(unittest.TestCase):
+    def test_flush(self):
+        sent = []
+        class Queue:
+            def put(self, item):
+                sent.append(item)
+
+        reporter = TryReporter(Queue(), interval=3600)
+        for _ in range(5):
+            reporter(10, False)
+        self.assertEqual(sent, [])
+        reporter.flush(formulae=1)
+        self.assertEqual(sent, [(5, 50, 1)])
+
+
+class TestProgress(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+        self.sample_size = 6
+        self.n = 50
+        self.directory = tempfile.mkdtemp()
+        self.pool_dir = os.path.join(self.directory, 'pool')
+        self.db = os.path.join(self.directory, 'progress.db')
+        self.status_file = os.path.join(self.directory, 'status.json')
+        Formula.generate_formula_pool(self.pool_dir, self.sample_size, self.n, 4.2)
+        self.pool = list(map(partial(os.path.join, self.pool_dir), os.listdir(self.pool_dir)))
+
+
+    def doCleanups(self):
+        shutil.rmtree(self.directory)
+
+
+    def run_experiments(self, poolsize):
+        stream = io.StringIO()
+        progress = Progress(
+            2 * self.sample_size,
+            interval=0.1,
+            status_file=self.status_file,
+            stream=stream,
+        )
+        progress.start()
+        with WorkerPool(poolsize, self.pool, progress=progress) as pool:
+            for _ in range(2):
+                DynamicExperiment(
+                    self.pool,
+                    'walksat',
+                    dict(max_tries=5, max_flips=self.n*5, noise_param=0.57),
+                    EntropyMeasurement,
+                    database=self.db,
+                    pool=pool if poolsize > 1 else None,
+                    progress=progress,
+                )()
+        progress.stop()
+
+        self.assertEqual(progress.formulae, 2 * self.sample_size)
+        self.assertGreaterEqual(progress.tries, 2 * self.sample_size)
+        self.assertGreater(progress.flips, 0)
+        self.assertIn('progress: 12/12 formulae', stream.getvalue())
+        with open(self.status_file) as f:
+            status = json.load(f)
+        self.assertEqual(status['formulae'], 2 * self.sample_size)
+        self.assertEqual(status['tries'], progress.tries)
+
+
+    def test_serial(self):
+        self.run_experiments(1)
+
+
+    def test_worker_pool(self):
+        self.run_experiments(3)
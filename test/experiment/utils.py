@@ -7,6 +7,7 @@ from functools import partial
 
 from src.solver.utils import Formula
 from src.experiment.utils import Queue, WindowEntropy, entropy, mutual_information
+from src.experiment.utils import RunningStats, P2Quantile
 from src.analysis.utils import binomial_vec
 
 from scipy.stats import binom
@@ -137,3 +138,35 @@ class TestWindowEntropy(unittest.TestCase):
             i_observed = window_X.get_entropy() + window_Y.get_entropy() - window_XY.get_entropy()
             i_expected = mutual_information(dist)
             self.assertAlmostEqual(i_observed, i_expected, delta=self.eps)
+
+
+class TestStreamingStatistics(unittest.TestCase):
+
+    def setUp(self):
+        random.seed()
+        self.cases = 100
+        self.eps = 2**(-20)
+
+
+    def test_running_stats(self):
+        for _ in range(0,self.cases):
+            xs = [random.random() * 100 for _ in range(0,random.randrange(2,500))]
+            stats = RunningStats()
+            for x in xs:
+                stats.add(x)
+            mean = sum(xs)/len(xs)
+            variance = sum((x - mean)**2 for x in xs)/(len(xs)-1)
+            self.assertEqual(stats.count, len(xs))
+            self.assertAlmostEqual(stats.mean, mean, delta=self.eps)
+            self.assertAlmostEqual(stats.variance(), variance, delta=self.eps)
+            self.assertEqual(stats.minimum, min(xs))
+            self.assertEqual(stats.maximum, max(xs))
+
+
+    def test_p2_quantile(self):
+        for _ in range(0,self.cases):
+            xs = [random.random() for _ in range(0,2000)]
+            median = P2Quantile(0.5)
+            for x in xs:
+                median.add(x)
+            self.assertAlmostEqual(median.get_value(), sorted(xs)[1000], delta=0.05)
@@ -1,5 +1,6 @@
 import unittest
 import random
+import io
 import os
 import re
 
@@ -11,6 +12,16 @@ class TestAssignment(unittest.TestCase):
         self.maxDiff = None
 
 
+    def test_conversion(self):
+        for i in range(0,1000):
+            atoms = [random.random() < 0.5 for _ in range(random.randrange(0,200))]
+            number = Assignment.integer_from_atoms(atoms)
+            self.assertEqual(number, sum(1 << i for i, atom in enumerate(atoms) if atom))
+            converted = Assignment.atoms_from_integer(number)
+            self.assertEqual(converted, atoms[:len(converted)])
+            self.assertFalse(any(atoms[len(converted):]))
+
+
     def test_creation(self):
         for i in range(1,1000):
             num_vars = random.randrange(1,i+1)
@@ -77,6 +88,67 @@ class TestFormula(unittest.TestCase):
             self.assertEqual(f, Formula(dimacs = str(f)))
 
 
+    def test_write_dimacs(self):
+        f = Formula.generate_satisfiable_formula(100, 4.2)
+        f.comments = ['c first comment', 'c second comment']
+        target = io.StringIO()
+        f.write_dimacs(target, chunk_size=7)
+        text = target.getvalue()
+        self.assertEqual(text, str(f))
+
+        g = Formula(dimacs = text)
+        self.assertEqual(f, g)
+        self.assertEqual(f.comments, g.comments)
+        self.assertTrue(text.startswith('c first comment\nc second comment\nc assgn 0x'))
+
+
+    def test_without_planted_assignment(self):
+        text = 'c no planted solution\np cnf 3 2\n1 -2 0\n\n2 3 0\n'
+        f = Formula(dimacs = text)
+        self.assertIsNone(f.satisfying_assignment)
+        self.assertEqual((f.num_vars, f.num_clauses), (3, 2))
+        self.assertEqual(f.clauses, [[1, -2], [2, 3]])
+        self.assertEqual(f.comments, ['c no planted solution'])
+        self.assertEqual(f, Formula(dimacs = str(f)))
+
+
+    def test_satlib_format(self):
+        text = (
+            'c SATLIB instance\n'
+            'p cnf 4 3\n'
+            ' 1 -2\n'
+            '  3 0\n'
+            '-1 4 0 2 -3\n'
+            '-4 0\n'
+            '%\n'
+            '0\n'
+        )
+        f = Formula(dimacs = text)
+        self.assertIsNone(f.satisfying_assignment)
+        self.assertEqual(f.clauses, [[1, -2, 3], [-1, 4], [2, -3, -4]])
+        self.assertEqual((f.num_vars, f.num_clauses, f.max_clause_length), (4, 3, 3))
+        self.assertEqual(f.get_occurrences(-3), [2])
+        self.assertEqual(f, Formula(dimacs = str(f)))
+
+
+    def test_digest(self):
+        for i in range(0,self.cases):
+            f = Formula.generate_satisfiable_formula(100, 4.2)
+            g = Formula(dimacs = str(f))
+            self.assertEqual(f.digest(), g.digest())
+            self.assertEqual(hash(f), hash(g))
+
+            g.clauses[0][0] = -g.clauses[0][0]
+            h = Formula(clauses=g.clauses, num_vars=100, sat_assignment=g.satisfying_assignment)
+            self.assertNotEqual(f.digest(), h.digest())
+
+            # the order of the clauses, and of their literals, does not matter
+            shuffled = [random.sample(clause, len(clause)) for clause in f.clauses]
+            random.shuffle(shuffled)
+            s = Formula(clauses=shuffled, num_vars=100, sat_assignment=f.satisfying_assignment)
+            self.assertEqual(f.digest(), s.digest())
+
+
     def test_occurrence_counting(self):
         for i in range(0,self.cases):
             f = Formula.generate_satisfiable_formula(500, 4.2)
@@ -138,3 +210,39 @@ class TestFormula(unittest.TestCase):
                 atoms *= 2
             a = Assignment(atoms, n)
             self.assertFalse(f.is_satisfied_by(a))
+
+
+class TestPlantedFormula(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+        self.cases = 10 if __debug__ else 100
+
+
+    def test_planted_formula(self):
+        for i in range(0,self.cases):
+            n = random.randrange(10,1001)
+            r = random.randrange(20,60)/10
+            k = random.randrange(1,7)
+            f = Formula.generate_planted_formula(n, r, clause_length=k)
+            self.assertEqual(f.num_clauses, int(n * r))
+            self.assertTrue(f.is_satisfied_by(f.satisfying_assignment))
+            for clause in f.clauses:
+                self.assertEqual(len(set(map(abs, clause))), k)
+            self.assertEqual(f, Formula(dimacs = str(f)))
+
+
+    def test_seed(self):
+        seed = random.randrange(0, 2**32)
+        f = Formula.generate_planted_formula(200, 4.2, seed=seed)
+        g = Formula.generate_planted_formula(200, 4.2, seed=seed)
+        self.assertEqual(f.digest(), g.digest())
+
+
+    def test_pattern_weights(self):
+        # share of clauses with i satisfied literals is binom(3,i) * 0.191, 0.118, 0.073
+        f = Formula.generate_planted_formula(10000, 10.0)
+        counts = [0] * 4
+        for clause in f.clauses:
+            counts[sum(1 for lit in clause if f.satisfying_assignment.is_true(lit))] += 1
+        for i, p in ((1, 3 * 0.191), (2, 3 * 0.118), (3, 0.073)):
+            self.assertAlmostEqual(counts[i] / f.num_clauses, p, delta=0.01)
@@ -0,0 +1,98 @@
+import unittest
+import random
+
+from src.formula import Formula, Assignment
+from src.solver.budget import Budget
+from src.solver.gsat import gsat
+from src.solver.walksat import walksat
+
+from test.solver.generic_solver import TestMeasurement
+
+
+class TestBudget(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+        self.seed = random.randrange(0, 2**32)
+        self.formula = Formula.generate_satisfiable_formula(64, 4.2)
+
+
+    def test_same_search(self):
+        assgn1, m1 = walksat(
+            self.formula, TestMeasurement, 3, 500,
+            noise_param=0.57,
+            rand_gen=random.Random(self.seed),
+        )
+        budget = Budget(time=3600, flips=10**6, check_every=7)
+        assgn2, m2 = walksat(
+            self.formula, TestMeasurement, 3, 500,
+            noise_param=0.57,
+            rand_gen=random.Random(self.seed),
+            budget=budget,
+        )
+        self.assertEqual(str(assgn1), str(assgn2))
+        self.assertEqual(m1.flips, m2.flips)
+        self.assertIsNone(budget.reason)
+        self.assertEqual(budget.flips, m2.flips)
+        self.assertTrue(all(reason is None for reason in budget.try_reasons))
+
+
+    def test_flip_budget(self):
+        # GSAT without noise hardly solves this formula within 10 flips per try
+        budget = Budget(flips=25, check_every=4)
+        assgn, m = gsat(
+            self.formula, TestMeasurement, 100, 10,
+            rand_gen=random.Random(self.seed),
+            budget=budget,
+        )
+        if assgn is None:
+            self.assertEqual(budget.reason, 'flips')
+            self.assertEqual(m.flips, 25)
+            self.assertEqual(budget.try_reasons, [None, None, 'flips'])
+        self.assertLessEqual(m.flips, 25)
+
+
+    def test_time_budget(self):
+        budget = Budget(time=1e-9, check_every=1)
+        assgn, m = gsat(
+            self.formula, TestMeasurement, 100, 1000,
+            rand_gen=random.Random(self.seed),
+            budget=budget,
+        )
+        self.assertIsNone(assgn)
+        self.assertEqual(budget.reason, 'time')
+        self.assertEqual(budget.try_reasons, ['time'])
+        self.assertEqual(m.flips, 1)
+
+
+    def test_try_time_budget(self):
+        budget = Budget(try_time=1e-9, check_every=1)
+        assgn, m = gsat(
+            self.formula, TestMeasurement, 5, 1000,
+            rand_gen=random.Random(self.seed),
+            budget=budget,
+        )
+        if assgn is None:
+            self.assertIsNone(budget.reason)
+            self.assertEqual(budget.try_reasons, ['try_time'] * 5)
+            self.assertEqual(m.flips, 5)
+
+
+    def test_cancel(self):
+        # a random start falsifies about half of the unit clauses, and every
+        # flip satisfies at most one; the first chunk cannot solve it
+        n = 200
+        units = Formula(
+            clauses=[[var] for var in range(1, n+1)],
+            num_vars=n,
+            sat_assignment=Assignment([True] * n, n),
+        )
+        budget = Budget(check_every=10, cancel=lambda: True)
+        assgn, m = gsat(
+            units, TestMeasurement, 100, 1000,
+            rand_gen=random.Random(self.seed),
+            budget=budget,
+        )
+        self.assertIsNone(assgn)
+        self.assertEqual(budget.reason, 'cancelled')
+        self.assertEqual(budget.try_reasons, ['cancelled'])
+        self.assertEqual(m.flips, 10)
@@ -1,6 +1,6 @@
 from functools import partial
 
-from test.solver.generic_solver import TestSolver, TestDistribution
+from test.solver.generic_solver import TestSolver, TestDistribution, TestMeasurement
 
 from src.solver.generic_solver import Context
 from src.solver.gsat import gsat, gsat_heuristic, gsat_distribution
@@ -17,3 +17,11 @@ class TestGSATDistr(TestDistribution):
 class TestGSAT(TestSolver):
     def test_solver(self):
         self.generic_test_solver(gsat)
+
+    def test_hamming_dist_keeps_planted(self):
+        formula = self.solver_setup['formulae'][0]
+        planted = str(formula.satisfying_assignment)
+        digest = formula.digest()
+        gsat(formula, TestMeasurement, 3, 10, hamming_dist=5)
+        self.assertEqual(str(formula.satisfying_assignment), planted)
+        self.assertEqual(formula.digest(), digest)
@@ -0,0 +1,55 @@
+import unittest
+import random
+
+from src.formula import Formula
+from src.solver.instrumentation import Instrumentation
+from src.solver.gsat import gsat
+from src.solver.walksat import walksat
+from src.solver.probsat import probsat
+
+from test.solver.generic_solver import TestMeasurement
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+        self.seed = random.randrange(0, 2**32)
+        self.formula = Formula.generate_satisfiable_formula(64, 4.2)
+
+
+    def test_same_search(self):
+        for solver, noise_param in ((gsat, 0), (walksat, 0.57), (probsat, 2.3)):
+            assgn1, m1 = solver(
+                self.formula, TestMeasurement, 3, 200,
+                noise_param=noise_param,
+                rand_gen=random.Random(self.seed),
+            )
+            instrumentation = Instrumentation(7)
+            assgn2, m2 = solver(
+                self.formula, TestMeasurement, 3, 200,
+                noise_param=noise_param,
+                rand_gen=random.Random(self.seed),
+                instrumentation=instrumentation,
+            )
+            self.assertEqual(str(assgn1), str(assgn2))
+            self.assertEqual(m1.flips, m2.flips)
+            self.assertEqual(instrumentation.flips, m2.flips)
+
+
+    def test_counters(self):
+        instrumentation = Instrumentation(5)
+        _, m = walksat(
+            self.formula, TestMeasurement, 3, 200,
+            noise_param=0.57,
+            rand_gen=random.Random(self.seed),
+            instrumentation=instrumentation,
+        )
+        counters = instrumentation.as_dict()
+        self.assertEqual(set(counters), set(Instrumentation.FIELDS))
+        self.assertLessEqual(counters['samples'], m.flips // 5 + 3)
+        self.assertGreaterEqual(counters['samples'], m.flips // 5)
+        self.assertLessEqual(counters['plateau_samples'], counters['samples'])
+        self.assertLessEqual(counters['plateau_heuristic_time'], counters['heuristic_time'])
+        self.assertLessEqual(counters['plateau_flips'], counters['flips'])
+        self.assertLessEqual(counters['max_plateau'], counters['plateau_flips'])
+        self.assertLessEqual(counters['plateaus'], counters['plateau_flips'])
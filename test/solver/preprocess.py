@@ -0,0 +1,80 @@
+import unittest
+import random
+
+from src.formula import Formula, Assignment
+from src.solver.preprocess import preprocess, simplify_clauses
+from src.solver.walksat import walksat
+
+from test.solver.generic_solver import TestMeasurement
+
+
+class TestPreprocess(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+
+
+    def test_simplify_clauses(self):
+        self.assertEqual(
+            simplify_clauses([[1, 2, 1], [2, 1], [1, -1, 3], [3, -2]]),
+            [[1, 2], [3, -2]],
+        )
+
+
+    def test_units_and_pure_literals(self):
+        # 1 is a unit, -2 follows; then 4 is pure
+        formula = Formula(
+            clauses=[[1], [-1, -2], [2, 3, 4], [-3, 5, 4], [3, -5], [-3, 5, 2]],
+            num_vars=5,
+        )
+        reduced, reduction = preprocess(formula, subsumption=False)
+        self.assertEqual(reduction.fixed, {1: True, 2: False, 4: True})
+        self.assertEqual(reduction.var_map, [3, 5])
+        self.assertEqual(reduced.clauses, [[1, -2], [-1, 2]])
+        self.assertIsNone(reduced.satisfying_assignment)
+
+        full = reduction.extend(Assignment([True, True], 2))
+        self.assertTrue(formula.is_satisfied_by(full))
+
+
+    def test_subsumption(self):
+        formula = Formula(
+            clauses=[[1, 2, 3], [1, 2], [-1, -2], [-1, 3, 4], [2, -3], [-2, -4, 1], [4, -3, -1]],
+            num_vars=4,
+        )
+        reduced, reduction = preprocess(formula, units=False, pure_literals=False)
+        self.assertEqual(reduction.fixed, {})
+        self.assertEqual(len(reduced.clauses), 6)
+        self.assertNotIn([1, 2, 3], reduced.clauses)
+
+
+    def test_unsat(self):
+        formula = Formula(clauses=[[1], [-1, 2], [-2, 3], [-3, -1], [2, 3]], num_vars=3)
+        reduced, reduction = preprocess(formula)
+        self.assertIsNone(reduced)
+        self.assertTrue(reduction.unsat)
+
+
+    def test_planted_formula(self):
+        for _ in range(10):
+            planted = Formula.generate_satisfiable_formula(200, 2.0)
+            unit = 7 if planted.satisfying_assignment[7] else -7
+            formula = Formula(
+                clauses=planted.clauses + [[unit]],
+                num_vars=200,
+                sat_assignment=planted.satisfying_assignment,
+            )
+            reduced, reduction = preprocess(formula)
+            self.assertIn(7, reduction.fixed)
+            if reduced is None:
+                self.assertTrue(formula.is_satisfied_by(reduction.extend()))
+                continue
+
+            self.assertLess(reduced.num_vars, formula.num_vars)
+            self.assertLessEqual(reduced.num_clauses, formula.num_clauses)
+            # the planted solution is remapped consistently
+            self.assertTrue(reduced.is_satisfied_by(reduced.satisfying_assignment))
+            self.assertTrue(formula.is_satisfied_by(reduction.extend(reduced.satisfying_assignment)))
+
+            assgn, _ = walksat(reduced, TestMeasurement, 10, 10000, noise_param=0.57)
+            if assgn is not None:
+                self.assertTrue(formula.is_satisfied_by(reduction.extend(assgn)))
@@ -3,7 +3,7 @@ from functools import partial
 from test.solver.generic_solver import TestSolver, TestDistribution
 
 from src.solver.generic_solver import Context
-from src.solver.probsat import probsat, probsat_heuristic, probsat_distribution
+from src.solver.probsat import probsat, probsat_heuristic, probsat_distribution, break_weights
 from src.solver.utils import Scores
 
 class TestProbSATDistr(TestDistribution):
@@ -14,6 +14,49 @@ class TestProbSATDistr(TestDistribution):
             probsat_distribution(noise_param=2.3),
         )
 
+class TestProbSATWeights(TestDistribution):
+    def test_break_weights(self):
+        for cb in (0.0, 1.0, 2.3):
+            weights = break_weights(cb, 10)
+            self.assertEqual(len(weights), 11)
+            for b, w in enumerate(weights):
+                self.assertAlmostEqual(w, 1/(1+b**cb), delta=self.eps)
+
+    def test_weightings(self):
+        cb = 2.3
+        weights = dict(
+            poly=lambda b: 1/(1+b**cb),
+            exp=lambda b: cb**-b,
+        )
+        weights['poly-eps'] = lambda b: (1+b)**-cb
+        for weighting, weight in weights.items():
+            for b, w in enumerate(break_weights(cb, 10, weighting=weighting)):
+                self.assertAlmostEqual(w, weight(b), delta=self.eps)
+
+    def test_multiple_noise_params(self):
+        # distributions for several cb in one process must not share their tables
+        f = self.formulae[0]
+        ctx = Context(Scores, f, f.satisfying_assignment.negation())
+        uniform = probsat_distribution(noise_param=0.0)(ctx)
+        weighted = probsat_distribution(noise_param=2.3)(ctx)
+        expected = [0] * (f.num_vars + 1)
+        for clause_idx in ctx.falselist:
+            for lit in f.clauses[clause_idx]:
+                expected[abs(lit)] += 1/len(f.clauses[clause_idx])/len(ctx.falselist)
+        for p, q in zip(uniform, expected):
+            self.assertAlmostEqual(p, q, delta=self.eps)
+        self.assertNotEqual(uniform, weighted)
+
+
+class TestExpProbSATDistr(TestDistribution):
+    def test_distr(self):
+        self.generic_test_distribution_against_heuristic(
+            partial(Context, Scores),
+            probsat_heuristic(noise_param=2.5, weighting='exp'),
+            probsat_distribution(noise_param=2.5, weighting='exp'),
+        )
+
+
 class TestProbSAT(TestSolver):
     def test_solver(self):
         self.generic_test_solver(
@@ -0,0 +1,60 @@
+import unittest
+import random
+import pickle
+
+from src.formula import Formula
+from src.solver.random_source import BufferedRandom, random_source
+from src.solver.walksat import walksat
+
+from test.solver.generic_solver import TestMeasurement
+
+
+class TestBufferedRandom(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+        self.seed = random.randrange(0, 2**32)
+
+
+    def test_reproducible(self):
+        for bit_generator in ('pcg64', 'philox'):
+            r1 = BufferedRandom(self.seed, bit_generator=bit_generator, block_size=100)
+            r2 = BufferedRandom(self.seed, bit_generator=bit_generator, block_size=100)
+            xs = [(r1.random(), r1.choice(range(10)), r1.randrange(0, 2**200)) for _ in range(500)]
+            ys = [(r2.random(), r2.choice(range(10)), r2.randrange(0, 2**200)) for _ in range(500)]
+            self.assertEqual(xs, ys)
+
+
+    def test_pickle(self):
+        r1 = BufferedRandom(self.seed, block_size=100)
+        for _ in range(150):
+            r1.random()
+        r2 = pickle.loads(pickle.dumps(r1))
+        self.assertEqual(
+            [r1.random() for _ in range(500)],
+            [r2.random() for _ in range(500)],
+        )
+        self.assertEqual(r1.sample(range(1000), 10), r2.sample(range(1000), 10))
+
+
+    def test_ranges(self):
+        r = BufferedRandom(self.seed)
+        counts = [0] * 10
+        for _ in range(10000):
+            x = r.random()
+            self.assertTrue(0 <= x < 1)
+            counts[r.choice(range(10))] += 1
+            self.assertTrue(0 <= r.getrandbits(70) < 2**70)
+        for count in counts:
+            self.assertGreater(count, 800)
+
+
+    def test_solver(self):
+        f = Formula.generate_satisfiable_formula(64, 4.2)
+        for name in ('mt', 'pcg64', 'philox'):
+            results = [
+                walksat(f, TestMeasurement, 2, 100, rand_gen=random_source(name, seed=self.seed))
+                for _ in range(2)
+            ]
+            (assgn1, m1), (assgn2, m2) = results
+            self.assertEqual(str(assgn1), str(assgn2))
+            self.assertEqual(m1.flips, m2.flips)
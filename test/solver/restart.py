@@ -0,0 +1,108 @@
+import unittest
+import random
+
+from src.formula import Formula
+from src.solver.restart import luby, restart_policy, RESTARTS
+from src.solver.restart import FixedRestarts, LubyRestarts, GeometricRestarts, AdaptiveRestarts
+from src.solver.gsat import gsat
+from src.solver.walksat import walksat
+
+from test.solver.generic_solver import TestMeasurement
+
+
+class TryMeasurement(TestMeasurement):
+    """ Records the flips of every try """
+    def __init__(self, formula, *more_args):
+        super(TryMeasurement, self).__init__(formula, *more_args)
+        self.tries = []
+
+    def init_run(self, assgn):
+        self.tries.append(0)
+
+    def count(self, flipped_var):
+        super(TryMeasurement, self).count(flipped_var)
+        self.tries[-1] += 1
+
+
+class TestRestart(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+        self.seed = random.randrange(0, 2**32)
+        self.formula = Formula.generate_satisfiable_formula(64, 4.2)
+
+
+    def test_luby(self):
+        self.assertEqual(
+            [luby(i) for i in range(1, 16)],
+            [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8],
+        )
+
+
+    def test_cutoffs(self):
+        policy = LubyRestarts(unit=10)
+        policy.start()
+        self.assertEqual([policy.cutoff(100) for _ in range(7)], [10, 10, 20, 10, 10, 20, 40])
+
+        policy = GeometricRestarts(factor=2)
+        policy.start()
+        self.assertEqual([policy.cutoff(100) for _ in range(4)], [100, 200, 400, 800])
+
+        policy = FixedRestarts()
+        policy.start()
+        self.assertEqual([policy.cutoff(100) for _ in range(3)], [100] * 3)
+
+
+    def test_restart_policy(self):
+        self.assertIsInstance(restart_policy(), FixedRestarts)
+        for name, policy in RESTARTS.items():
+            self.assertIsInstance(restart_policy(name), policy)
+
+        policy = restart_policy('geometric:factor=2,first=50')
+        self.assertEqual((policy.factor, policy.first), (2.0, 50))
+        self.assertIs(restart_policy(policy), policy)
+        # the description of a policy constructs the same policy
+        for spec in ('fixed', 'luby:unit=64', 'geometric:factor=1.5', 'adaptive:patience=3,window=20'):
+            self.assertEqual(str(restart_policy(spec)), spec)
+            self.assertEqual(str(restart_policy(str(restart_policy(spec)))), spec)
+
+
+    def test_fixed_same_search(self):
+        assgn1, m1 = walksat(
+            self.formula, TestMeasurement, 3, 500,
+            noise_param=0.57,
+            rand_gen=random.Random(self.seed),
+        )
+        assgn2, m2 = walksat(
+            self.formula, TestMeasurement, 3, 500,
+            noise_param=0.57,
+            rand_gen=random.Random(self.seed),
+            restart='fixed',
+        )
+        self.assertEqual(str(assgn1), str(assgn2))
+        self.assertEqual(m1.flips, m2.flips)
+
+
+    def test_luby_tries(self):
+        # GSAT without noise hardly solves this formula within a few flips
+        assgn, m = gsat(
+            self.formula, TryMeasurement, 7, 1000,
+            rand_gen=random.Random(self.seed),
+            restart='luby:unit=2',
+        )
+        if assgn is None:
+            self.assertEqual(m.tries, [2, 2, 4, 2, 2, 4, 8])
+        else:
+            for flips, cutoff in zip(m.tries, [2, 2, 4, 2, 2, 4, 8]):
+                self.assertLessEqual(flips, cutoff)
+
+
+    def test_adaptive_tries(self):
+        assgn, m = gsat(
+            self.formula, TryMeasurement, 5, 10000,
+            rand_gen=random.Random(self.seed),
+            restart=AdaptiveRestarts(window=10, patience=2),
+        )
+        # GSAT without noise gets stuck in a local minimum long before 10000 flips
+        for flips in m.tries:
+            self.assertLess(flips, 10000)
+            self.assertTrue(flips % 10 == 0 or flips == m.tries[-1] and assgn)
@@ -1,9 +1,10 @@
 import unittest
 import random
+import operator
 import os
 
 from src.formula import Formula, Assignment
-from src.solver.utils import Falselist, Scores, DiffScores
+from src.solver.utils import max_seq, min_break, IndexedSet, Falselist, ArrayFalselist, Scores, DiffScores
 
 
 class TestFalselist(unittest.TestCase):
@@ -35,6 +36,89 @@ class TestFalselist(unittest.TestCase):
             self.assertEqual(k, l.lst[v])
 
 
+class TestMinBreak(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+
+
+    def test_against_max_seq(self):
+        breaks = {v: random.randrange(0,4) for v in range(1,21)}
+        for _ in range(0,1000):
+            k = random.randrange(1,6)
+            clause = [
+                v if random.random() < 0.5 else -v
+                for v in random.sample(range(1,21), k)
+            ]
+            self.assertEqual(
+                min_break(clause, breaks),
+                max_seq(clause, key=breaks.get, compare=operator.lt, modifier=abs),
+            )
+
+
+class TestArrayFalselist(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+
+
+    def test_add_remove(self):
+        l = ArrayFalselist(1000)
+        t = set()
+        for _ in range(0,5000):
+            x = random.randrange(0,1000)
+            if x in t:
+                l.remove(x)
+                t.remove(x)
+            else:
+                l.add(x)
+                t.add(x)
+            self.assertEqual(len(l), len(t))
+            self.assertEqual(set(l.lst), t)
+        for x in range(0,1000):
+            self.assertEqual(x in l, x in t)
+
+
+    def test_clear(self):
+        l = ArrayFalselist(1000)
+        xs = random.sample(range(0,1000), 100)
+        for x in xs:
+            l.add(x)
+        l.clear()
+        self.assertEqual(len(l), 0)
+        for x in xs:
+            self.assertFalse(x in l)
+        l.add(xs[0])
+        self.assertEqual(list(l), [xs[0]])
+
+
+class TestIndexedSet(unittest.TestCase):
+    def setUp(self):
+        random.seed()
+
+
+    def test_add_remove(self):
+        s = IndexedSet()
+        t = set()
+        for _ in range(0,1000):
+            x = random.randrange(0,100)
+            if x in t:
+                s.remove(x)
+                t.remove(x)
+            else:
+                s.add(x)
+                t.add(x)
+            self.assertEqual(len(s), len(t))
+            self.assertEqual(set(s.lst), t)
+            for k,v in s.mapping.items():
+                self.assertEqual(k, s.lst[v])
+
+
+    def test_contains(self):
+        xs = random.sample(range(0,1000), 100)
+        s = IndexedSet(xs)
+        for x in range(0,1000):
+            self.assertEqual(x in s, x in xs)
+
+
 class TestScores(unittest.TestCase):
     def setUp(self):
         random.seed()